@@ -0,0 +1,199 @@
+"""
+Controle de Admissão - acesso justo e ponderado ao LLM por empresa
+
+Uma empresa com um número de WhatsApp movimentado (ou um replay de backlog) não
+pode ocupar todos os slots do Ollama. FairAdmission limita:
+- capacity: chamadas simultâneas ao LLM no processo
+- tenant_limit: chamadas simultâneas de uma mesma empresa
+- queue_limit: requisições esperando por empresa (acima disso: rejeição imediata)
+
+Quando há fila, o próximo slot vai para a requisição de maior prioridade (faixa
+de lanes.py: chat antes de lote) e, entre iguais, para a empresa com menor tempo
+virtual (weighted fair queuing): cada admissão avança o relógio da empresa em 1/peso,
+então uma empresa de peso 4 recebe ~4x mais slots que uma de peso 1 sob disputa.
+Empresa que volta de um período ocioso entra no relógio atual do sistema (não
+acumula crédito). Requisição rejeitada (fila cheia ou espera acima do limite)
+levanta AdmissionRejected e o engine responde só com templates.
+
+Métricas (por empresa): llm_admission_queue_depth, llm_admission_active,
+llm_admission_wait_ms e llm_admission_rejected{reason=queue_full|timeout}.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class AdmissionRejected(Exception):
+    """Requisição não admitida: reason é 'queue_full' ou 'timeout'."""
+
+    def __init__(self, tenant: str, reason: str):
+        super().__init__(f"admission rejected for {tenant}: {reason}")
+        self.tenant = tenant
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted', 'priority')
+
+    def __init__(self, priority: int):
+        self.event = threading.Event()
+        self.granted = False
+        self.priority = priority
+
+
+class _TenantState:
+    __slots__ = ('active', 'waiting', 'virtual_time', 'weight')
+
+    def __init__(self, weight: float, virtual_time: float):
+        self.active = 0
+        self.waiting: Deque[_Waiter] = deque()
+        self.virtual_time = virtual_time
+        self.weight = weight
+
+
+class FairAdmission:
+    """Slots de LLM compartilhados entre empresas com fila justa ponderada (thread-safe)."""
+
+    def __init__(
+        self,
+        capacity: int,
+        tenant_limit: int,
+        queue_limit: int,
+        weight_fn: Optional[Callable[[str], float]] = None,
+        metrics: Any = None,
+        prefix: str = 'llm_admission',
+    ):
+        self.capacity = max(1, capacity)
+        self.tenant_limit = max(1, tenant_limit)
+        self.queue_limit = max(0, queue_limit)
+        self.weight_fn = weight_fn or (lambda tenant: 1.0)
+        self.metrics = metrics
+        self.prefix = prefix
+        self._tenants: Dict[str, _TenantState] = {}
+        self._active = 0
+        # Relógio virtual do sistema: tempo virtual da última admissão
+        self._clock = 0.0
+        self._lock = threading.Lock()
+
+    # ===== estado interno (sempre com _lock) =====
+    def _state(self, tenant: str, weight: float) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _TenantState(weight, self._clock)
+        else:
+            state.weight = weight
+        return state
+
+    def _eligible(self, state: _TenantState) -> bool:
+        return bool(state.waiting) and state.active < self.tenant_limit
+
+    def _grant(self, tenant: str, state: _TenantState):
+        state.active += 1
+        self._active += 1
+        self._clock = max(self._clock, state.virtual_time)
+        state.virtual_time += 1.0 / state.weight
+        self._publish(tenant, state)
+
+    def _dispatch(self):
+        """Entrega slots livres por prioridade e, entre iguais, à empresa com menor tempo virtual."""
+        while self._active < self.capacity:
+            candidates = [
+                (min(w.priority for w in s.waiting), s.virtual_time, t)
+                for t, s in self._tenants.items() if self._eligible(s)
+            ]
+            if not candidates:
+                return
+            priority, _, tenant = min(candidates)
+            state = self._tenants[tenant]
+            waiter = next(w for w in state.waiting if w.priority == priority)
+            state.waiting.remove(waiter)
+            waiter.granted = True
+            self._grant(tenant, state)
+            waiter.event.set()
+
+    def _forget_if_idle(self, tenant: str, state: _TenantState):
+        if state.active == 0 and not state.waiting:
+            self._tenants.pop(tenant, None)
+
+    def _publish(self, tenant: str, state: _TenantState):
+        if self.metrics is not None:
+            self.metrics.set_gauge(f'{self.prefix}_queue_depth', len(state.waiting), tenant=tenant)
+            self.metrics.set_gauge(f'{self.prefix}_active', state.active, tenant=tenant)
+
+    def _reject(self, tenant: str, reason: str) -> AdmissionRejected:
+        if self.metrics is not None:
+            self.metrics.increment(f'{self.prefix}_rejected', reason=reason, tenant=tenant)
+        return AdmissionRejected(tenant, reason)
+
+    # ===== API =====
+    def acquire(self, tenant: str, timeout: float, priority: int = 0) -> float:
+        """
+        Espera um slot por até `timeout` segundos e retorna o tempo de espera.
+        priority menor é atendida antes (faixas de lanes.py), independente da empresa.
+        Levanta AdmissionRejected se a fila da empresa está cheia ou o prazo expira.
+        """
+        started = time.monotonic()
+        # Peso lido fora do lock: weight_fn pode consultar cache/banco
+        weight = max(0.01, float(self.weight_fn(tenant) or 1.0))
+        with self._lock:
+            state = self._state(tenant, weight)
+            no_queue = not any(s.waiting for s in self._tenants.values())
+            if no_queue and self._active < self.capacity and state.active < self.tenant_limit:
+                self._grant(tenant, state)
+                waiter = None
+            elif len(state.waiting) >= self.queue_limit:
+                self._forget_if_idle(tenant, state)
+                raise self._reject(tenant, 'queue_full')
+            else:
+                waiter = _Waiter(priority)
+                state.waiting.append(waiter)
+                self._publish(tenant, state)
+                self._dispatch()
+
+        if waiter is not None and not waiter.event.wait(timeout):
+            with self._lock:
+                if not waiter.granted:
+                    state = self._tenants.get(tenant)
+                    if state is not None:
+                        state.waiting.remove(waiter)
+                        self._publish(tenant, state)
+                        self._forget_if_idle(tenant, state)
+                    raise self._reject(tenant, 'timeout')
+
+        waited = time.monotonic() - started
+        if self.metrics is not None:
+            self.metrics.observe(f'{self.prefix}_wait_ms', waited * 1000, tenant=tenant)
+        return waited
+
+    def release(self, tenant: str):
+        with self._lock:
+            state = self._tenants.get(tenant)
+            if state is None or state.active == 0:
+                return
+            state.active -= 1
+            self._active -= 1
+            self._publish(tenant, state)
+            self._dispatch()
+            self._forget_if_idle(tenant, state)
+
+    @contextmanager
+    def slot(self, tenant: str, timeout: float, priority: int = 0):
+        """with admission.slot(company_id, timeout): ... (AdmissionRejected se não admitido)."""
+        self.acquire(tenant, timeout, priority)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'active': self._active,
+                'tenants': {
+                    tenant: {'active': s.active, 'queued': len(s.waiting), 'weight': s.weight}
+                    for tenant, s in self._tenants.items()
+                },
+            }
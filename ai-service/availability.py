@@ -0,0 +1,318 @@
+"""
+Disponibilidade - Agenda em memória por empresa (árvore de intervalos + expediente)
+
+Cada empresa tem:
+- AppointmentIndex: intervalos ocupados (agendamentos pending/confirmed) numa
+  árvore de intervalos (treap ordenada pelo início, aumentada com o maior fim da
+  subárvore). Inserção/remoção em O(log n) e sobreposição em O(log n + k), sem
+  depender da duração dos agendamentos.
+- BusinessHours: janelas de atendimento por dia da semana (companies.metadata.business_hours,
+  padrão seg-sex 9h-18h, sáb 9h-13h).
+
+free_slots() e check_slot() combinam os dois para responder "próximos N horários
+livres" e "esse horário está livre?". O engine guarda o índice no TenantCache
+('appointments') e aplica as mudanças de agendamentos incrementalmente (NOTIFY ou
+POST /availability/appointments); sem listener, recarrega após APPOINTMENT_INDEX_TTL.
+"""
+import random
+import re
+import threading
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (início, fim, id do agendamento)
+Interval = Tuple[datetime, datetime, str]
+
+
+class _Node:
+    __slots__ = ('key', 'end', 'priority', 'max_end', 'left', 'right')
+
+    def __init__(self, start: datetime, end: datetime, appointment_id: str):
+        self.key = (start, appointment_id)
+        self.end = end
+        self.priority = random.random()
+        self.max_end = end
+        self.left: Optional['_Node'] = None
+        self.right: Optional['_Node'] = None
+
+    def update(self):
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: Optional[_Node], key, inclusive: bool) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Divide em (chaves < key, chaves >= key); com inclusive, (<= key, > key)."""
+    if node is None:
+        return None, None
+    goes_left = node.key <= key if inclusive else node.key < key
+    if goes_left:
+        node.right, right = _split(node.right, key, inclusive)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, key, inclusive)
+    node.update()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Junta duas treaps em que todas as chaves de left < chaves de right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class AppointmentIndex:
+    """Intervalos ocupados de uma empresa numa árvore de intervalos (thread-safe)."""
+
+    def __init__(self, intervals: List[Interval] = ()):
+        self._root: Optional[_Node] = None
+        self._by_id: Dict[str, Tuple[datetime, datetime]] = {}
+        self._lock = threading.Lock()
+        for start, end, appointment_id in intervals:
+            self._insert(start, end, appointment_id)
+        self.loaded_at = _time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _insert(self, start: datetime, end: datetime, appointment_id: str):
+        self._delete(appointment_id)
+        node = _Node(start, end, appointment_id)
+        left, right = _split(self._root, node.key, inclusive=False)
+        self._root = _merge(_merge(left, node), right)
+        self._by_id[appointment_id] = (start, end)
+
+    def _delete(self, appointment_id: str) -> bool:
+        current = self._by_id.pop(appointment_id, None)
+        if current is None:
+            return False
+        key = (current[0], appointment_id)
+        left, rest = _split(self._root, key, inclusive=False)
+        _, right = _split(rest, key, inclusive=True)
+        self._root = _merge(left, right)
+        return True
+
+    def add(self, appointment_id: str, start: datetime, end: datetime):
+        """Insere (ou move) o intervalo de um agendamento."""
+        with self._lock:
+            self._insert(start, end, appointment_id)
+
+    def remove(self, appointment_id: str) -> bool:
+        with self._lock:
+            return self._delete(appointment_id)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """Intervalos que colidem com [start, end), em ordem de início."""
+        found: List[Interval] = []
+        with self._lock:
+            stack: List[_Node] = []
+            node = self._root
+            # Percurso em ordem, podando subárvores que terminam antes de start
+            # e tudo à direita de nós que começam depois de end
+            while stack or node is not None:
+                while node is not None and node.max_end > start:
+                    stack.append(node)
+                    node = node.left
+                if not stack:
+                    break
+                node = stack.pop()
+                node_start, appointment_id = node.key
+                if node_start >= end:
+                    break
+                if node.end > start:
+                    found.append((node_start, node.end, appointment_id))
+                node = node.right
+        return found
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        return not self.overlapping(start, end)
+
+    def age_seconds(self) -> float:
+        return _time.monotonic() - self.loaded_at
+
+
+# ===== EXPEDIENTE =====
+_DAY_KEYS = {
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+    'segunda': 0, 'terca': 1, 'terça': 1, 'quarta': 2, 'quinta': 3, 'sexta': 4,
+    'sabado': 5, 'sábado': 5, 'domingo': 6,
+}
+_DAY_LABELS = ('Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo')
+_WINDOW_RE = re.compile(r"^\s*(\d{1,2})(?:[:h](\d{2})?)?\s*-\s*(\d{1,2})(?:[:h](\d{2})?)?\s*$")
+
+Window = Tuple[time, time]
+
+
+def _parse_window(text: str) -> Optional[Window]:
+    """"09:00-18:00" ou "9h-13h" → (time(9), time(18))."""
+    match = _WINDOW_RE.match(str(text))
+    if not match:
+        return None
+    h1, m1, h2, m2 = (int(g or 0) for g in match.groups())
+    if h1 > 23 or h2 > 24 or m1 > 59 or m2 > 59:
+        return None
+    opens = time(h1, m1)
+    closes = time(23, 59) if h2 == 24 else time(h2, m2)
+    return (opens, closes) if closes > opens else None
+
+
+def _format_hour(moment: time) -> str:
+    return f"{moment.hour}h{moment.minute:02d}" if moment.minute else f"{moment.hour}h"
+
+
+class BusinessHours:
+    """Janelas de atendimento por dia da semana (0 = segunda)."""
+
+    def __init__(self, windows: Dict[int, List[Window]]):
+        self.days: Tuple[Tuple[Window, ...], ...] = tuple(
+            tuple(sorted(windows.get(weekday, ()))) for weekday in range(7)
+        )
+
+    @classmethod
+    def from_config(cls, config: Any) -> 'BusinessHours':
+        """
+        Lê metadata.business_hours: {"mon": ["09:00-18:00"], "sat": ["09:00-13:00"], ...}
+        (chaves em inglês ou português, valor string ou lista). Config ausente ou
+        inválida cai no expediente padrão; dia ausente = fechado.
+        """
+        if not isinstance(config, dict) or not config:
+            return DEFAULT_BUSINESS_HOURS
+        windows: Dict[int, List[Window]] = {}
+        for key, value in config.items():
+            name = str(key).strip().lower()
+            weekday = int(name) if name in ('0', '1', '2', '3', '4', '5', '6') else _DAY_KEYS.get(name, _DAY_KEYS.get(name[:3]))
+            if weekday is None:
+                continue
+            for text in ([value] if isinstance(value, str) else value or []):
+                window = _parse_window(text)
+                if window:
+                    windows.setdefault(weekday, []).append(window)
+        return cls(windows) if windows else DEFAULT_BUSINESS_HOURS
+
+    def windows(self, day: date, tz) -> List[Tuple[datetime, datetime]]:
+        """Janelas do dia como datetimes no fuso da empresa."""
+        return [
+            (datetime.combine(day, opens, tzinfo=tz), datetime.combine(day, closes, tzinfo=tz))
+            for opens, closes in self.days[day.weekday()]
+        ]
+
+    def contains(self, start: datetime, end: datetime) -> bool:
+        """[start, end) cabe inteiro numa janela de atendimento?"""
+        return any(w_start <= start and end <= w_end for w_start, w_end in self.windows(start.date(), start.tzinfo))
+
+    def describe(self) -> List[str]:
+        """Linhas para o cliente: "Segunda a Sexta: 9h às 18h", "Domingo: Fechado"."""
+        lines = []
+        weekday = 0
+        while weekday < 7:
+            last = weekday
+            while last + 1 < 7 and self.days[last + 1] == self.days[weekday]:
+                last += 1
+            if last == weekday:
+                label = _DAY_LABELS[weekday]
+            else:
+                joiner = 'e' if last == weekday + 1 else 'a'
+                label = f"{_DAY_LABELS[weekday]} {joiner} {_DAY_LABELS[last]}"
+            if self.days[weekday]:
+                hours = ', '.join(f"{_format_hour(o)} às {_format_hour(c)}" for o, c in self.days[weekday])
+            else:
+                hours = 'Fechado'
+            lines.append(f"{label}: {hours}")
+            weekday = last + 1
+        return lines
+
+
+DEFAULT_BUSINESS_HOURS = BusinessHours({
+    **{weekday: [(time(9), time(18))] for weekday in range(5)},
+    5: [(time(9), time(13))],
+})
+
+
+# ===== CONSULTAS =====
+def _align(moment: datetime, origin: datetime, step: timedelta) -> datetime:
+    """Primeiro origin + k*step >= moment (horários "redondos" dentro da janela)."""
+    if moment <= origin:
+        return origin
+    steps = -((origin - moment) // step)
+    return origin + steps * step
+
+
+def iter_free_slots(
+    index: AppointmentIndex,
+    hours: BusinessHours,
+    after: datetime,
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=30),
+    horizon_days: int = 14,
+) -> Iterator[datetime]:
+    """Inícios livres a partir de `after`, dentro do expediente, em ordem cronológica."""
+    tz = after.tzinfo
+    first_day = after.date()
+    for offset in range(horizon_days):
+        for w_start, w_end in hours.windows(first_day + timedelta(days=offset), tz):
+            candidate = _align(after, w_start, step)
+            while candidate + duration <= w_end:
+                conflicts = index.overlapping(candidate, candidate + duration)
+                if not conflicts:
+                    yield candidate
+                    candidate += duration
+                else:
+                    # Pular direto para o fim do conflito
+                    candidate = _align(max(c[1] for c in conflicts), w_start, step)
+
+
+def free_slots(
+    index: AppointmentIndex,
+    hours: BusinessHours,
+    after: datetime,
+    count: int,
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=30),
+    horizon_days: int = 14,
+) -> List[datetime]:
+    """Próximos `count` inícios livres a partir de `after`."""
+    slots = []
+    if count <= 0:
+        return slots
+    for slot in iter_free_slots(index, hours, after, duration, step, horizon_days):
+        slots.append(slot)
+        if len(slots) >= count:
+            break
+    return slots
+
+
+def check_slot(
+    index: Optional[AppointmentIndex],
+    hours: BusinessHours,
+    start: datetime,
+    end: datetime,
+    step: timedelta = timedelta(minutes=30),
+    horizon_days: int = 14,
+) -> Dict[str, Any]:
+    """
+    Verifica [start, end): available (None se não há índice), reason
+    ('closed' fora do expediente, 'busy' colisão) e o próximo início livre sugerido.
+    """
+    if index is None:
+        return {'available': None, 'reason': None, 'suggested_start': None}
+    if not hours.contains(start, end):
+        reason = 'closed'
+    elif index.is_free(start, end):
+        return {'available': True, 'reason': None, 'suggested_start': None}
+    else:
+        reason = 'busy'
+    suggested = free_slots(index, hours, start, 1, end - start, step, horizon_days)
+    return {'available': False, 'reason': reason, 'suggested_start': suggested[0] if suggested else None}
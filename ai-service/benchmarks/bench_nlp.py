@@ -0,0 +1,255 @@
+"""
+Benchmark - funções puras de NLP do engine, com baseline e limite de regressão
+
+Mede cada função com entradas curtas, típicas e adversariais (mensagens longas,
+palavras sem espaço, muitos acentos, padrões de agendamento repetidos) e compara
+com benchmarks/baselines/bench_nlp.json.
+
+Cada caso é guardado em µs e em "unidades de calibração": o tempo dividido
+pelo de um laço Python fixo medido logo em seguida (mediana dos pares). Um caso
+regride quando o tempo E a razão passam do baseline em mais de --threshold
+(padrão 25%), mesmo depois de --retries novas medições; o processo sai com
+código 1. Exigir os dois filtra fases lentas da máquina e deriva da
+calibração. O baseline versionado é de uma máquina de referência; para
+comparar em outra, grave um baseline local com --save antes da mudança.
+
+interpret_semantics roda com vocabulário falso no TenantCache e sem gravar
+palavras pendentes (upsert_word_meaning vira no-op só neste processo).
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_nlp.py                  # mede e compara com o baseline
+    python benchmarks/bench_nlp.py --save           # mede e grava o baseline
+    python benchmarks/bench_nlp.py --only detect_intent --threshold 0.10
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+os.environ.setdefault('OLLAMA_ENABLED', 'false')
+os.environ.setdefault('CACHE_NOTIFY_ENABLED', 'false')
+
+import cognitive_engine as engine  # noqa: E402
+from vocabulary import Vocabulary, meaning  # noqa: E402
+
+logging.disable(logging.WARNING)
+
+BASELINE_PATH = os.path.join(SERVICE_DIR, 'benchmarks', 'baselines', 'bench_nlp.json')
+COMPANY_ID = '00000000-0000-0000-0000-0000000000b1'
+
+INPUTS = {
+    'short': "Quanto custa?",
+    'typical': "Olá, gostaria de agendar uma visita técnica para segunda às 14h00 e saber o preço do plano Pro",
+    # ~4 KB de texto realista repetido: custo linear esperado
+    'long': " ".join([
+        "Bom dia, preciso remarcar o atendimento de sexta-feira para a próxima semana porque o sistema "
+        "está com erro e não consigo acessar as configurações da agenda, qual o valor da manutenção?"
+    ] * 20),
+    # Adversariais: um token enorme, acentos em massa e padrões de agendamento/cliente repetidos
+    'adversarial_token': "a" * 4000,
+    'adversarial_accents': "ação é óculos " * 300,
+    'adversarial_schedule': "cliente Ab " * 200 + "visita ao cliente Xy segunda as 9 " * 50,
+}
+
+VOCABULARY_SIZE = 500
+RESPONSE = ("Podemos agendar uma visita técnica para avaliar o rack e enviar um orçamento. "
+            "Nosso plano Pro inclui suporte e integração com a agenda.")
+
+
+def fake_vocabulary(size: int = VOCABULARY_SIZE):
+    words = {
+        'rack': meaning('gabinete de servidores', ['armário']),
+        'orçamento': meaning('estimativa de custo', ['cotação']),
+        'visita técnica': meaning('ida de um técnico ao local'),
+        'manutencao': meaning('serviço periódico'),
+        'remarcar': meaning('mudar o horário'),
+    }
+    for i in range(size - len(words)):
+        words[f"termo{i}"] = meaning(f"definição {i}")
+    return Vocabulary(words)
+
+
+def prepare():
+    """Estado fixo para as medições: vocabulário falso, sem banco."""
+    vocabulary = fake_vocabulary()
+    engine.tenant_cache.set(COMPANY_ID, 'word_meanings', vocabulary)
+    engine.upsert_word_meaning = lambda *args, **kwargs: None
+    return vocabulary
+
+
+def build_cases(vocabulary):
+    concept = {
+        'original_query': 'como agendar visita técnica',
+        'explanation': 'Para agendar uma visita técnica, informe dia, horário e o serviço desejado.',
+        'examples': ['quero marcar uma visita', 'agendar manutenção do rack'],
+        'keywords': ['agendar', 'visita', 'técnica', 'manutenção'],
+    }
+    kb_title = 'Planos e preços'
+    kb_content = ('O plano básico custa R$ 49/mês e o Pro R$ 99/mês. Pagamento anual tem desconto. '
+                  'O plano Pro inclui integração com a agenda e suporte prioritário.') * 3
+    tokens = {name: engine.tokenize(text) for name, text in INPUTS.items()}
+
+    cases = {}
+    for name, text in INPUTS.items():
+        toks = tokens[name]
+        cases[f'tokenize/{name}'] = lambda text=text: engine.tokenize(text)
+        cases[f'normalize_token_cold/{name}'] = lambda toks=toks: [engine.normalize_token.__wrapped__(t) for t in toks]
+        cases[f'normalize_token_memo/{name}'] = lambda toks=toks: [engine.normalize_token(t) for t in toks]
+        cases[f'structure_sentence_analysis/{name}'] = lambda text=text: engine.structure_sentence_analysis(text)
+        cases[f'detect_intent/{name}'] = lambda text=text: engine.detect_intent(text)
+        cases[f'interpret_semantics/{name}'] = lambda toks=toks: engine.interpret_semantics(toks, COMPANY_ID)
+        cases[f'extract_scheduling_details/{name}'] = lambda text=text: engine.extract_scheduling_details(text)
+        cases[f'calculate_relevance/{name}'] = lambda toks=toks: engine.calculate_relevance(toks, kb_content, kb_title)
+        cases[f'calculate_concept_relevance/{name}'] = lambda toks=toks: engine.calculate_concept_relevance(toks, concept)
+        cases[f'reformulate_response_with_vocabulary/{name}'] = (
+            lambda text=text: engine.reformulate_response_with_vocabulary(f"{RESPONSE} {text}", COMPANY_ID, vocabulary)
+        )
+    return cases
+
+
+def calibration():
+    """Laço Python fixo (dict, str, aritmética): referência da velocidade da máquina."""
+    table = {}
+    for i in range(2000):
+        key = f"k{i % 97}"
+        table[key] = table.get(key, 0) + i
+    return sum(table.values())
+
+
+def _timer(fn, min_time: float):
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    return timer, max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+
+def measure(fn, calibration_timer, repeat: int, min_time: float):
+    """
+    Melhor tempo por chamada (µs) e razão contra a calibração. Cada rodada do caso
+    é seguida de uma rodada da calibração e a razão do par é calculada na hora:
+    variações lentas da máquina (frequência, vizinhos) afetam os dois igual. A
+    razão final é a mediana dos pares.
+    """
+    timer, number = _timer(fn, min_time)
+    cal_timer, cal_number = calibration_timer
+    best = float('inf')
+    ratios = []
+    for _ in range(repeat):
+        elapsed = timer.timeit(number) / number
+        cal_elapsed = cal_timer.timeit(cal_number) / cal_number
+        best = min(best, elapsed)
+        ratios.append(elapsed / cal_elapsed)
+    return best * 1e6, statistics.median(ratios)
+
+
+def run(args):
+    vocabulary = prepare()
+    cases = build_cases(vocabulary)
+    if args.only:
+        pattern = re.compile(args.only)
+        cases = {name: fn for name, fn in cases.items() if pattern.search(name)}
+    for fn in cases.values():
+        fn()  # aquecer memos e cache do re
+
+    calibration_timer = _timer(calibration, args.min_time / 2)
+    calibration_us = min(calibration_timer[0].repeat(args.repeat, calibration_timer[1])) / calibration_timer[1] * 1e6
+    results = {}
+    for name, fn in cases.items():
+        us, units = measure(fn, calibration_timer, args.repeat, args.min_time)
+        results[name] = {'us': round(us, 3), 'units': round(units, 5)}
+    return calibration_us, results, cases, calibration_timer
+
+
+def confirm_regressions(results, baseline, cases, calibration_timer, args):
+    """
+    Casos acima do limite são medidos de novo (--retries vezes) e ficam com a
+    melhor medição: um pico de ruído não reprova, uma regressão real persiste.
+    """
+    previous = baseline.get('results', {}) if baseline else {}
+    for name, value in results.items():
+        old = previous.get(name)
+        for _ in range(args.retries):
+            if not old or _change(value, old) <= args.threshold:
+                break
+            us, units = measure(cases[name], calibration_timer, args.repeat, args.min_time)
+            value['us'] = round(min(value['us'], us), 3)
+            value['units'] = round(min(value['units'], units), 5)
+
+
+def _change(value, old) -> float:
+    """Variação considerada: a menor entre tempo bruto e razão contra a calibração."""
+    return min(value['us'] / old['us'], value['units'] / old['units']) - 1
+
+
+def compare(results, baseline, threshold):
+    """Imprime a tabela e retorna os casos que regrediram."""
+    regressions = []
+    previous = baseline.get('results', {}) if baseline else {}
+    print(f"{'caso':62s} {'µs':>10s} {'baseline':>10s} {'variação':>9s}")
+    for name, value in results.items():
+        old = previous.get(name)
+        if not old:
+            print(f"{name:62s} {value['us']:10.2f} {'—':>10s} {'novo':>9s}")
+            continue
+        change = _change(value, old)
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSÃO'
+            regressions.append(name)
+        print(f"{name:62s} {value['us']:10.2f} {old['us']:10.2f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='gravar os resultados como novo baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='regressão máxima tolerada (0.25 = 25%%)')
+    parser.add_argument('--only', default=None, help='regex sobre o nome dos casos')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--retries', type=int, default=2, help='novas medições de um caso acima do limite')
+    parser.add_argument('--min-time', type=float, default=0.05, help='segundos por rodada')
+    args = parser.parse_args()
+
+    calibration_us, results, cases, calibration_timer = run(args)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    if not args.save:
+        confirm_regressions(results, baseline, cases, calibration_timer, args)
+
+    print(f"calibração: {calibration_us:.1f} µs ({platform.python_implementation()} {platform.python_version()})")
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        merged = dict(baseline.get('results', {})) if (baseline and args.only) else {}
+        merged.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'saved_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'calibration_us': round(calibration_us, 3),
+                'results': dict(sorted(merged.items())),
+            }, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"baseline gravado em {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} caso(s) acima do limite de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
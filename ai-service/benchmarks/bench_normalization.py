@@ -0,0 +1,121 @@
+"""
+Benchmark - normalização de texto por mensagem
+
+Compara a normalização antiga (12 str.replace por chamada, sinônimos do léxico
+normalizados a cada token) com text_normalization (tabela translate + memo e
+sinônimos pré-normalizados), no mesmo trabalho que interpret_semantics e
+detect_intent fazem para cada mensagem recebida.
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_normalization.py [--repeat 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_normalization import normalize_text, normalize_token  # noqa: E402
+
+MESSAGES = [
+    "Olá, gostaria de agendar uma visita para amanhã às 9h",
+    "Quais horários disponíveis na próxima semana?",
+    "Qual o preço do plano Pro? Vocês têm integração com WhatsApp?",
+    "Preciso remarcar o atendimento de sexta-feira para segunda",
+    "O sistema está fora do ar, não consigo acessar as configurações",
+    "Como faço para cadastrar um novo funcionário na agenda?",
+    "Vocês atendem aos sábados? Qual é o endereço da clínica?",
+    "Bom dia! Quero cancelar minha reserva de terça às 14:30",
+    "Serviço será manutenção do rack do cliente Farkon segunda às 10 horas",
+    "Obrigado pela atenção, até a próxima!",
+]
+
+_LEGACY_REPLACEMENTS = {
+    "á": "a", "à": "a", "â": "a", "ã": "a",
+    "é": "e", "ê": "e",
+    "í": "i",
+    "ó": "o", "ô": "o", "õ": "o",
+    "ú": "u",
+    "ç": "c",
+}
+
+
+def legacy_normalize_text(text):
+    t = text.lower()
+    for k, v in _LEGACY_REPLACEMENTS.items():
+        t = t.replace(k, v)
+    return t
+
+
+def legacy_normalize_token(token):
+    t = legacy_normalize_text(token)
+    if len(t) >= 4 and t.endswith("s"):
+        t = t[:-1]
+    return t
+
+
+def _tokenize(text):
+    return [w for w in re.findall(r'\b\w{2,}\b', text.lower()) if not w.isdigit()]
+
+
+def load_synonyms():
+    """Sinônimos do léxico do engine (ou uma amostra, se o engine não importar)."""
+    try:
+        from cognitive_engine import SEMANTIC_LEXICON
+        return [entry.get("synonyms", []) for entry in SEMANTIC_LEXICON.values()]
+    except Exception:
+        return [["agenda", "agendamento", "horário", "reserva"], ["preço", "valor", "custo", "plano"],
+                ["configuração", "ajuste", "opções"], ["integração", "api", "webhook"]] * 20
+
+
+def run_legacy(messages, lexicon):
+    hits = 0
+    for message in messages:
+        legacy_normalize_text(message)
+        for token in _tokenize(message):
+            t = legacy_normalize_token(token)
+            for syns in lexicon:
+                if any(t in legacy_normalize_token(s) for s in syns):
+                    hits += 1
+                    break
+    return hits
+
+
+def run_current(messages, normalized_lexicon):
+    hits = 0
+    for message in messages:
+        normalize_text(message)
+        for token in _tokenize(message):
+            t = normalize_token(token)
+            for syns in normalized_lexicon:
+                if any(t in s for s in syns):
+                    hits += 1
+                    break
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    lexicon = load_synonyms()
+    normalized_lexicon = [tuple(normalize_token(s) for s in syns) for syns in lexicon]
+    assert run_legacy(MESSAGES, lexicon) == run_current(MESSAGES, normalized_lexicon), "resultados divergem"
+
+    n_messages = len(MESSAGES) * args.repeat
+    legacy = timeit.timeit(lambda: run_legacy(MESSAGES, lexicon), number=args.repeat)
+    current = timeit.timeit(lambda: run_current(MESSAGES, normalized_lexicon), number=args.repeat)
+
+    print(f"léxico: {len(lexicon)} entradas, {sum(len(s) for s in lexicon)} sinônimos")
+    print(f"legado : {legacy / n_messages * 1e6:8.1f} µs/mensagem")
+    print(f"atual  : {current / n_messages * 1e6:8.1f} µs/mensagem")
+    print(f"ganho  : {legacy / current:8.1f}x ({(legacy - current) / n_messages * 1e6:.1f} µs economizados por mensagem)")
+    info = normalize_token.cache_info()
+    print(f"memo normalize_token: hits={info.hits} misses={info.misses} size={info.currsize}/{info.maxsize}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark - serialização do payload de /cognitive-response
+
+Monta o payload completo do endpoint (semantics, structural_analysis, definições
+das palavras reconhecidas) para mensagens típicas e compara:
+- jsonify (provider JSON do Flask, como antes)
+- json_codec.dumps com o payload completo
+- json_codec.dumps com profile "compact" (os campos que o backend lê)
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_serialization.py [--repeat 2000] [--vocabulary 200]
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('OLLAMA_ENABLED', 'false')
+os.environ.setdefault('CACHE_NOTIFY_ENABLED', 'false')
+
+import cognitive_engine as engine  # noqa: E402
+from json_codec import JSON_BACKEND, RESPONSE_PROFILES, dumps, select_fields  # noqa: E402
+from vocabulary import SOURCE_METADATA, Vocabulary, meaning  # noqa: E402
+
+# Sem banco, palavras novas geram erros de upsert no log: irrelevantes aqui
+logging.disable(logging.ERROR)
+
+COMPANY_ID = '00000000-0000-0000-0000-000000000001'
+
+MESSAGES = [
+    "Olá, gostaria de agendar uma visita para amanhã às 9h",
+    "Qual o preço do plano Pro? Vocês têm integração com WhatsApp?",
+    "O sistema está fora do ar, não consigo acessar as configurações",
+    "Como faço para cadastrar um novo funcionário na agenda?",
+    "Serviço será manutenção do rack do cliente Farkon segunda às 10 horas",
+]
+
+
+def build_vocabulary(size):
+    words = {}
+    for message in MESSAGES:
+        for token in engine.tokenize(message):
+            words.setdefault(token, meaning(
+                f"termo usado pela empresa para {token} (definição aprovada pela admin)",
+                [f"{token}-a", f"{token}-b"],
+                source=SOURCE_METADATA,
+            ))
+    for i in range(max(0, size - len(words))):
+        words[f"termo{i}"] = meaning(f"definição {i}")
+    return Vocabulary(words)
+
+
+def build_payload(message):
+    semantics = engine.interpret_semantics(engine.tokenize(message), COMPANY_ID)
+    intent, intent_confidence = engine.detect_intent(message)
+    return {
+        'suggested_response': engine.compose_intent_response(intent, message, semantics),
+        'confidence': 0.85,
+        'source': 'semantic',
+        'detected_intent': intent,
+        'intent_confidence': float(intent_confidence),
+        'structural_analysis': engine.structure_sentence_analysis(message),
+        'concepts_used': [],
+        'knowledge_used': [],
+        'semantics': semantics,
+        'needs_training': False,
+        'used_llm': False,
+        'llm_fallback': False,
+        'llm_error': None,
+        'scheduling_details': None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--vocabulary', type=int, default=200)
+    args = parser.parse_args()
+
+    engine.tenant_cache.set(COMPANY_ID, 'word_meanings', build_vocabulary(args.vocabulary))
+    payloads = [build_payload(m) for m in MESSAGES]
+    compact = RESPONSE_PROFILES['compact']
+
+    with engine.app.app_context():
+        flask_dumps = engine.app.json.dumps
+        cases = [
+            ('jsonify (completo)', lambda p: flask_dumps(p).encode('utf-8')),
+            (f'{JSON_BACKEND} (completo)', dumps),
+            (f'{JSON_BACKEND} (compact)', lambda p: dumps(select_fields(p, compact))),
+        ]
+        n = len(payloads) * args.repeat
+        print(f"codificador: {JSON_BACKEND}, vocabulário: {args.vocabulary} palavras, {len(payloads)} mensagens")
+        baseline = None
+        for label, encode in cases:
+            size = sum(len(encode(p)) for p in payloads) / len(payloads)
+            elapsed = timeit.timeit(lambda: [encode(p) for p in payloads], number=args.repeat) / n * 1e6
+            baseline = baseline or (size, elapsed)
+            print(f"{label:22s}: {size:8.0f} bytes  {elapsed:7.1f} µs/resposta  "
+                  f"({baseline[0] / size:4.1f}x menor, {baseline[1] / elapsed:4.1f}x mais rápido)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark - servidor de desenvolvimento (Werkzeug) x modo produção (serve.py/Gunicorn)
+
+Sobe cada modo num processo novo, espera /health, dispara --requests POSTs em
+/cognitive-response com --concurrency clientes simultâneos e mede vazão,
+latência (p50/p95/p99) e memória (PSS somado de todos os processos do modo e
+quanto dela é compartilhada entre o mestre e os workers).
+
+Sem Ollama (OLLAMA_ENABLED=false): mede o custo do engine, não do LLM. Sem banco
+acessível cada requisição ainda tenta conectar; os números valem para comparar
+os modos na mesma máquina, não como capacidade absoluta.
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_serving.py [--requests 2000] [--concurrency 16] [--workers 4] [--threads 4]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPANY_ID = '00000000-0000-0000-0000-000000000001'
+MESSAGES = [
+    "Olá, gostaria de agendar uma visita para amanhã às 9h",
+    "Qual o preço do plano Pro? Vocês têm integração com WhatsApp?",
+    "O sistema está fora do ar, não consigo acessar as configurações",
+    "Como faço para cadastrar um novo funcionário na agenda?",
+]
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _smaps(pid):
+    """(pss_kb, shared_kb) de /proc/<pid>/smaps_rollup (Linux)."""
+    values = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        return 0, 0
+    return values.get('Pss', 0), values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0)
+
+
+def memory(pid):
+    pids = [pid] + _children(pid)
+    totals = [_smaps(p) for p in pids]
+    return len(pids), sum(t[0] for t in totals), sum(t[1] for t in totals)
+
+
+def wait_live(port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1) as res:
+                if res.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def run_load(port, total, concurrency):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            body = json.dumps({
+                'company_id': COMPANY_ID, 'incoming_message': MESSAGES[i % len(MESSAGES)], 'profile': 'compact',
+            }).encode('utf-8')
+            req = urllib.request.Request(f'http://127.0.0.1:{port}/cognitive-response', data=body,
+                                         headers={'Content-Type': 'application/json'})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=30) as res:
+                    res.read()
+                    ok = res.status == 200
+            except (urllib.error.URLError, ConnectionError, OSError):
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, sorted(latencies), errors[0]
+
+
+def _pct(values, q):
+    return values[min(len(values) - 1, int(q * (len(values) - 1)))] * 1000
+
+
+def bench(label, command, env, port, args):
+    proc = subprocess.Popen(command, cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_live(port):
+            print(f"{label}: servidor não respondeu")
+            return
+        time.sleep(1.0)  # workers terminando o aquecimento
+        run_load(port, min(200, args.requests), args.concurrency)  # aquecer
+        elapsed, latencies, errors = run_load(port, args.requests, args.concurrency)
+        processes, pss, shared = memory(proc.pid)
+        print(f"{label:10s}: {args.requests / elapsed:7.1f} req/s  "
+              f"p50 {statistics.median(latencies) * 1000:6.1f} ms  p95 {_pct(latencies, 0.95):6.1f} ms  "
+              f"p99 {_pct(latencies, 0.99):6.1f} ms  erros {errors}  "
+              f"| {processes} proc, PSS {pss / 1024:6.1f} MiB, compartilhado {shared / 1024:6.1f} MiB")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5097)
+    args = parser.parse_args()
+
+    env = dict(os.environ, COGNITIVE_PORT=str(args.port), OLLAMA_ENABLED='false', CACHE_NOTIFY_ENABLED='false',
+               COGNITIVE_WORKERS=str(args.workers), COGNITIVE_THREADS=str(args.threads))
+    print(f"{args.requests} requisições, {args.concurrency} clientes, {os.cpu_count()} CPUs")
+    bench('dev', [sys.executable, 'cognitive_engine.py'], env, args.port, args)
+    bench(f'serve {args.workers}x{args.threads}', [sys.executable, 'serve.py'], env, args.port, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark - tempo de inicialização do cognitive_engine
+
+Mede, em processos novos (como num restart do pm2):
+- import: tempo de `import cognitive_engine` (mediana de N execuções)
+- liveness: do spawn do servidor até o primeiro 200 em GET /health
+- readiness: do spawn até /ready sair de "starting" (aquecimento concluído;
+  sem banco acessível o status fica "degraded", mas o aquecimento é medido igual)
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_startup.py [--runs 5] [--port 5099]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import cognitive_engine; print(time.perf_counter() - t)"
+
+
+def measure_import() -> float:
+    out = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET],
+        cwd=SERVICE_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()
+    return float(out[-1])
+
+
+def _get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as res:
+            return res.status, json.loads(res.read() or b'{}')
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+
+def measure_server(port: int, timeout: float = 30.0):
+    env = dict(os.environ, COGNITIVE_PORT=str(port), CACHE_NOTIFY_ENABLED='false')
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, 'cognitive_engine.py'], cwd=SERVICE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    live = ready = None
+    ready_status = None
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if live is None:
+                    status, _ = _get(f'http://127.0.0.1:{port}/health')
+                    if status == 200:
+                        live = time.perf_counter() - started
+                if live is not None:
+                    status, body = _get(f'http://127.0.0.1:{port}/ready')
+                    if body.get('warmed_up'):
+                        ready = time.perf_counter() - started
+                        ready_status = body.get('status')
+                        break
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return live, ready, ready_status
+
+
+def _fmt(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return 'n/a'
+    return f"mediana {statistics.median(values) * 1000:7.1f} ms  (min {min(values) * 1000:.1f}, max {max(values) * 1000:.1f})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    lives, readies, statuses = [], [], set()
+    for _ in range(args.runs):
+        live, ready, status = measure_server(args.port)
+        lives.append(live)
+        readies.append(ready)
+        statuses.add(status)
+
+    print(f"import cognitive_engine : {_fmt(imports)}")
+    print(f"primeiro 200 em /health : {_fmt(lives)}")
+    print(f"/ready aquecido         : {_fmt(readies)}  status={sorted(s for s in statuses if s)}")
+
+
+if __name__ == '__main__':
+    main()
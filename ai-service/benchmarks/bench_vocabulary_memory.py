@@ -0,0 +1,159 @@
+"""
+Benchmark - memória do vocabulário por empresa (dicts vs registros compartilhados)
+
+Simula N empresas com vocabulários parecidos: cada uma aprovou uma parte das
+palavras comuns (PT_BR_COMMON_WORDS, mesmas definições em todas), algumas
+palavras próprias no metadata e algumas linhas em ai_word_meanings. O JSON de
+cada empresa é decodificado separadamente, como acontece ao ler do banco
+(strings novas por empresa).
+
+Compara, com tracemalloc, a memória retida por:
+- dicts: um dict por palavra com id, definition, synonyms, examples, source e
+  company_id (representação anterior)
+- compacto: vocabulary.Vocabulary com registros Meaning internados sobre a
+  base comum (palavras iguais às da base não ficam na empresa)
+
+Também mede o custo de consulta (vocabulary.get) das duas representações.
+
+Uso (de dentro de ai-service/):
+    python benchmarks/bench_vocabulary_memory.py [--tenants 1000,10000] [--common 60] [--own 10] [--table 5]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dictionary_populator import PT_BR_COMMON_WORDS  # noqa: E402
+from vocabulary import load_vocabulary, shared_meanings  # noqa: E402
+
+TABLE_DEFINITIONS = [
+    "Gabinete metálico para servidores e equipamentos de rede",
+    "Fonte de energia ininterrupta que mantém os equipamentos ligados",
+    "Cabo de rede que liga o equipamento ao switch",
+    "Visita do técnico ao endereço do cliente",
+    "Contrato mensal de suporte e manutenção",
+]
+
+
+def tenant_sources(index: int, common: int, own: int, table: int, rng: random.Random):
+    """(company_id, JSON do metadata, linhas aprovadas de ai_word_meanings) de uma empresa."""
+    company_id = str(uuid.UUID(int=index + 1))
+    words = rng.sample(sorted(PT_BR_COMMON_WORDS), min(common, len(PT_BR_COMMON_WORDS)))
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+    vocabulary = [
+        {'id': f"vocab-{index}-{i}", 'word': word, 'definition': PT_BR_COMMON_WORDS[word]['definition'],
+         'synonyms': [], 'examples': PT_BR_COMMON_WORDS[word].get('examples', []), 'created_at': created_at}
+        for i, word in enumerate(words)
+    ]
+    vocabulary += [
+        {'id': f"own-{index}-{i}", 'word': f"termo{index}x{i}", 'definition': f"definição própria {i} da empresa {index}",
+         'synonyms': [f"sinonimo{i}"], 'examples': [], 'created_at': created_at}
+        for i in range(own)
+    ]
+    rows = [
+        {'id': str(uuid.UUID(int=(index + 1) * 1000 + i)), 'word': f"tabela{i % len(TABLE_DEFINITIONS)}",
+         'definition': TABLE_DEFINITIONS[i % len(TABLE_DEFINITIONS)], 'status': 'approved',
+         'updated_at': datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i)}
+        for i in range(table)
+    ]
+    return company_id, json.dumps({'vocabulary': vocabulary}), rows
+
+
+def build_dicts(company_id: str, metadata_json: str, rows):
+    """Representação anterior: um dict por palavra, com company_id repetido."""
+    meanings = {}
+    for word_entry in json.loads(metadata_json).get('vocabulary', []):
+        word = word_entry.get('word', '').lower().strip()
+        if word:
+            meanings[word] = {
+                'id': word_entry.get('id'),
+                'definition': word_entry.get('definition', ''),
+                'synonyms': word_entry.get('synonyms', []),
+                'examples': word_entry.get('examples', []),
+                'source': 'vocabulary_metadata',
+                'company_id': company_id,
+            }
+    for row in rows:
+        word = row.get('word', '').lower().strip()
+        if word:
+            meanings[word] = {
+                'id': row.get('id'),
+                'definition': row.get('definition'),
+                'source': 'ai_word_meanings_table',
+                'company_id': company_id,
+            }
+    return meanings
+
+
+def build_compact(company_id: str, metadata_json: str, rows):
+    def query(name, params):
+        if name == 'vocabulary_metadata':
+            return [{'vocabulary_hash': 'h', 'vocabulary': json.loads(metadata_json).get('vocabulary')}]
+        if name == 'word_meanings_approved':
+            return [dict(row) for row in rows]
+        return []
+    return load_vocabulary(company_id, query)
+
+
+def retained_bytes(builder, sources):
+    """Memória retida (tracemalloc) pelos vocabulários de todas as empresas."""
+    gc.collect()
+    tracemalloc.start()
+    vocabularies = [builder(*source) for source in sources]
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, vocabularies
+
+
+def lookup_ns(vocabularies, words, number: int = 200000) -> float:
+    vocabulary = vocabularies[0]
+    probes = (words * (number // len(words) + 1))[:number]
+    get = vocabulary.get
+    elapsed = timeit.timeit(lambda: [get(w) for w in probes], number=1)
+    return elapsed / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tenants', default='1000,10000', help='quantidades de empresas, separadas por vírgula')
+    parser.add_argument('--common', type=int, default=60, help='palavras comuns aprovadas por empresa')
+    parser.add_argument('--own', type=int, default=10, help='palavras próprias por empresa (metadata)')
+    parser.add_argument('--table', type=int, default=5, help='linhas aprovadas em ai_word_meanings por empresa')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"por empresa: {args.common} comuns + {args.own} próprias + {args.table} da tabela "
+          f"(base comum: {len(PT_BR_COMMON_WORDS)} palavras)")
+    print(f"{'empresas':>9} {'dicts':>12} {'compacto':>12} {'por empresa':>24} {'redução':>8} {'registros':>10}")
+    for tenants in (int(t) for t in args.tenants.split(',')):
+        rng = random.Random(args.seed)
+        sources = [tenant_sources(i, args.common, args.own, args.table, rng) for i in range(tenants)]
+
+        dict_bytes, dict_vocabularies = retained_bytes(build_dicts, sources)
+        words = list(dict_vocabularies[0])
+        dict_lookup = lookup_ns(dict_vocabularies, words)
+        del dict_vocabularies
+
+        compact_bytes, compact_vocabularies = retained_bytes(build_compact, sources)
+        compact_lookup = lookup_ns(compact_vocabularies, words)
+        records = shared_meanings()
+        del compact_vocabularies
+        del sources
+
+        per_tenant = f"{dict_bytes / tenants / 1024:.1f} → {compact_bytes / tenants / 1024:.1f} KiB"
+        print(f"{tenants:>9} {dict_bytes / 2**20:>10.1f}Mi {compact_bytes / 2**20:>10.1f}Mi {per_tenant:>24} "
+              f"{dict_bytes / compact_bytes:>7.1f}x {records:>10}")
+        print(f"{'':>9} consulta: dict {dict_lookup:.0f} ns, compacto {compact_lookup:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
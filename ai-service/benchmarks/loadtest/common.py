@@ -0,0 +1,27 @@
+"""Tenants sintéticos e corpus compartilhados por seed.py e run.py."""
+import os
+import uuid
+from typing import List
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(LOADTEST_DIR, 'corpus_pt.txt')
+
+# Ids determinísticos: o seed e o gerador de carga concordam sem trocar arquivos
+TENANT_NAMESPACE = uuid.UUID('6f1c1d2e-8a57-4c39-9a4e-1f0e5b7d3c21')
+TENANT_NAME_PREFIX = 'loadtest-'
+
+
+def tenant_id(index: int) -> str:
+    return str(uuid.uuid5(TENANT_NAMESPACE, f"{TENANT_NAME_PREFIX}{index}"))
+
+
+def tenant_ids(count: int) -> List[str]:
+    return [tenant_id(i) for i in range(count)]
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[str]:
+    with open(path, encoding='utf-8') as f:
+        messages = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not messages:
+        raise ValueError(f"Corpus vazio: {path}")
+    return messages
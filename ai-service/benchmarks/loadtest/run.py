@@ -0,0 +1,292 @@
+"""
+Gerador de carga - replay do corpus em português sobre N empresas sintéticas
+
+Dois modos de chegada:
+- --rate R: malha aberta, chegadas Poisson a R req/s (latência medida a partir do
+  instante agendado, então fila no cliente/servidor aparece no p99)
+- sem --rate: malha fechada, --concurrency clientes enviando sem pausa
+
+Cada requisição escolhe uma empresa (common.tenant_ids, as mesmas do seed.py) e
+uma mensagem do corpus, e pede só os campos necessários (fields). O relatório
+JSON traz vazão, latência p50/p95/p99, taxa de erro (por tipo), proporção de
+fallback do LLM e contagem de intents; --compare mostra a variação contra um
+relatório anterior.
+
+Uso (de dentro de ai-service/):
+    python benchmarks/loadtest/run.py --url http://127.0.0.1:5001 --tenants 50 \\
+        --rate 20 --duration 60 --output loadtest-$(date +%s).json [--compare anterior.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import CORPUS_PATH, load_corpus, tenant_ids  # noqa: E402
+
+RESPONSE_FIELDS = 'detected_intent,used_llm,llm_fallback,llm_error,confidence'
+REPORT_VERSION = 1
+
+
+class Recorder:
+    """Resultados de todas as requisições (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = Counter()
+        self.intents = Counter()
+        self.llm = Counter()
+        self.sent = 0
+
+    def record(self, latency: float, error: str = None, payload: dict = None):
+        with self.lock:
+            self.sent += 1
+            if error:
+                self.errors[error] += 1
+                return
+            self.latencies.append(latency)
+            payload = payload or {}
+            self.intents[payload.get('detected_intent') or 'unknown'] += 1
+            if payload.get('used_llm'):
+                self.llm['used'] += 1
+            elif payload.get('llm_fallback'):
+                self.llm['fallback'] += 1
+            else:
+                self.llm['not_called'] += 1
+
+
+class Client:
+    """Uma conexão HTTP keep-alive por thread, reaberta após erro."""
+
+    def __init__(self, url: str, timeout: float):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = (parts.path.rstrip('/') or '') + f'/cognitive-response?fields={RESPONSE_FIELDS}'
+        self.timeout = timeout
+        self.conn = None
+
+    def post(self, body: bytes):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self.conn.request('POST', self.path, body=body, headers={'Content-Type': 'application/json'})
+            res = self.conn.getresponse()
+            data = res.read()
+        except Exception:
+            self.conn.close()
+            self.conn = None
+            raise
+        return res.status, data
+
+
+def build_body(rng: random.Random, tenants, corpus) -> bytes:
+    return json.dumps({
+        'company_id': rng.choice(tenants),
+        'incoming_message': rng.choice(corpus),
+        'client_ref': f"loadtest-{rng.randrange(1000)}",
+    }, ensure_ascii=False).encode('utf-8')
+
+
+def send(client: Client, body: bytes, scheduled: float, recorder: Recorder):
+    try:
+        status, data = client.post(body)
+    except TimeoutError:
+        recorder.record(time.perf_counter() - scheduled, 'timeout')
+        return
+    except (OSError, http.client.HTTPException):
+        recorder.record(time.perf_counter() - scheduled, 'connection')
+        return
+    latency = time.perf_counter() - scheduled
+    if status != 200:
+        recorder.record(latency, f'http_{status}')
+        return
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        recorder.record(latency, 'invalid_json')
+        return
+    recorder.record(latency, payload=payload)
+
+
+def run_closed(args, tenants, corpus, recorder: Recorder):
+    deadline = time.perf_counter() + args.duration
+    remaining = [args.requests] if args.requests else None
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        client = Client(args.url, args.timeout)
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            send(client, build_body(rng, tenants, corpus), time.perf_counter(), recorder)
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,), daemon=True) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run_open(args, tenants, corpus, recorder: Recorder):
+    jobs: queue.Queue = queue.Queue()
+
+    def worker():
+        client = Client(args.url, args.timeout)
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            body, scheduled = job
+            send(client, body, scheduled, recorder)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.concurrency)]
+    for t in threads:
+        t.start()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    next_at = started
+    sent = 0
+    while next_at - started < args.duration and (not args.requests or sent < args.requests):
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        jobs.put((build_body(rng, tenants, corpus), next_at))
+        sent += 1
+        next_at += rng.expovariate(args.rate)
+
+    for _ in threads:
+        jobs.put(None)
+    for t in threads:
+        t.join()
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(round(q * (len(values) - 1))))] * 1000, 2)
+
+
+def build_report(args, recorder: Recorder, elapsed: float) -> dict:
+    latencies = sorted(recorder.latencies)
+    errors = sum(recorder.errors.values())
+    ok = len(latencies)
+    llm_called = recorder.llm['used'] + recorder.llm['fallback']
+    return {
+        'version': REPORT_VERSION,
+        'started_at': args.started_at,
+        'config': {
+            'url': args.url, 'tenants': args.tenants, 'mode': 'open' if args.rate else 'closed',
+            'rate': args.rate, 'concurrency': args.concurrency, 'duration': args.duration,
+            'requests': args.requests, 'corpus': os.path.basename(args.corpus), 'seed': args.seed,
+            'label': args.label,
+        },
+        'elapsed_seconds': round(elapsed, 3),
+        'requests': recorder.sent,
+        'ok': ok,
+        'errors': errors,
+        'error_rate': round(errors / recorder.sent, 4) if recorder.sent else 0.0,
+        'errors_by_kind': dict(recorder.errors),
+        'throughput_rps': round(ok / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': _percentile(latencies, 0.50),
+            'p95': _percentile(latencies, 0.95),
+            'p99': _percentile(latencies, 0.99),
+            'max': round(latencies[-1] * 1000, 2) if latencies else None,
+            'mean': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+        },
+        'llm': {
+            **{k: recorder.llm[k] for k in ('used', 'fallback', 'not_called')},
+            # Fração das chamadas ao LLM que caíram nos templates (erro, timeout, resposta vazia)
+            'fallback_ratio': round(recorder.llm['fallback'] / llm_called, 4) if llm_called else None,
+        },
+        'intents': dict(recorder.intents.most_common()),
+    }
+
+
+COMPARED = [
+    ('throughput_rps', 'req/s', 1), ('error_rate', 'erro', 1),
+    ('latency_ms.p50', 'p50 ms', -1), ('latency_ms.p95', 'p95 ms', -1), ('latency_ms.p99', 'p99 ms', -1),
+    ('llm.fallback_ratio', 'fallback LLM', -1),
+]
+
+
+def _get(report, dotted):
+    value = report
+    for key in dotted.split('.'):
+        value = (value or {}).get(key)
+    return value
+
+
+def print_report(report: dict, baseline: dict = None):
+    lat = report['latency_ms']
+    print(f"{report['requests']} requisições em {report['elapsed_seconds']}s ({report['config']['mode']}), "
+          f"{report['config']['tenants']} empresas")
+    print(f"vazão    : {report['throughput_rps']} req/s")
+    print(f"latência : p50 {lat['p50']} ms  p95 {lat['p95']} ms  p99 {lat['p99']} ms  max {lat['max']} ms")
+    print(f"erros    : {report['errors']} ({report['error_rate']:.2%}) {report['errors_by_kind']}")
+    print(f"LLM      : {report['llm']}")
+    if baseline:
+        print(f"comparado a {baseline.get('config', {}).get('label') or baseline.get('started_at')}:")
+        for key, label, better in COMPARED:
+            old, new = _get(baseline, key), _get(report, key)
+            if old is None or new is None:
+                continue
+            change = ((new - old) / old * 100) if old else 0.0
+            verdict = '' if abs(change) < 5 else ('melhor' if change * better > 0 else 'PIOR')
+            print(f"  {label:13s}: {old} → {new} ({change:+.1f}%) {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--tenants', type=int, default=50)
+    parser.add_argument('--corpus', default=CORPUS_PATH)
+    parser.add_argument('--rate', type=float, default=0.0, help='req/s (malha aberta); 0 = malha fechada')
+    parser.add_argument('--concurrency', type=int, default=16, help='clientes (fechada) ou máximo em voo (aberta)')
+    parser.add_argument('--duration', type=float, default=60.0, help='segundos')
+    parser.add_argument('--requests', type=int, default=0, help='parar após N requisições (0 = só duração)')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--label', default=None, help='nome da rodada no relatório')
+    parser.add_argument('--output', default=None, help='arquivo JSON do relatório')
+    parser.add_argument('--compare', default=None, help='relatório anterior para comparar')
+    args = parser.parse_args()
+    args.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    tenants = tenant_ids(args.tenants)
+    corpus = load_corpus(args.corpus)
+    recorder = Recorder()
+    started = time.perf_counter()
+    (run_open if args.rate else run_closed)(args, tenants, corpus, recorder)
+    report = build_report(args, recorder, time.perf_counter() - started)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"relatório: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
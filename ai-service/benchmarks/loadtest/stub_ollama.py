@@ -0,0 +1,136 @@
+"""
+Stub do Ollama para testes de carga - mesma API (/api/generate, /api/tags), latência controlada
+
+Responde em português com frases prontas, informando prompt_eval_count/eval_count
+como o Ollama real. Latência = --latency-ms ± --jitter-ms (uniforme); uma fração
+--error-rate responde 500 e uma fração --hang-rate demora --hang-seconds (para
+exercitar o timeout do engine e o fallback por templates).
+
+Uso (de dentro de ai-service/):
+    python benchmarks/loadtest/stub_ollama.py [--port 11435] [--latency-ms 800] [--jitter-ms 300]
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 python serve.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWERS = [
+    "Claro! Posso ajudar com isso. Me diga o dia e o horário que prefere.",
+    "Nossos planos começam no básico; o Pro inclui integrações e relatórios.",
+    "Entendi o problema. Vou registrar o chamado e o suporte retorna em breve.",
+    "Atendemos de segunda a sexta, das 9h às 18h, e aos sábados até 13h.",
+    "Para configurar, acesse Configurações e siga o passo a passo na tela.",
+]
+
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.hangs = 0
+
+    def count(self, field: str):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+def make_handler(state: StubState):
+    args = state.args
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *_):
+            pass
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/api/tags':
+                self._send(200, {'models': [{'name': args.model}]})
+            elif self.path == '/stats':
+                self._send(200, {'requests': state.requests, 'errors': state.errors, 'hangs': state.hangs})
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b'{}'
+            if self.path != '/api/generate':
+                self._send(404, {'error': 'not found'})
+                return
+            state.count('requests')
+            try:
+                request = json.loads(raw or b'{}')
+            except ValueError:
+                self._send(400, {'error': 'invalid json'})
+                return
+
+            roll = random.random()
+            if roll < args.error_rate:
+                state.count('errors')
+                self._send(500, {'error': 'stub: falha simulada'})
+                return
+            if roll < args.error_rate + args.hang_rate:
+                state.count('hangs')
+                time.sleep(args.hang_seconds)
+            else:
+                delay = max(0.0, args.latency_ms + random.uniform(-args.jitter_ms, args.jitter_ms)) / 1000
+                time.sleep(delay)
+
+            prompt = request.get('prompt', '')
+            answer = random.choice(ANSWERS)
+            # ~4 caracteres por token, como estimate_tokens do prompt_builder
+            prompt_tokens = max(1, len(prompt) // 4)
+            self._send(200, {
+                'model': request.get('model', args.model),
+                'response': answer,
+                'done': True,
+                'prompt_eval_count': prompt_tokens,
+                'prompt_eval_duration': int(prompt_tokens * 2e6),
+                'eval_count': max(1, len(answer) // 4),
+            })
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--model', default='gemma2:2b')
+    parser.add_argument('--latency-ms', type=float, default=800.0)
+    parser.add_argument('--jitter-ms', type=float, default=300.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--hang-rate', type=float, default=0.0)
+    parser.add_argument('--hang-seconds', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(args)))
+    server.daemon_threads = True
+    print(f"stub Ollama em http://{args.host}:{args.port} (latência {args.latency_ms}±{args.jitter_ms} ms, "
+          f"erro {args.error_rate:.0%}, travamento {args.hang_rate:.0%})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
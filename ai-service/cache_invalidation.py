@@ -0,0 +1,133 @@
+"""
+Invalidação de Cache por Eventos - PostgreSQL LISTEN/NOTIFY
+
+Triggers no banco (migration 20260111000001-add-ai-cache-notify-triggers) publicam
+no canal `ai_cache_invalidation` um JSON por linha alterada:
+
+    {"table": "ai_word_meanings", "op": "UPDATE", "company_id": "...", "id": "...",
+     "word": "...", "status": "approved", "definition": "..."}
+
+Uma thread daemon mantém uma conexão dedicada em LISTEN e repassa cada evento ao
+handler registrado para a tabela. Os handlers (definidos no cognitive_engine)
+aplicam invalidações finas ou patches in-place no TenantCache da empresa.
+
+Se a conexão cair, eventos podem ter sido perdidos: ao reconectar chamamos
+on_reconnect (o engine limpa o cache) e, enquanto desconectado, on_disconnect
+(o engine volta ao TTL curto).
+"""
+import json
+import logging
+import select
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = 'ai_cache_invalidation'
+
+EventHandler = Callable[[Dict[str, Any]], None]
+
+
+class CacheInvalidationListener(threading.Thread):
+    """Thread de LISTEN que despacha eventos de invalidação por tabela."""
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = DEFAULT_CHANNEL,
+        poll_timeout: float = 5.0,
+        max_backoff: float = 30.0,
+        on_connect: Optional[Callable[[], None]] = None,
+        on_reconnect: Optional[Callable[[], None]] = None,
+        on_disconnect: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(name='cache-invalidation-listener', daemon=True)
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self.on_connect = on_connect
+        self.on_reconnect = on_reconnect
+        self.on_disconnect = on_disconnect
+        self.handlers: Dict[str, EventHandler] = {}
+        self.connected = False
+        self.events_received = 0
+        self._stop_event = threading.Event()
+        self._ever_connected = False
+
+    def register(self, table: str, handler: EventHandler):
+        """Registra o handler de eventos de uma tabela (um por tabela)."""
+        self.handlers[table] = handler
+
+    def stop(self):
+        self._stop_event.set()
+
+    def dispatch(self, payload: str):
+        """Decodifica um payload NOTIFY e chama o handler da tabela."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"[CACHE-NOTIFY] Ignoring malformed payload: {payload[:200]}")
+            return
+
+        self.events_received += 1
+        handler = self.handlers.get(event.get('table'))
+        if handler is None:
+            logger.debug(f"[CACHE-NOTIFY] No handler for table {event.get('table')}")
+            return
+        try:
+            handler(event)
+        except Exception as e:
+            logger.error(f"[CACHE-NOTIFY] Handler for {event.get('table')} failed: {e}")
+
+    def _listen(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        cur = conn.cursor()
+        cur.execute(f"LISTEN {self.channel};")
+        cur.close()
+
+        self.connected = True
+        if self._ever_connected:
+            logger.warning("[CACHE-NOTIFY] Reconnected; events may have been missed")
+            if self.on_reconnect:
+                self.on_reconnect()
+        self._ever_connected = True
+        if self.on_connect:
+            self.on_connect()
+        logger.info(f"[CACHE-NOTIFY] Listening on channel '{self.channel}'")
+
+        try:
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([conn], [], [], self.poll_timeout)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self.dispatch(notify.payload)
+        finally:
+            self.connected = False
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def run(self):
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+                backoff = 1.0
+            except Exception as e:
+                if self._ever_connected:
+                    logger.error(f"[CACHE-NOTIFY] Listener connection lost: {e}")
+                else:
+                    logger.warning(f"[CACHE-NOTIFY] Could not start listener: {e}")
+                if self.on_disconnect:
+                    self.on_disconnect()
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,146 @@
+"""
+Índice de Conceitos - Tabelas pré-compiladas de conceitos aprendidos por empresa
+
+Cada empresa (company_id) tem sua própria ConceptTable, montada uma vez por
+geração de cache a partir das linhas de ai_learned_concepts. Os textos são
+normalizados (lowercase) na construção e a pontuação de todos os conceitos
+contra uma query é feita de uma vez, via colunas esparsas token → conceitos.
+
+A fórmula é a mesma de calculate_concept_relevance (cognitive_engine.py):
+- 3.0 se o token aparece na query original
+- 1.5 se aparece na explicação
+- 1.0 se aparece em algum exemplo
+- 2.5 por keyword contida na query
+- bônus de aprovação: min(approved_count * 0.2, 2.0)
+"""
+from bisect import bisect_right
+from typing import Any, Dict, List, Tuple
+
+WEIGHT_ORIGINAL_QUERY = 3.0
+WEIGHT_EXPLANATION = 1.5
+WEIGHT_EXAMPLES = 1.0
+WEIGHT_KEYWORD = 2.5
+APPROVAL_BONUS_STEP = 0.2
+APPROVAL_BONUS_MAX = 2.0
+
+# Separador entre documentos no corpus concatenado (tokens nunca contêm \x00)
+_DOC_SEPARATOR = "\x00"
+
+
+class _FieldCorpus:
+    """Corpus concatenado de um campo (um documento por conceito) para busca por substring."""
+
+    def __init__(self, docs: List[str]):
+        self.text = _DOC_SEPARATOR.join(docs)
+        # Offset inicial de cada documento, para mapear posição → índice do conceito
+        self.starts: List[int] = []
+        offset = 0
+        for doc in docs:
+            self.starts.append(offset)
+            offset += len(doc) + len(_DOC_SEPARATOR)
+
+    def matching_docs(self, token: str) -> List[int]:
+        """Índices dos documentos que contêm o token como substring (sem repetição)."""
+        found: List[int] = []
+        text = self.text
+        pos = text.find(token)
+        while pos != -1:
+            idx = bisect_right(self.starts, pos) - 1
+            found.append(idx)
+            # Pular para o próximo documento: uma ocorrência por conceito basta
+            next_idx = idx + 1
+            if next_idx >= len(self.starts):
+                break
+            pos = text.find(token, self.starts[next_idx])
+        return found
+
+
+class ConceptTable:
+    """
+    Tabela de conceitos aprendidos de uma empresa, pré-normalizada para pontuação vetorizada.
+    Imutável após a construção; o memo de colunas é descartável e limitado.
+    """
+
+    MAX_CACHED_TOKENS = 4096
+
+    def __init__(self, concepts: List[Dict[str, Any]]):
+        self.concepts: List[Dict[str, Any]] = list(concepts)
+
+        queries: List[str] = []
+        explanations: List[str] = []
+        examples: List[str] = []
+        self._bonus: List[float] = []
+        # keyword normalizada → índices dos conceitos (com repetição, como na fórmula original)
+        self._keywords: Dict[str, List[int]] = {}
+
+        for idx, concept in enumerate(self.concepts):
+            queries.append((concept.get('original_query') or '').lower())
+            explanations.append((concept.get('explanation') or '').lower())
+            examples.append(_DOC_SEPARATOR.join(ex.lower() for ex in (concept.get('examples') or [])))
+
+            for kw in concept.get('keywords') or []:
+                if kw is None:
+                    continue
+                self._keywords.setdefault(kw.lower(), []).append(idx)
+
+            approved_count = concept.get('approved_count') or 0
+            self._bonus.append(min(approved_count * APPROVAL_BONUS_STEP, APPROVAL_BONUS_MAX))
+
+        self._queries = _FieldCorpus(queries)
+        self._explanations = _FieldCorpus(explanations)
+        self._examples = _FieldCorpus(examples)
+        # Coluna esparsa por token: ((índice do conceito, peso), ...)
+        self._columns: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def _column(self, token: str) -> Tuple[Tuple[int, float], ...]:
+        """Coluna esparsa do token: peso somado por conceito nos três campos."""
+        column = self._columns.get(token)
+        if column is not None:
+            return column
+
+        weights: Dict[int, float] = {}
+        for idx in self._queries.matching_docs(token):
+            weights[idx] = WEIGHT_ORIGINAL_QUERY
+        for idx in self._explanations.matching_docs(token):
+            weights[idx] = weights.get(idx, 0.0) + WEIGHT_EXPLANATION
+        for idx in self._examples.matching_docs(token):
+            weights[idx] = weights.get(idx, 0.0) + WEIGHT_EXAMPLES
+        column = tuple(weights.items())
+
+        if len(self._columns) >= self.MAX_CACHED_TOKENS:
+            self._columns.clear()
+        self._columns[token] = column
+        return column
+
+    def score_all(self, query_tokens: List[str]) -> List[float]:
+        """Pontua todos os conceitos contra a query de uma vez (mesma ordem de self.concepts)."""
+        scores = [0.0] * len(self.concepts)
+        if not scores:
+            return scores
+
+        for token in query_tokens:
+            for idx, weight in self._column(token):
+                scores[idx] += weight
+
+        query_lower = ' '.join(query_tokens)
+        for kw, indices in self._keywords.items():
+            if kw in query_lower:
+                for idx in indices:
+                    scores[idx] += WEIGHT_KEYWORD
+
+        for idx, bonus in enumerate(self._bonus):
+            scores[idx] += bonus
+        return scores
+
+    def rank(self, query_tokens: List[str], min_score: float = 0.0) -> List[Tuple[Dict[str, Any], float]]:
+        """Retorna (conceito, score) com score > min_score, ordenados por score decrescente."""
+        scored = [
+            (concept, score)
+            for concept, score in zip(self.concepts, self.score_all(query_tokens))
+            if score > min_score
+        ]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
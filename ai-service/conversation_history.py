@@ -0,0 +1,151 @@
+"""
+Histórico de Conversas - Buffer circular em memória por (company_id, client_ref)
+
+Guarda os turnos mais recentes de cada conversa ativa, limitado em quantidade de
+turnos e em bytes por conversa, e em número total de conversas (LRU). É alimentado
+write-through quando o backend grava uma mensagem e semeado do banco (query DESC
+indexada) na primeira leitura de uma conversa que ainda não está em memória.
+
+Um buffer só é usado para responder quando é "autoritativo": foi semeado do banco
+(e depois só recebeu appends). Um append em conversa fria não torna o buffer
+autoritativo, porque pode haver mensagens anteriores só no banco.
+
+Com vários processos (workers do gunicorn), o write-through chega a um só deles.
+Por isso o buffer conta as mensagens que conhece (total do banco na semeadura +
+appends) e recent() recebe o total atual do banco: contagem diferente, o buffer
+não responde e a conversa é semeada de novo.
+"""
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+# (direction, message_text) — direction: 'received' (cliente) ou 'sent' (IA/operador)
+Turn = Tuple[str, str]
+
+
+class _Ring:
+    __slots__ = ('turns', 'size_bytes', 'authoritative', 'complete', 'truncated', 'message_count')
+
+    def __init__(self, max_turns: int):
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.size_bytes = 0
+        # Semeado do banco: o buffer contém a cauda real da conversa
+        self.authoritative = False
+        # O banco tinha menos linhas que o limite pedido: a conversa inteira está aqui
+        self.complete = False
+        # Turnos antigos descartados pelo limite de bytes (limite intencional de contexto)
+        self.truncated = False
+        # Mensagens da conversa no banco que o buffer já viu (None: total desconhecido)
+        self.message_count: Optional[int] = None
+
+
+class ConversationHistory:
+    """Buffer circular de turnos recentes por conversa, isolado por company_id."""
+
+    def __init__(self, max_turns: int = 20, max_bytes: int = 8192, max_conversations: int = 5000):
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.max_conversations = max_conversations
+        self._rings: 'OrderedDict[Tuple[str, str], _Ring]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    @staticmethod
+    def _turn_size(turn: Turn) -> int:
+        return len(turn[1].encode('utf-8'))
+
+    def _push(self, ring: _Ring, turn: Turn):
+        if len(ring.turns) == ring.turns.maxlen:
+            ring.size_bytes -= self._turn_size(ring.turns[0])
+            ring.complete = False
+        ring.turns.append(turn)
+        ring.size_bytes += self._turn_size(turn)
+        # Manter pelo menos o turno mais recente, mesmo que sozinho passe do limite
+        while ring.size_bytes > self.max_bytes and len(ring.turns) > 1:
+            ring.size_bytes -= self._turn_size(ring.turns.popleft())
+            ring.truncated = True
+            ring.complete = False
+
+    def _ring_for(self, key: Tuple[str, str]) -> _Ring:
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = _Ring(self.max_turns)
+            self._rings[key] = ring
+            while len(self._rings) > self.max_conversations:
+                self._rings.popitem(last=False)
+        else:
+            self._rings.move_to_end(key)
+        return ring
+
+    def append(self, company_id: str, client_ref: str, direction: str, text: str):
+        """Registra um turno (write-through de mensagem gravada no banco)."""
+        text = (text or '').strip()
+        with self._lock:
+            if not text:
+                # Mensagem vazia não entra no buffer, mas conta como linha do banco
+                ring = self._rings.get((company_id, client_ref))
+                if ring is not None and ring.message_count is not None:
+                    ring.message_count += 1
+                return
+            ring = self._ring_for((company_id, client_ref))
+            self._push(ring, (direction, text))
+            if ring.message_count is not None:
+                ring.message_count += 1
+
+    def load(self, company_id: str, client_ref: str, turns: List[Turn], limit: int,
+             message_count: Optional[int] = None):
+        """
+        Semeia o buffer com turnos vindos do banco (ordem cronológica).
+        message_count: total de mensagens da conversa no banco no momento da leitura.
+        """
+        with self._lock:
+            ring = _Ring(self.max_turns)
+            for direction, text in turns:
+                text = (text or '').strip()
+                if text:
+                    self._push(ring, (direction, text))
+            ring.authoritative = True
+            ring.message_count = message_count
+            ring.complete = len(turns) < limit and len(turns) <= self.max_turns and not ring.truncated
+            self._rings[(company_id, client_ref)] = ring
+            self._rings.move_to_end((company_id, client_ref))
+            while len(self._rings) > self.max_conversations:
+                self._rings.popitem(last=False)
+
+    def recent(self, company_id: str, client_ref: str, limit: int,
+               message_count: Optional[int] = None) -> Optional[List[Turn]]:
+        """
+        Últimos `limit` turnos em ordem cronológica, ou None se a memória não pode
+        responder sozinha (conversa fria, janela maior que a cauda conhecida ou,
+        com message_count, banco com mensagens que o buffer não viu).
+        """
+        key = (company_id, client_ref)
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None or not ring.authoritative:
+                self.misses += 1
+                return None
+            if message_count is not None and ring.message_count != message_count:
+                # Mensagem gravada por outro processo (ou removida): semear de novo
+                self.misses += 1
+                return None
+            if len(ring.turns) < limit and not (ring.complete or ring.truncated):
+                self.misses += 1
+                return None
+            self._rings.move_to_end(key)
+            self.hits += 1
+            turns = list(ring.turns)
+        return turns[-limit:] if limit > 0 else []
+
+    def forget(self, company_id: str, client_ref: str = None):
+        """Descarta uma conversa, ou todas as conversas da empresa."""
+        with self._lock:
+            if client_ref is not None:
+                self._rings.pop((company_id, client_ref), None)
+                return
+            for key in [k for k in self._rings if k[0] == company_id]:
+                del self._rings[key]
@@ -0,0 +1,217 @@
+"""
+Resumo Contínuo de Conversas - Rolling summary por (company_id, client_ref)
+
+Em vez de mandar as últimas N linhas cruas para o LLM (o que perde fatos antigos
+como nome do cliente e serviço, e estoura num_ctx em conversas longas), cada
+conversa mantém um resumo compacto atualizado incrementalmente a cada turno:
+
+- fatos extraídos (cliente, serviço, data, hora) — o mais recente vence
+- última mensagem do cliente e última resposta, truncadas
+- contador de turnos
+
+O resumo renderizado tem tamanho máximo fixo (max_chars), então os tokens do
+prompt ficam constantes independente do tamanho da conversa. A atualização roda
+numa thread de fundo; persistência (tabela ai_conversation_summaries) é feita por
+callbacks fornecidos pelo engine.
+
+Vários processos podem atualizar a mesma conversa (cada worker recebe parte dos
+turnos). A gravação é condicional ao turn_count lido: se outro processo gravou
+antes, o resumo é recarregado do banco e o turno aplicado de novo sobre ele, em
+vez de sobrescrever fatos mais novos com um resumo velho.
+"""
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tentativas de gravar um turno quando outro processo gravou a conversa antes
+PERSIST_ATTEMPTS = 3
+
+# Campos de extract_scheduling_details → rótulo no resumo
+FACT_FIELDS = (
+    ('client_name', 'Cliente'),
+    ('service_description', 'Serviço'),
+    ('appointment_date', 'Data'),
+    ('appointment_time', 'Hora'),
+)
+
+ConversationKey = Tuple[str, str]
+
+
+def _clip(text: str, limit: int) -> str:
+    text = ' '.join((text or '').split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+class ConversationSummary:
+    """Estado compacto de uma conversa."""
+
+    __slots__ = ('facts', 'last_client_message', 'last_reply', 'turn_count', 'updated_at')
+
+    def __init__(self, facts: Dict[str, str] = None, last_client_message: str = '',
+                 last_reply: str = '', turn_count: int = 0, updated_at: datetime = None):
+        self.facts: Dict[str, str] = dict(facts or {})
+        self.last_client_message = last_client_message
+        self.last_reply = last_reply
+        self.turn_count = turn_count
+        self.updated_at = updated_at or datetime.now()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'facts': dict(self.facts),
+            'last_client_message': self.last_client_message,
+            'last_reply': self.last_reply,
+            'turn_count': self.turn_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConversationSummary':
+        return cls(
+            facts=data.get('facts') or {},
+            last_client_message=data.get('last_client_message') or '',
+            last_reply=data.get('last_reply') or '',
+            turn_count=int(data.get('turn_count') or 0),
+        )
+
+    def copy(self) -> 'ConversationSummary':
+        return ConversationSummary(self.facts, self.last_client_message, self.last_reply,
+                                   self.turn_count, self.updated_at)
+
+    def render(self, max_chars: int = 400) -> str:
+        """Texto do resumo para o prompt, nunca maior que max_chars."""
+        parts = []
+        facts = [f"{label}: {self.facts[field]}" for field, label in FACT_FIELDS if self.facts.get(field)]
+        if facts:
+            parts.append('; '.join(facts))
+        if self.last_client_message:
+            parts.append(f'Última do cliente: "{_clip(self.last_client_message, 120)}"')
+        if self.last_reply:
+            parts.append(f'Última resposta: "{_clip(self.last_reply, 100)}"')
+        header = f"Conversa com {self.turn_count} mensagens."
+        text = '\n'.join([header] + parts)
+        return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + '…'
+
+
+class RollingSummarizer:
+    """Mantém resumos por conversa, atualizados em segundo plano a partir dos turnos."""
+
+    def __init__(
+        self,
+        extract_fn: Callable[[str], Dict[str, Any]],
+        # persist_fn(company_id, client_ref, snapshot, turn_count esperado no banco) -> False em conflito
+        persist_fn: Optional[Callable[[str, str, Dict[str, Any], int], bool]] = None,
+        load_fn: Optional[Callable[[str, str], 'ConversationSummary']] = None,
+        max_conversations: int = 5000,
+        max_pending: int = 10000,
+        max_chars: int = 400,
+    ):
+        self.extract_fn = extract_fn
+        self.persist_fn = persist_fn
+        self.load_fn = load_fn
+        self.max_conversations = max_conversations
+        self.max_chars = max_chars
+        self._summaries: 'OrderedDict[ConversationKey, ConversationSummary]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue[Tuple[str, str, str, str]]' = queue.Queue(maxsize=max_pending)
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.conflicts = 0
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def _ensure_worker(self):
+        # Thread criada sob demanda (depois de um eventual fork do servidor)
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name='conversation-summarizer', daemon=True)
+                    self._worker.start()
+
+    def submit(self, company_id: str, client_ref: str, direction: str, text: str):
+        """Enfileira um turno para atualizar o resumo (não bloqueia a requisição)."""
+        if not client_ref or not (text or '').strip():
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((company_id, client_ref, direction, text))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"[SUMMARY] Queue full, dropping turn for {company_id}:{client_ref}")
+
+    def _run(self):
+        while True:
+            company_id, client_ref, direction, text = self._queue.get()
+            try:
+                self.apply_turn(company_id, client_ref, direction, text)
+            except Exception as e:
+                logger.error(f"[SUMMARY] Failed to update summary for {company_id}:{client_ref}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def apply_turn(self, company_id: str, client_ref: str, direction: str, text: str):
+        """
+        Atualiza o resumo com um turno (síncrono; usado pela thread de fundo).
+        O resumo em memória só é trocado depois de gravado (ou sem persist_fn).
+        """
+        extracted = self.extract_fn(text) if direction == 'received' else {}
+        current = self.get(company_id, client_ref)
+        if current is None and self.load_fn:
+            # Conversa fria: continuar do resumo persistido, não de um resumo vazio
+            current = self.load_fn(company_id, client_ref)
+
+        summary = None
+        for _attempt in range(PERSIST_ATTEMPTS):
+            base = current or ConversationSummary()
+            candidate = self._with_turn(base, extracted, direction, text)
+            if self.persist_fn is None or self.persist_fn(company_id, client_ref, candidate.to_dict(), base.turn_count):
+                summary = candidate
+                break
+            # Outro processo gravou esta conversa depois da nossa leitura
+            self.conflicts += 1
+            current = self.load_fn(company_id, client_ref) if self.load_fn else None
+        if summary is None:
+            logger.warning(f"[SUMMARY] Concurrent updates, turn not applied for {company_id}:{client_ref}")
+            summary = current or ConversationSummary()
+        self.put(company_id, client_ref, summary, replace=True)
+
+    @staticmethod
+    def _with_turn(base: ConversationSummary, extracted: Dict[str, Any], direction: str,
+                   text: str) -> ConversationSummary:
+        summary = base.copy()
+        for field, _label in FACT_FIELDS:
+            value = extracted.get(field)
+            if value:
+                summary.facts[field] = _clip(str(value), 60)
+        if direction == 'received':
+            summary.last_client_message = _clip(text, 240)
+        else:
+            summary.last_reply = _clip(text, 240)
+        summary.turn_count += 1
+        summary.updated_at = datetime.now()
+        return summary
+
+    def get(self, company_id: str, client_ref: str) -> Optional[ConversationSummary]:
+        with self._lock:
+            return self._summaries.get((company_id, client_ref))
+
+    def put(self, company_id: str, client_ref: str, summary: ConversationSummary, replace: bool = False):
+        """Instala um resumo (carregado do banco); sem replace, só se ainda não houver um em memória."""
+        key = (company_id, client_ref)
+        with self._lock:
+            if key in self._summaries and not replace:
+                return
+            self._summaries[key] = summary
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self.max_conversations:
+                self._summaries.popitem(last=False)
+
+    def render(self, company_id: str, client_ref: str) -> Optional[str]:
+        summary = self.get(company_id, client_ref)
+        if summary is None or summary.turn_count == 0:
+            return None
+        return summary.render(self.max_chars)
@@ -0,0 +1,65 @@
+"""
+Configuração do Gunicorn - modo produção do cognitive_engine (ver serve.py)
+
+- preload_app: o mestre importa o engine e chama preload_shared_state() antes de
+  criar os workers; léxicos, padrões compilados e matchers ficam em páginas
+  compartilhadas (copy-on-write).
+- GC: desligado no mestre e gc.freeze() antes de cada fork, para que a coleta
+  nos workers não toque (e copie) os objetos herdados; religado no worker.
+- Recursos por processo (conexões, thread de LISTEN, jobs, aquecimento) só depois do fork.
+- Workers reciclados após COGNITIVE_MAX_REQUESTS (+ jitter) e desligamento gracioso
+  em SIGTERM dentro de COGNITIVE_GRACEFUL_TIMEOUT.
+"""
+import gc
+import multiprocessing
+import os
+
+from lanes import lanes_from_env, threads_needed
+
+bind = f"{os.getenv('COGNITIVE_HOST', '0.0.0.0')}:{os.getenv('COGNITIVE_PORT', '5001')}"
+workers = int(os.getenv('COGNITIVE_WORKERS', str(max(2, multiprocessing.cpu_count()))))
+# Threads por worker: requisições passam boa parte do tempo esperando Ollama/banco.
+# Padrão: o bastante para as faixas de prioridade (lanes.py) executarem e enfileirarem
+# sem que uma requisição interativa espere thread atrás de um lote.
+worker_class = 'gthread'
+threads = int(os.getenv('COGNITIVE_THREADS') or threads_needed(*lanes_from_env(os.environ)))
+preload_app = True
+
+max_requests = int(os.getenv('COGNITIVE_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.getenv('COGNITIVE_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+# Uma chamada ao LLM pode levar OLLAMA_TIMEOUT; o worker não pode ser morto antes disso
+timeout = int(os.getenv('COGNITIVE_WORKER_TIMEOUT', str(int(os.getenv('OLLAMA_TIMEOUT', '15')) + 30)))
+graceful_timeout = int(os.getenv('COGNITIVE_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('COGNITIVE_KEEPALIVE', '5'))
+
+accesslog = os.getenv('COGNITIVE_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.getenv('COGNITIVE_LOG_LEVEL', 'info')
+
+# Objetos alocados no mestre não devem ser coletados (e reescritos) antes do fork
+gc.disable()
+
+
+def when_ready(server):
+    import cognitive_engine
+    elapsed = cognitive_engine.preload_shared_state()
+    server.log.info(f"[SERVE] Shared state preloaded in {elapsed * 1000:.1f} ms")
+
+
+def pre_fork(server, worker):
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+    import cognitive_engine
+    cognitive_engine.start_warm_up()
+    cognitive_engine.start_cache_listener()
+    cognitive_engine.start_job_runner()
+
+
+def worker_exit(server, worker):
+    import cognitive_engine
+    cognitive_engine.stop_job_runner()
+    cognitive_engine.stop_cache_listener()
+    cognitive_engine.hot_queries.close_all()
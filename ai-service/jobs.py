@@ -0,0 +1,452 @@
+"""
+Jobs assíncronos - respostas cognitivas em fila, entregues por callback ou polling
+
+POST /jobs devolve um job_id na hora. Threads do JobRunner pegam os jobs da fila,
+executam o mesmo fluxo de /cognitive-response e guardam o resultado. Quem
+submeteu consulta GET /jobs/<id> ou recebe o resultado num callback_url.
+
+Garantias:
+- Idempotência: (company_id, idempotency_key) identifica o job. Reenviar a mesma
+  chave devolve o job existente, sem executar de novo.
+- Execução: erro temporário (5xx, 429, exceção) volta para a fila com backoff
+  exponencial até max_attempts. Erro do pedido (4xx) falha na hora.
+- Callback: entrega pelo menos uma vez, com backoff até callback_max_attempts.
+  O corpo é assinado com HMAC-SHA256 (X-Cognitive-Signature) e traz X-Job-Id
+  para o receptor descartar duplicatas.
+
+Backends (mesma interface):
+- MemoryJobStore: fila no processo, para testes e desenvolvimento (um processo só)
+- PostgresJobStore: tabela ai_jobs (migration 20260112000001), com claim por
+  FOR UPDATE SKIP LOCKED e lease. Um job de worker que morreu volta para a fila
+  quando o lease expira. Vários workers/hosts dividem a mesma fila.
+"""
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ('done', 'failed')
+
+# handler(job) -> (status HTTP, corpo JSON) do fluxo síncrono
+JobHandler = Callable[[Dict[str, Any]], Tuple[int, Dict[str, Any]]]
+
+
+def _iso(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, timezone.utc)
+    return value.isoformat(timespec='seconds')
+
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Representação pública do job (GET /jobs/<id> e corpo do callback)."""
+    return {
+        'job_id': str(job['id']),
+        'company_id': str(job['company_id']),
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'result': job.get('result'),
+        'error': job.get('error'),
+        'created_at': _iso(job.get('created_at')),
+        'finished_at': _iso(job.get('finished_at')),
+        'callback': {
+            'status': job.get('callback_status'),
+            'attempts': job.get('callback_attempts', 0),
+            'error': job.get('callback_error'),
+        } if job.get('callback_url') else None,
+    }
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def backoff(base: float, attempt: int, cap: float) -> float:
+    """base * 2^(attempt-1), limitado a cap."""
+    return min(cap, base * (2 ** max(0, attempt - 1)))
+
+
+class MemoryJobStore:
+    """Fila e registro de jobs no processo (thread-safe). Guarda até max_jobs."""
+
+    def __init__(self, max_jobs: int = 10000):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[Tuple[str, str], str] = {}
+        self._ready: List[Tuple[float, int, str]] = []  # heap (run_after, seq, id)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def _push(self, job_id: str, run_after: float):
+        self._seq += 1
+        heapq.heappush(self._ready, (run_after, self._seq, job_id))
+        self._cond.notify()
+
+    def _evict(self):
+        """Descarta os jobs finalizados mais antigos acima de max_jobs."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j for j, job in self._jobs.items()
+                       if job['status'] in FINAL_STATUSES and job.get('callback_status') != 'pending'][:excess]:
+            job = self._jobs.pop(job_id)
+            if job.get('idempotency_key'):
+                self._keys.pop((job['company_id'], job['idempotency_key']), None)
+
+    def submit(self, company_id: str, request: Dict[str, Any], callback_url: Optional[str] = None,
+               idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """(job, criado). Chave já usada pela empresa devolve o job existente."""
+        with self._cond:
+            if idempotency_key:
+                existing = self._keys.get((company_id, idempotency_key))
+                if existing in self._jobs:
+                    return dict(self._jobs[existing]), False
+            now = time.time()
+            job = {
+                'id': str(uuid.uuid4()), 'company_id': company_id, 'idempotency_key': idempotency_key,
+                'status': 'queued', 'request': request, 'result': None, 'error': None, 'attempts': 0,
+                'callback_url': callback_url, 'callback_status': None, 'callback_attempts': 0,
+                'callback_error': None, 'callback_next_at': None,
+                'created_at': now, 'updated_at': now, 'finished_at': None,
+            }
+            self._jobs[job['id']] = job
+            if idempotency_key:
+                self._keys[(company_id, idempotency_key)] = job['id']
+            self._push(job['id'], now)
+            self._evict()
+            return dict(job), True
+
+    def claim(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Próximo job pronto (status running, attempts+1) ou None após timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                if self._ready and self._ready[0][0] <= now:
+                    _, _, job_id = heapq.heappop(self._ready)
+                    job = self._jobs.get(job_id)
+                    if job is None or job['status'] != 'queued':
+                        continue
+                    job['status'] = 'running'
+                    job['attempts'] += 1
+                    job['updated_at'] = now
+                    return dict(job)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                wait = remaining if not self._ready else min(remaining, self._ready[0][0] - now)
+                self._cond.wait(max(wait, 0.001))
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None,
+               retry_at: Optional[float] = None):
+        """Resultado do job: status final, ou de volta à fila em retry_at."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            now = time.time()
+            job['updated_at'] = now
+            job['error'] = error
+            if retry_at is not None:
+                job['status'] = 'queued'
+                self._push(job_id, retry_at)
+                return
+            job['status'] = status
+            job['result'] = result
+            job['finished_at'] = now
+            if job['callback_url']:
+                job['callback_status'] = 'pending'
+                job['callback_next_at'] = now
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def due_callbacks(self, limit: int, lease: float) -> List[Dict[str, Any]]:
+        """Callbacks pendentes vencidos; ficam reservados por `lease` segundos."""
+        now = time.time()
+        due = []
+        with self._cond:
+            for job in self._jobs.values():
+                if len(due) >= limit:
+                    break
+                if job['callback_status'] == 'pending' and job['callback_next_at'] <= now:
+                    job['callback_next_at'] = now + lease
+                    due.append(dict(job))
+        return due
+
+    def record_callback(self, job_id: str, delivered: bool, error: Optional[str] = None,
+                        next_at: Optional[float] = None):
+        """Tentativa de entrega: delivered, nova tentativa em next_at ou failed (next_at None)."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['callback_attempts'] += 1
+            job['callback_error'] = error
+            job['callback_status'] = 'delivered' if delivered else ('pending' if next_at else 'failed')
+            job['callback_next_at'] = next_at
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+
+
+class PostgresJobStore:
+    """Fila durável na tabela ai_jobs; connect() devolve uma conexão psycopg2 (RealDictCursor)."""
+
+    COLUMNS = ('id, company_id, idempotency_key, status, request, result, error, attempts, callback_url, '
+               'callback_status, callback_attempts, callback_error, created_at, finished_at')
+
+    def __init__(self, connect: Callable[[], Any], lease_seconds: float = 120.0, poll_interval: float = 0.5):
+        self.connect = connect
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+    def _execute(self, sql: str, params: tuple = (), fetch: str = 'one'):
+        conn = self.connect()
+        try:
+            with conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+                    if fetch == 'one':
+                        return cur.fetchone()
+                    if fetch == 'all':
+                        return cur.fetchall()
+                    return None
+        finally:
+            conn.close()
+
+    def submit(self, company_id: str, request: Dict[str, Any], callback_url: Optional[str] = None,
+               idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        row = self._execute(
+            f"""INSERT INTO ai_jobs (id, company_id, idempotency_key, status, request, callback_url,
+                                    attempts, callback_attempts, run_after, created_at, updated_at)
+                VALUES (%s, %s, %s, 'queued', %s::jsonb, %s, 0, 0, now(), now(), now())
+                ON CONFLICT (company_id, idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+                RETURNING {self.COLUMNS}""",
+            (str(uuid.uuid4()), company_id, idempotency_key, json.dumps(request, ensure_ascii=False), callback_url),
+        )
+        if row is not None:
+            return dict(row), True
+        row = self._execute(
+            f"SELECT {self.COLUMNS} FROM ai_jobs WHERE company_id = %s AND idempotency_key = %s",
+            (company_id, idempotency_key),
+        )
+        return dict(row), False
+
+    def claim(self, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            # queued vencido ou running com lease expirado (worker morreu no meio)
+            row = self._execute(
+                f"""UPDATE ai_jobs SET status = 'running', attempts = attempts + 1,
+                       locked_until = now() + make_interval(secs => %s), updated_at = now()
+                    WHERE id = (
+                        SELECT id FROM ai_jobs
+                        WHERE (status = 'queued' AND run_after <= now())
+                           OR (status = 'running' AND locked_until < now())
+                        ORDER BY run_after
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING {self.COLUMNS}""",
+                (self.lease_seconds,),
+            )
+            if row is not None:
+                return dict(row)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None,
+               retry_at: Optional[float] = None):
+        if retry_at is not None:
+            self._execute(
+                """UPDATE ai_jobs SET status = 'queued', error = %s, locked_until = NULL,
+                       run_after = to_timestamp(%s), updated_at = now()
+                   WHERE id = %s""",
+                (error, retry_at, job_id), fetch=None,
+            )
+            return
+        self._execute(
+            """UPDATE ai_jobs SET status = %s, result = %s::jsonb, error = %s, locked_until = NULL,
+                   finished_at = now(), updated_at = now(),
+                   callback_status = CASE WHEN callback_url IS NOT NULL THEN 'pending' END,
+                   callback_next_at = CASE WHEN callback_url IS NOT NULL THEN now() END
+               WHERE id = %s""",
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, job_id),
+            fetch=None,
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(f"SELECT {self.COLUMNS} FROM ai_jobs WHERE id = %s", (job_id,))
+        return dict(row) if row else None
+
+    def due_callbacks(self, limit: int, lease: float) -> List[Dict[str, Any]]:
+        rows = self._execute(
+            f"""UPDATE ai_jobs SET callback_next_at = now() + make_interval(secs => %s)
+                WHERE id IN (
+                    SELECT id FROM ai_jobs
+                    WHERE callback_status = 'pending' AND callback_next_at <= now()
+                    ORDER BY callback_next_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {self.COLUMNS}""",
+            (lease, limit), fetch='all',
+        )
+        return [dict(row) for row in rows or []]
+
+    def record_callback(self, job_id: str, delivered: bool, error: Optional[str] = None,
+                        next_at: Optional[float] = None):
+        status = 'delivered' if delivered else ('pending' if next_at else 'failed')
+        self._execute(
+            """UPDATE ai_jobs SET callback_attempts = callback_attempts + 1, callback_error = %s,
+                   callback_status = %s, callback_next_at = to_timestamp(%s), updated_at = now()
+               WHERE id = %s""",
+            (error, status, next_at, job_id), fetch=None,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._execute("SELECT status, count(*) AS n FROM ai_jobs GROUP BY status", fetch='all')
+        return {row['status']: row['n'] for row in rows or []}
+
+
+class JobRunner:
+    """Threads que executam os jobs da fila e uma thread que entrega os callbacks."""
+
+    def __init__(
+        self,
+        store: Any,
+        handler: JobHandler,
+        workers: int = 2,
+        max_attempts: int = 3,
+        retry_base: float = 2.0,
+        retry_cap: float = 60.0,
+        callback_max_attempts: int = 6,
+        callback_timeout: float = 10.0,
+        callback_secret: Optional[str] = None,
+        metrics: Any = None,
+    ):
+        self.store = store
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.callback_max_attempts = callback_max_attempts
+        self.callback_timeout = callback_timeout
+        self.callback_secret = callback_secret
+        self.metrics = metrics
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _count(self, name: str, **labels):
+        if self.metrics is not None:
+            self.metrics.increment(name, **labels)
+
+    # ===== execução =====
+    def run_one(self, job: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            status_code, body = self.handler(job)
+        except Exception as e:
+            logger.error(f"[JOBS] {job['id']} raised: {e}", exc_info=True)
+            status_code, body = 500, {'error': str(e)}
+        if self.metrics is not None:
+            self.metrics.observe('job_run_ms', (time.perf_counter() - started) * 1000)
+
+        if status_code == 200:
+            self.store.finish(job['id'], 'done', result=body)
+            self._count('jobs_finished', status='done')
+            return
+        error = (body or {}).get('error') or f'HTTP {status_code}'
+        retryable = status_code >= 500 or status_code == 429
+        if retryable and job['attempts'] < self.max_attempts:
+            retry_at = time.time() + backoff(self.retry_base, job['attempts'], self.retry_cap)
+            self.store.finish(job['id'], 'queued', error=error, retry_at=retry_at)
+            self._count('jobs_retried')
+            return
+        self.store.finish(job['id'], 'failed', error=error)
+        self._count('jobs_finished', status='failed')
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            try:
+                job = self.store.claim(timeout=1.0)
+            except Exception as e:
+                logger.error(f"[JOBS] claim failed: {e}")
+                self._stop_event.wait(2.0)
+                continue
+            if job is not None:
+                self.run_one(job)
+
+    # ===== callbacks =====
+    def deliver(self, job: Dict[str, Any]):
+        # Import tardio, como no engine: requests só é necessário com callbacks
+        import requests
+
+        body = json.dumps(job_view(job), ensure_ascii=False).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'X-Job-Id': str(job['id'])}
+        if self.callback_secret:
+            headers['X-Cognitive-Signature'] = sign_payload(self.callback_secret, body)
+        try:
+            response = requests.post(job['callback_url'], data=body, headers=headers, timeout=self.callback_timeout)
+            error = None if 200 <= response.status_code < 300 else f'HTTP {response.status_code}'
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+
+        if error is None:
+            self.store.record_callback(job['id'], True)
+            self._count('job_callbacks', result='delivered')
+            return
+        attempts = job.get('callback_attempts', 0) + 1
+        next_at = None
+        if attempts < self.callback_max_attempts:
+            next_at = time.time() + backoff(self.retry_base, attempts, self.retry_cap)
+        self.store.record_callback(job['id'], False, error=error, next_at=next_at)
+        self._count('job_callbacks', result='retry' if next_at else 'failed')
+        logger.warning(f"[JOBS] callback for {job['id']} failed ({attempts}/{self.callback_max_attempts}): {error}")
+
+    def _deliver_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                due = self.store.due_callbacks(limit=20, lease=self.callback_timeout * 2)
+            except Exception as e:
+                logger.error(f"[JOBS] callback scan failed: {e}")
+                due = []
+            for job in due:
+                self.deliver(job)
+            if not due:
+                self._stop_event.wait(0.5)
+
+    # ===== ciclo de vida =====
+    def start(self) -> 'JobRunner':
+        targets = [(self._work, f'job-worker-{i}') for i in range(self.workers)]
+        targets.append((self._deliver_loop, 'job-callbacks'))
+        for target, name in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
@@ -0,0 +1,79 @@
+"""
+JSON do endpoint quente - codificação rápida, leitura única do corpo e seleção de campos
+
+- dumps/loads usam orjson quando instalado (bytes UTF-8 direto, sem escapar acentos)
+  e caem no json da biblioteca padrão com a mesma saída compacta.
+- request_json() lê o corpo uma única vez por requisição e guarda em flask.g:
+  o middleware validate_tenant e o handler compartilham o mesmo dict.
+- select_fields() recorta o payload de /cognitive-response: o backend só lê
+  suggested_response, confidence, detected_intent, intent_confidence e knowledge_used
+  (profile "compact"); semantics/structural_analysis são a maior parte dos bytes.
+"""
+import json
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from flask import Response, g, request
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+RESPONSE_PROFILES = {
+    'full': None,
+    'compact': ('suggested_response', 'confidence', 'detected_intent', 'intent_confidence', 'knowledge_used'),
+}
+
+
+def dumps(payload: Any) -> bytes:
+    """Serializa em JSON compacto (UTF-8, sem escapar acentos)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Equivalente a jsonify(payload), status usando o codificador rápido."""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def request_json() -> Dict[str, Any]:
+    """
+    Corpo JSON da requisição atual, lido uma única vez (cache em flask.g).
+    Corpo vazio vira {}; JSON inválido levanta ValueError.
+    """
+    if 'request_json' not in g:
+        raw = request.get_data(cache=True)
+        data = loads(raw) if raw.strip() else {}
+        g.request_json = data if isinstance(data, dict) else {}
+    return g.request_json
+
+
+def requested_fields(data: Dict[str, Any], args: Optional[Mapping[str, str]] = None) -> Optional[Iterable[str]]:
+    """
+    Campos pedidos pelo cliente: "fields" (lista ou "a,b,c", no corpo ou na query
+    string args) tem precedência sobre "profile". None = payload completo.
+    """
+    args = args or {}
+    fields = data.get('fields') or args.get('fields')
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    if fields:
+        return fields
+    profile = data.get('profile') or args.get('profile')
+    return RESPONSE_PROFILES.get(profile) if isinstance(profile, str) else None
+
+
+def select_fields(payload: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Recorta o payload; campos desconhecidos são ignorados."""
+    if fields is None:
+        return payload
+    return {name: payload[name] for name in fields if name in payload}
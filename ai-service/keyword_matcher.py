@@ -0,0 +1,113 @@
+"""
+Busca de Palavras-Chave - autômato sobre palavras (uma passada por mensagem)
+
+Substitui o padrão "um re.search(r'\\bpalavra\\b') por palavra-chave" por uma
+única varredura: o texto é quebrado em sequências \\w+ e cada posição segue uma
+trie de palavras. Palavras-chave com mais de uma palavra ("por que", "o que")
+exigem exatamente o mesmo separador do texto original entre as palavras.
+
+A semântica é a mesma de re.search(r'\\b' + palavra + r'\\b', texto): uma
+palavra-chave casa quando cada parte coincide com uma sequência \\w+ inteira do
+texto, e o resultado de cada categoria preserva a ordem em que as palavras-chave
+foram declaradas (não a ordem no texto), sem repetições.
+
+compile_alternation() atende o caso de substring (sem limites de palavra): gera
+uma única regex com os prefixos comuns fatorados em trie, que casa a palavra
+mais longa em cada posição sem testar as alternativas uma a uma.
+"""
+import re
+from typing import Dict, Iterable, List, Pattern, Sequence, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+# Terminal da trie: (categoria, posição da palavra-chave na categoria)
+_Terminal = Tuple[str, int]
+
+
+class _TrieNode:
+    __slots__ = ('terminals', 'children')
+
+    def __init__(self):
+        self.terminals: List[_Terminal] = []
+        # (separador, próxima palavra) → nó
+        self.children: Dict[Tuple[str, str], '_TrieNode'] = {}
+
+
+class KeywordMatcher:
+    """Conjunto de categorias de palavras-chave compilado numa trie de palavras."""
+
+    def __init__(self, categories: Dict[str, Sequence[str]]):
+        self.categories: Dict[str, Tuple[str, ...]] = {name: tuple(words) for name, words in categories.items()}
+        self._roots: Dict[str, _TrieNode] = {}
+        for category, keywords in self.categories.items():
+            for position, keyword in enumerate(keywords):
+                self._add(keyword, (category, position))
+
+    def _add(self, keyword: str, terminal: _Terminal):
+        parts = _WORD_RE.findall(keyword)
+        spans = [m.span() for m in _WORD_RE.finditer(keyword)]
+        if not parts or spans[0][0] != 0 or spans[-1][1] != len(keyword):
+            raise ValueError(f"Palavra-chave deve começar e terminar com letra/dígito: {keyword!r}")
+
+        node = self._roots.get(parts[0])
+        if node is None:
+            node = self._roots[parts[0]] = _TrieNode()
+        for i in range(1, len(parts)):
+            edge = (keyword[spans[i - 1][1]:spans[i][0]], parts[i])
+            child = node.children.get(edge)
+            if child is None:
+                child = node.children[edge] = _TrieNode()
+            node = child
+        node.terminals.append(terminal)
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """Palavras-chave presentes no texto, por categoria (ordem de declaração)."""
+        matches = [(m.group(), m.start(), m.end()) for m in _WORD_RE.finditer(text)]
+        found = set()
+        for i, (word, _start, end) in enumerate(matches):
+            node = self._roots.get(word)
+            j = i
+            while node is not None:
+                found.update(node.terminals)
+                if not node.children or j + 1 >= len(matches):
+                    break
+                next_word, next_start, next_end = matches[j + 1]
+                node = node.children.get((text[end:next_start], next_word))
+                j += 1
+                end = next_end
+
+        result: Dict[str, List[str]] = {name: [] for name in self.categories}
+        for category, position in sorted(found, key=lambda t: (t[0], t[1])):
+            result[category].append(self.categories[category][position])
+        return result
+
+
+def _trie_pattern(node: dict) -> str:
+    """Converte a trie de caracteres em regex; '' marca fim de palavra."""
+    ends_here = '' in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != '']
+    if not branches:
+        return ''
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    body = '(?:' + '|'.join(branches) + ')'
+    # Fim opcional depois do prefixo: '?' guloso prefere a continuação mais longa
+    return body + '?' if ends_here else body
+
+
+def compile_alternation(words: Iterable[str], flags: int = 0) -> Pattern:
+    """
+    Uma regex que casa qualquer uma das palavras (como substring), preferindo a
+    mais longa em cada posição. Sem palavras, retorna uma regex que nunca casa.
+    """
+    root: dict = {}
+    for word in words:
+        if not word:
+            continue
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    if not root:
+        return re.compile(r'(?!)')
+    return re.compile(_trie_pattern(root), flags)
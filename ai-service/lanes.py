@@ -0,0 +1,250 @@
+"""
+Faixas de prioridade - chat interativo, auto-resposta e trabalho em lote
+
+Quem chama /cognitive-response marca a requisição com uma faixa ("priority" no
+corpo ou cabeçalho X-Priority). Em ordem de prioridade:
+- interactive: chat web, alguém esperando a resposta na tela
+- auto: auto-resposta do WhatsApp (padrão quando a faixa não é informada)
+- bulk: sugestões geradas a partir de e-mails, replays e backfills
+
+PriorityLanes limita as requisições em execução no processo (capacity). Cada
+faixa tem slots reservados que só ela usa. O restante é compartilhado e vai
+primeiro para a faixa de maior prioridade que estiver esperando. limit impõe
+um teto por faixa, para o lote nunca ocupar o compartilhado inteiro. Assim, um
+backlog de e-mails não passa na frente do chat: a requisição interativa usa um
+slot reservado ou o próximo slot compartilhado livre.
+
+Fila cheia ou espera acima do prazo da faixa levanta LaneRejected.
+
+Métricas (por faixa): lane_active, lane_queue_depth, lane_wait_ms,
+lane_rejected{reason}, cognitive_response_ms e lane_target_missed. report()
+junta a configuração, o estado atual e a latência observada contra a meta de
+cada faixa.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+LANES = ('interactive', 'auto', 'bulk')
+DEFAULT_LANE = 'auto'
+
+
+def normalize_lane(value: Optional[str]) -> str:
+    """Faixa informada pelo chamador; desconhecida ou ausente vira DEFAULT_LANE."""
+    lane = (value or '').strip().lower()
+    return lane if lane in LANES else DEFAULT_LANE
+
+
+class LaneRejected(Exception):
+    """Requisição não admitida na faixa: reason é 'queue_full' ou 'timeout'."""
+
+    def __init__(self, lane: str, reason: str):
+        super().__init__(f"lane {lane} rejected: {reason}")
+        self.lane = lane
+        self.reason = reason
+
+
+class LaneConfig:
+    """
+    reserved: slots só desta faixa; limit: teto de execuções simultâneas (None = capacity);
+    timeout: segundos de espera por um slot; target_ms: meta de latência da resposta.
+    """
+    __slots__ = ('reserved', 'limit', 'queue_limit', 'timeout', 'target_ms')
+
+    def __init__(self, reserved: int = 0, limit: Optional[int] = None, queue_limit: int = 32,
+                 timeout: float = 10.0, target_ms: float = 1000.0):
+        self.reserved = reserved
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.target_ms = target_ms
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class PriorityLanes:
+    """Slots de execução com reserva por faixa e compartilhado por prioridade (thread-safe)."""
+
+    def __init__(self, capacity: int, lanes: Dict[str, LaneConfig], metrics: Any = None,
+                 order: tuple = LANES, prefix: str = 'lane'):
+        self.order = tuple(lane for lane in order if lane in lanes)
+        self.lanes = lanes
+        self.capacity = max(capacity, sum(cfg.reserved for cfg in lanes.values()), 1)
+        self.shared = self.capacity - sum(cfg.reserved for cfg in lanes.values())
+        self.metrics = metrics
+        self.prefix = prefix
+        self._active: Dict[str, int] = {lane: 0 for lane in self.order}
+        self._waiting: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in self.order}
+        self._lock = threading.Lock()
+        if metrics is not None:
+            for lane in self.order:
+                metrics.set_gauge(f'{prefix}_target_ms', lanes[lane].target_ms, lane=lane)
+
+    # ===== estado interno (sempre com _lock) =====
+    def _shared_used(self) -> int:
+        return sum(max(0, self._active[lane] - self.lanes[lane].reserved) for lane in self.order)
+
+    def _can_start(self, lane: str) -> bool:
+        cfg = self.lanes[lane]
+        active = self._active[lane]
+        if cfg.limit is not None and active >= cfg.limit:
+            return False
+        return active < cfg.reserved or self._shared_used() < self.shared
+
+    def _ahead(self, lane: str) -> bool:
+        """Há alguém esperando nesta faixa ou numa de prioridade maior?"""
+        for other in self.order:
+            if self._waiting[other]:
+                return True
+            if other == lane:
+                return False
+        return False
+
+    def _grant(self, lane: str):
+        self._active[lane] += 1
+        self._publish(lane)
+
+    def _dispatch(self):
+        for lane in self.order:
+            waiting = self._waiting[lane]
+            while waiting and self._can_start(lane):
+                waiter = waiting.popleft()
+                waiter.granted = True
+                self._grant(lane)
+                waiter.event.set()
+
+    def _publish(self, lane: str):
+        if self.metrics is not None:
+            self.metrics.set_gauge(f'{self.prefix}_active', self._active[lane], lane=lane)
+            self.metrics.set_gauge(f'{self.prefix}_queue_depth', len(self._waiting[lane]), lane=lane)
+
+    def _reject(self, lane: str, reason: str) -> LaneRejected:
+        if self.metrics is not None:
+            self.metrics.increment(f'{self.prefix}_rejected', reason=reason, lane=lane)
+        return LaneRejected(lane, reason)
+
+    # ===== API =====
+    def acquire(self, lane: str) -> float:
+        """Espera um slot da faixa (até o timeout dela) e retorna o tempo de espera."""
+        cfg = self.lanes[lane]
+        started = time.monotonic()
+        with self._lock:
+            # Reserva livre é da faixa; o compartilhado respeita quem tem prioridade e já espera
+            reserved_free = self._active[lane] < cfg.reserved and not self._waiting[lane]
+            if (reserved_free or not self._ahead(lane)) and self._can_start(lane):
+                self._grant(lane)
+                waiter = None
+            elif len(self._waiting[lane]) >= cfg.queue_limit:
+                raise self._reject(lane, 'queue_full')
+            else:
+                waiter = _Waiter()
+                self._waiting[lane].append(waiter)
+                self._publish(lane)
+
+        if waiter is not None and not waiter.event.wait(cfg.timeout):
+            with self._lock:
+                if not waiter.granted:
+                    self._waiting[lane].remove(waiter)
+                    self._publish(lane)
+                    raise self._reject(lane, 'timeout')
+
+        waited = time.monotonic() - started
+        if self.metrics is not None:
+            self.metrics.observe(f'{self.prefix}_wait_ms', waited * 1000, lane=lane)
+        return waited
+
+    def release(self, lane: str):
+        with self._lock:
+            if self._active[lane] == 0:
+                return
+            self._active[lane] -= 1
+            self._publish(lane)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, lane: str):
+        """with lanes.slot('interactive'): ... (LaneRejected se não admitido)."""
+        self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def observe_latency(self, lane: str, elapsed_ms: float):
+        """Latência total da resposta na faixa, comparada com a meta."""
+        if self.metrics is None:
+            return
+        self.metrics.observe('cognitive_response_ms', elapsed_ms, lane=lane)
+        if elapsed_ms > self.lanes[lane].target_ms:
+            self.metrics.increment(f'{self.prefix}_target_missed', lane=lane)
+
+    def report(self) -> Dict[str, Any]:
+        """Configuração, estado e latência observada (janela recente) por faixa."""
+        snapshot = self.metrics.snapshot() if self.metrics is not None else {}
+        histograms = snapshot.get('histograms', {})
+        counters = snapshot.get('counters', {})
+        with self._lock:
+            state = {lane: (self._active[lane], len(self._waiting[lane])) for lane in self.order}
+        lanes: Dict[str, Any] = {}
+        for lane in self.order:
+            cfg = self.lanes[lane]
+            latency = histograms.get(f'cognitive_response_ms{{lane={lane}}}', {})
+            lanes[lane] = {
+                'reserved': cfg.reserved,
+                'limit': cfg.limit,
+                'queue_limit': cfg.queue_limit,
+                'active': state[lane][0],
+                'queued': state[lane][1],
+                'target_ms': cfg.target_ms,
+                'latency_ms': {k: latency.get(k) for k in ('count', 'p50', 'p95', 'p99', 'max')},
+                'wait_ms': {k: histograms.get(f'{self.prefix}_wait_ms{{lane={lane}}}', {}).get(k) for k in ('p50', 'p95', 'p99')},
+                'target_missed': counters.get(f'{self.prefix}_target_missed{{lane={lane}}}', 0),
+                'rejected': {
+                    reason: counters.get(f'{self.prefix}_rejected{{lane={lane},reason={reason}}}', 0)
+                    for reason in ('queue_full', 'timeout')
+                },
+            }
+        return {'capacity': self.capacity, 'shared': self.shared, 'lanes': lanes}
+
+
+def lanes_from_env(env: Dict[str, str], lanes: List[str] = LANES) -> Tuple[int, Dict[str, LaneConfig]]:
+    """
+    (capacity, LaneConfig por faixa) a partir de LANE_CAPACITY e de
+    LANE_<FAIXA>_RESERVED, _LIMIT, _QUEUE_LIMIT, _TIMEOUT e _TARGET_MS
+    (ex.: LANE_BULK_LIMIT=2), sobre os padrões abaixo.
+    """
+    defaults = {
+        'interactive': LaneConfig(reserved=2, limit=None, queue_limit=8, timeout=10.0, target_ms=1500.0),
+        'auto': LaneConfig(reserved=1, limit=None, queue_limit=6, timeout=15.0, target_ms=3000.0),
+        'bulk': LaneConfig(reserved=0, limit=2, queue_limit=4, timeout=30.0, target_ms=20000.0),
+    }
+    configs = {}
+    for lane in lanes:
+        cfg = defaults.get(lane, LaneConfig())
+        prefix = f'LANE_{lane.upper()}_'
+        limit = env.get(prefix + 'LIMIT')
+        configs[lane] = LaneConfig(
+            reserved=int(env.get(prefix + 'RESERVED', cfg.reserved)),
+            limit=(int(limit) or None) if limit is not None else cfg.limit,
+            queue_limit=int(env.get(prefix + 'QUEUE_LIMIT', cfg.queue_limit)),
+            timeout=float(env.get(prefix + 'TIMEOUT', cfg.timeout)),
+            target_ms=float(env.get(prefix + 'TARGET_MS', cfg.target_ms)),
+        )
+    return int(env.get('LANE_CAPACITY', '6')), configs
+
+
+def threads_needed(capacity: int, configs: Dict[str, LaneConfig]) -> int:
+    """
+    Threads do servidor para as faixas funcionarem: quem espera numa fila segura
+    uma thread, e sem thread livre a requisição interativa ficaria na fila FIFO do
+    servidor, antes de chegar às faixas.
+    """
+    return max(capacity, sum(cfg.reserved for cfg in configs.values())) + sum(cfg.queue_limit for cfg in configs.values())
@@ -0,0 +1,102 @@
+"""
+Métricas em processo - contadores, gauges e histogramas simples
+
+Registro leve (sem dependências) exportado em JSON pelo endpoint /metrics do
+cognitive_engine. Histogramas guardam count/sum/max exatos e uma janela das
+últimas observações para percentis aproximados.
+
+Rótulos viram parte do nome: metrics.observe('llm_prompt_tokens', 120, intent='ask_pricing')
+→ "llm_prompt_tokens{intent=ask_pricing}".
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    rendered = ','.join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return float(sorted_values[idx])
+
+
+class Histogram:
+    """Distribuição de valores: agregados exatos + janela recente para percentis."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.recent.append(value)
+
+    def snapshot(self) -> Dict[str, float]:
+        values = sorted(self.recent)
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50': _percentile(values, 0.50),
+            'p95': _percentile(values, 0.95),
+            'p99': _percentile(values, 0.99),
+            'max': self.max,
+        }
+
+
+class MetricsRegistry:
+    """Registro thread-safe de métricas do processo."""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.window)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'histograms': {k: h.snapshot() for k, h in self._histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Registro global do processo
+metrics = MetricsRegistry()
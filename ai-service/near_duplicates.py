@@ -0,0 +1,156 @@
+"""
+Índice de quase-duplicatas - reaproveitar respostas aprovadas pelos operadores
+
+Cada entrada é um par pergunta→resposta aprovado (ai_conversation_suggestions).
+Uma mensagem nova que é quase igual a uma pergunta já respondida ("qual o
+horário de vocês?" / "Qual o horario de voces") recebe a resposta aprovada sem
+chamar o LLM.
+
+Como funciona:
+- Texto normalizado (minúsculas, sem acentos, só letras/dígitos) vira o conjunto
+  de shingles de 4 caracteres.
+- A assinatura MinHash (NUM_PERM funções de hash) estima a similaridade de
+  Jaccard entre os conjuntos. Com LSH (BANDS faixas de ROWS linhas), só
+  perguntas com alguma faixa idêntica viram candidatas: a busca não percorre o
+  índice inteiro.
+- Candidatas são conferidas pelo Jaccard exato dos shingles. Vale a melhor
+  candidata com similaridade >= threshold.
+
+add/remove são incrementais (aprovação nova, edição, rejeição) e thread-safe.
+"""
+import hashlib
+import re
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from text_normalization import normalize_text
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # limiar aproximado do LSH: (1/16)^(1/4) ≈ 0.5
+
+_MERSENNE = (1 << 61) - 1
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def _permutations(count: int) -> List[Tuple[int, int]]:
+    """Coeficientes (a, b) fixos e determinísticos de a*x+b mod 2^61-1."""
+    params = []
+    for i in range(count):
+        digest = hashlib.blake2b(f'minhash-{i}'.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little') % (_MERSENNE - 1) + 1
+        b = int.from_bytes(digest[8:], 'little') % _MERSENNE
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def normalize_message(text: str) -> str:
+    """Minúsculas, sem acentos e pontuação, espaços simples."""
+    return _NON_WORD.sub(' ', normalize_text(text or '')).strip()
+
+
+def shingles(text: str) -> FrozenSet[int]:
+    """Hashes (64 bits, estáveis entre processos) dos shingles de caracteres do texto normalizado."""
+    normalized = normalize_message(text)
+    if not normalized:
+        return frozenset()
+    if len(normalized) <= SHINGLE_SIZE:
+        grams = {normalized}
+    else:
+        grams = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), 'little') for g in grams
+    )
+
+
+def minhash(shingle_set: FrozenSet[int]) -> List[int]:
+    return [min((a * x + b) % _MERSENNE for x in shingle_set) for a, b in _PERMUTATIONS]
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    return [hash(tuple(signature[i * ROWS:(i + 1) * ROWS])) for i in range(BANDS)]
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    __slots__ = ('question', 'answer', 'shingles', 'bands')
+
+    def __init__(self, question: str, answer: str, shingle_set: FrozenSet[int], bands: List[int]):
+        self.question = question
+        self.answer = answer
+        self.shingles = shingle_set
+        self.bands = bands
+
+
+class NearDuplicateIndex:
+    """Pares pergunta→resposta de uma empresa, com busca por quase-duplicata."""
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self._entries: Dict[str, _Entry] = {}
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+
+    def add(self, entry_id: str, question: str, answer: str):
+        """Insere ou substitui a entrada (ex.: resposta aprovada editada depois)."""
+        shingle_set = shingles(question)
+        if not shingle_set or not (answer or '').strip():
+            self.remove(entry_id)
+            return
+        bands = band_keys(minhash(shingle_set))
+        with self._lock:
+            self._remove_locked(entry_id)
+            self._entries[entry_id] = _Entry(question, answer, shingle_set, bands)
+            for bucket, key in zip(self._buckets, bands):
+                bucket.setdefault(key, set()).add(entry_id)
+
+    def remove(self, entry_id: str):
+        with self._lock:
+            self._remove_locked(entry_id)
+
+    def _remove_locked(self, entry_id: str):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for bucket, key in zip(self._buckets, entry.bands):
+            ids = bucket.get(key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del bucket[key]
+
+    def query(self, text: str) -> Optional[Dict[str, Any]]:
+        """Melhor par com similaridade >= threshold: {id, question, answer, similarity} ou None."""
+        shingle_set = shingles(text)
+        if not shingle_set or not self._entries:
+            return None
+        bands = band_keys(minhash(shingle_set))
+        best_id, best_score = None, 0.0
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, bands):
+                ids = bucket.get(key)
+                if ids:
+                    candidates.update(ids)
+            for entry_id in candidates:
+                score = jaccard(shingle_set, self._entries[entry_id].shingles)
+                if score > best_score or (score == best_score and (best_id is None or entry_id < best_id)):
+                    best_id, best_score = entry_id, score
+            if best_id is None or best_score < self.threshold:
+                return None
+            entry = self._entries[best_id]
+            return {'id': best_id, 'question': entry.question, 'answer': entry.answer,
+                    'similarity': round(best_score, 4)}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
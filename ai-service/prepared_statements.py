@@ -0,0 +1,181 @@
+"""
+Consultas quentes preparadas no servidor - conexões reaproveitadas com PREPARE
+
+get_db_connection() abre uma conexão por chamada, e cada query é analisada e
+planejada de novo pelo Postgres. Para as consultas do caminho da requisição
+(vocabulário, base de conhecimento, conceitos, histórico), PreparedStatementPool
+mantém até max_size conexões abertas e faz PREPARE de cada consulta uma vez
+por conexão. As execuções seguintes são só EXECUTE nome(parâmetros).
+
+- Conexões em autocommit: consulta com erro não deixa transação abortada e
+  conexão ociosa não segura transação aberta.
+- set_statements() troca o conjunto (schema mudou): as conexões atuais são
+  descartadas, pois os planos preparados podem não valer mais.
+- Conexão caída é descartada e a consulta é repetida uma vez numa nova.
+- Depois de um fork, as conexões herdadas são abandonadas (sem fechar: o socket
+  é do processo pai).
+
+Métricas: db_pool_open, db_pool_wait_ms, db_statement_prepared{statement},
+db_statement_ms{statement}.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+import psycopg2
+
+
+class PoolExhausted(Exception):
+    """Nenhuma conexão livre dentro do timeout."""
+
+
+class _PooledConnection:
+    __slots__ = ('conn', 'prepared', 'generation')
+
+    def __init__(self, conn: Any, generation: int):
+        self.conn = conn
+        self.prepared: Set[str] = set()
+        self.generation = generation
+
+
+class PreparedStatementPool:
+    """Pool pequeno de conexões com consultas nomeadas preparadas sob demanda (thread-safe)."""
+
+    def __init__(self, connect: Callable[[], Any], statements: Optional[Dict[str, str]] = None,
+                 max_size: int = 6, timeout: float = 5.0, metrics: Any = None, prefix: str = 'db'):
+        self.connect = connect
+        self.statements: Dict[str, str] = dict(statements or {})
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.metrics = metrics
+        self.prefix = prefix
+        self._idle: List[_PooledConnection] = []
+        self._open = 0
+        self._generation = 0
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.statements
+
+    def set_statements(self, statements: Dict[str, str]):
+        """Novo conjunto de consultas; conexões com o conjunto antigo são fechadas."""
+        with self._cond:
+            self.statements = dict(statements)
+            self._generation += 1
+            stale, self._idle = self._idle, []
+            self._open -= len(stale)
+            self._cond.notify_all()
+        for pooled in stale:
+            self._close(pooled)
+
+    def execute(self, name: str, params: Sequence[Any] = ()) -> List[Any]:
+        """Linhas de EXECUTE name(params). KeyError se a consulta não está no conjunto."""
+        sql = self.statements[name]
+        started = time.monotonic()
+        for attempt in (1, 2):
+            pooled = self._acquire()
+            try:
+                rows = self._run(pooled, name, sql, params)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                self._discard(pooled)
+                if attempt == 2:
+                    raise
+                continue
+            except Exception:
+                # Plano preparado pode ter ficado inválido: a conexão sai junto com ele
+                self._discard(pooled)
+                raise
+            self._release(pooled)
+            if self.metrics is not None:
+                self.metrics.observe(f'{self.prefix}_statement_ms', (time.monotonic() - started) * 1000, statement=name)
+            return rows
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close(pooled)
+
+    # ===== interno =====
+    def _run(self, pooled: _PooledConnection, name: str, sql: str, params: Sequence[Any]) -> List[Any]:
+        cur = pooled.conn.cursor()
+        try:
+            if name not in pooled.prepared:
+                cur.execute(f"PREPARE {name} AS {sql}")
+                pooled.prepared.add(name)
+                if self.metrics is not None:
+                    self.metrics.increment(f'{self.prefix}_statement_prepared', statement=name)
+            placeholders = ', '.join(['%s'] * len(params))
+            cur.execute(f"EXECUTE {name}({placeholders})" if params else f"EXECUTE {name}", tuple(params))
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def _check_fork(self):
+        """Sempre com _cond: conexões do processo pai não podem ser usadas nem fechadas aqui."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._open = 0
+
+    def _acquire(self) -> _PooledConnection:
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            self._check_fork()
+            while not self._idle and self._open >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhausted(f"no database connection free in {self.timeout}s")
+                self._cond.wait(remaining)
+            if self._idle:
+                pooled = self._idle.pop()
+            else:
+                pooled = None
+                self._open += 1
+                generation = self._generation
+            self._publish()
+        if self.metrics is not None:
+            self.metrics.observe(f'{self.prefix}_pool_wait_ms', (time.monotonic() - started) * 1000)
+        if pooled is not None:
+            return pooled
+        try:
+            conn = self.connect()
+            conn.autocommit = True
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._publish()
+                self._cond.notify()
+            raise
+        return _PooledConnection(conn, generation)
+
+    def _release(self, pooled: _PooledConnection):
+        with self._cond:
+            if pooled.generation == self._generation and self._pid == os.getpid():
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+        self._discard(pooled)
+
+    def _discard(self, pooled: _PooledConnection):
+        with self._cond:
+            if self._pid == os.getpid():
+                self._open = max(0, self._open - 1)
+                self._publish()
+                self._cond.notify()
+        self._close(pooled)
+
+    def _close(self, pooled: _PooledConnection):
+        try:
+            pooled.conn.close()
+        except Exception:
+            pass
+
+    def _publish(self):
+        if self.metrics is not None:
+            self.metrics.set_gauge(f'{self.prefix}_pool_open', self._open)
@@ -0,0 +1,157 @@
+"""
+Montagem de Prompt com Orçamento de Tokens
+
+O prompt do LLM é montado a partir de seções com prioridade. O orçamento é fixo
+(num_ctx - num_predict - margem); seções obrigatórias entram sempre (truncadas se
+necessário), as opcionais entram por prioridade enquanto couberem. A ordem no
+texto final é a ordem de inserção, não a de prioridade, então o layout do prompt
+não muda quando uma seção é descartada.
+
+A contagem de tokens é uma estimativa (sem tokenizer do modelo): palavras longas
+contam como mais de um token, pontuação conta como token próprio. Para pt-BR no
+gemma2 a estimativa fica um pouco acima do real, o que é o lado seguro.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_PIECES_RE = re.compile(r"\w+|[^\w\s]")
+
+# Caracteres por sub-token em palavras longas
+_CHARS_PER_SUBTOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa conservadora de tokens de um texto."""
+    if not text:
+        return 0
+    total = 0
+    for piece in _PIECES_RE.findall(text):
+        total += 1 + (len(piece) - 1) // _CHARS_PER_SUBTOKEN
+    return total
+
+
+class PromptSection:
+    """Trecho do prompt. priority: menor = mais importante (obrigatórias ignoram)."""
+
+    __slots__ = ('name', 'header', 'text', 'priority', 'required', 'truncate', 'tokens', 'clipped')
+
+    def __init__(self, name: str, text: str, priority: int = 0, required: bool = False,
+                 truncate: Optional[str] = None, header: str = '', max_tokens: Optional[int] = None):
+        self.name = name
+        # Cabeçalho (ex: "Histórico da conversa:") nunca é cortado junto com o corpo
+        self.header = header
+        self.priority = priority
+        self.required = required
+        # None: tudo ou nada; 'head': mantém o início; 'tail': mantém o final (histórico)
+        self.truncate = truncate
+        # Teto próprio da seção (max_tokens), aplicado antes da disputa pelo orçamento
+        self.clipped = max_tokens is not None and estimate_tokens(text) > max_tokens
+        if self.clipped:
+            text = _truncate_lines(text, max_tokens, truncate or 'head')
+        self.text = text
+        self.tokens = estimate_tokens(header) + estimate_tokens(text)
+
+    def render(self, body: str = None) -> str:
+        body = self.text if body is None else body
+        return f"{self.header}\n{body}" if self.header else body
+
+
+def _truncate_lines(text: str, budget: int, keep: str) -> str:
+    """Corta por linhas (ou por palavras, se uma linha só não couber) até caber no orçamento."""
+    lines = text.split('\n')
+    if keep == 'tail':
+        lines = list(reversed(lines))
+    kept: List[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        if not kept:
+            # Primeira linha já não cabe: cortar palavras
+            words = line.split(' ')
+            if keep == 'tail':
+                words = list(reversed(words))
+            partial: List[str] = []
+            for word in words:
+                cost = estimate_tokens(word)
+                if used + cost > budget:
+                    break
+                partial.append(word)
+                used += cost
+            if keep == 'tail':
+                partial = list(reversed(partial))
+            if partial:
+                kept.append(' '.join(partial))
+        break
+    if keep == 'tail':
+        kept = list(reversed(kept))
+    return '\n'.join(kept)
+
+
+class PromptBuilder:
+    """Preenche um orçamento fixo de tokens com seções por prioridade."""
+
+    def __init__(self, budget_tokens: int, separator: str = '\n\n'):
+        self.budget_tokens = budget_tokens
+        self.separator = separator
+        self.sections: List[PromptSection] = []
+
+    def add(self, name: str, text: str, priority: int = 0, required: bool = False,
+            truncate: Optional[str] = None, header: str = '', max_tokens: Optional[int] = None) -> 'PromptBuilder':
+        """Adiciona uma seção; texto vazio é ignorado (não gasta orçamento nem aparece no relatório)."""
+        if text:
+            self.sections.append(PromptSection(name, text, priority, required, truncate, header, max_tokens))
+        return self
+
+    def build(self) -> Tuple[str, Dict[str, Any]]:
+        """Retorna (prompt, relatório com tokens usados, seções incluídas/truncadas/descartadas)."""
+        separator_cost = estimate_tokens(self.separator)
+        remaining = self.budget_tokens
+        chosen: Dict[int, str] = {}
+        truncated: List[str] = []
+        dropped: List[str] = []
+
+        order = sorted(
+            range(len(self.sections)),
+            key=lambda i: (not self.sections[i].required, self.sections[i].priority, i),
+        )
+        for i in order:
+            section = self.sections[i]
+            cost = section.tokens + (separator_cost if chosen else 0)
+            if cost <= remaining:
+                chosen[i] = section.render()
+                remaining -= cost
+                if section.clipped:
+                    truncated.append(section.name)
+                continue
+            if section.truncate or section.required:
+                room = remaining - (separator_cost if chosen else 0) - estimate_tokens(section.header)
+                body = _truncate_lines(section.text, room, section.truncate or 'head') if room > 0 else ''
+                if body:
+                    text = section.render(body)
+                    remaining -= estimate_tokens(text) + (separator_cost if chosen else 0)
+                    chosen[i] = text
+                    truncated.append(section.name)
+                    continue
+            dropped.append(section.name)
+
+        prompt = self.separator.join(chosen[i] for i in sorted(chosen))
+        report = {
+            'budget_tokens': self.budget_tokens,
+            'prompt_tokens': estimate_tokens(prompt),
+            'prompt_chars': len(prompt),
+            'sections': [self.sections[i].name for i in sorted(chosen)],
+            'truncated': truncated,
+            'dropped': dropped,
+        }
+        return prompt, report
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto (mantendo o início) para no máximo max_tokens estimados."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return _truncate_lines(text, max_tokens, 'head')
@@ -0,0 +1,200 @@
+"""
+Agendamento - Padrões de extração e resolução de datas/horas relativas
+
+extract_scheduling_details (cognitive_engine) devolve expressões cruas como
+"segunda feira", "amanhã", "dia 15" e "9h00". Este módulo concentra:
+
+- os padrões de extração, compilados uma única vez na importação
+- a resolução dessas expressões para datetimes concretos no fuso da empresa
+  (metadata.timezone, padrão America/Sao_Paulo)
+
+Com o horário resolvido, o engine consulta o índice de agendamentos
+(availability.AppointmentIndex) e já confirma ou oferece outro horário na
+mesma resposta.
+"""
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from text_normalization import normalize_text
+
+DEFAULT_TIMEZONE = 'America/Sao_Paulo'
+DEFAULT_DURATION_MINUTES = 60
+
+# ===== PADRÕES DE EXTRAÇÃO (ordem = prioridade) =====
+_WEEKDAY_STOP = r"(?:\s+segunda|\s+terca|\s+quarta|\s+quinta|\s+sexta|\s+sabado|\s+domingo"
+
+CLIENT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"cliente\s+([A-Z][a-záàâãéèêíïóôõöúç\w\s'-]{2,30}?)" + _WEEKDAY_STOP + r"|\s+as\s+\d|$)",
+    r"cliente\s+([A-Z][a-záàâãéèêíïóôõöúç\w\s'-]{2,30}?)\s",
+    r"visita\s+ao\s+cliente\s+([A-Z][a-záàâãéèêíïóôõöúç\w\s'-]{2,30}?)(?:\s|$)",
+    r"visita\s+[à|ao]?\s*([A-Z][a-záàâãéèêíïóôõöúç\w\s'-]{2,30}?)" + _WEEKDAY_STOP + r")",
+))
+
+# Palavras que o padrão de cliente pode capturar mas não são nomes
+CLIENT_STOPWORDS = frozenset(['segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado', 'domingo', 'segunda-feira'])
+
+DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"(segunda(?:\s|-)?feira|segunda)",
+    r"(terca(?:\s|-)?feira|terca)",
+    r"(quarta(?:\s|-)?feira|quarta)",
+    r"(quinta(?:\s|-)?feira|quinta)",
+    r"(sexta(?:\s|-)?feira|sexta)",
+    r"(sabado(?:\s|-)?feira|sabado|sábado)",
+    r"(domingo)",
+    r"(amanhe|amanhã)",
+    r"(hoje)",
+    r"(proxima\s+segunda|próxima\s+segunda)",
+    r"(proxima\s+semana|próxima\s+semana)",
+    r"dia\s+(\d{1,2})",
+))
+
+# Sem IGNORECASE, como no extrator original
+TIME_PATTERNS = tuple(re.compile(p) for p in (
+    r"(\d{1,2}[:hH]\d{2})",  # 9:00 ou 9h00
+    r"(?:as|a)\s+(\d{1,2})\s*(?:horas?|h)",  # as 9 horas
+    r"(\d{1,2})(?::|\s)(\d{2})(?:\s+da|$)",  # 9 00 da manhã/tarde
+))
+
+SERVICE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"servico\s+(?:sera|será|é|e)\s+([a-záàâãéèêíïóôõöúç\w\s]{3,40}?)(?:\s+(?:segunda|terca|quarta|quinta|sexta|sabado|domingo|$))",
+    r"para\s+(?:fazer\s+)?([a-záàâãéèêíïóôõöúç\w\s]{3,50}?)(?:\s+(?:segunda|terca|quarta|quinta|sexta|sabado|domingo|as\s+\d))",
+    r"(?:limpeza|conserto|reparo|manutencao|instalacao|suporte|consultoria|atendimento)\s+(?:do|da|de|em)\s+([a-záàâãéèêíïóôõöúç\w\s]{3,30}?)\b",
+    r"([a-záàâãéèêíïóôõöúç\w\s]{3,30}?)\s+(?:do|da|de)\s+(?:cliente|rack|equipamento|sistema|servidor|computador)\b",
+))
+
+# ===== RESOLUÇÃO =====
+WEEKDAYS = {'segunda': 0, 'terca': 1, 'quarta': 2, 'quinta': 3, 'sexta': 4, 'sabado': 5, 'domingo': 6}
+WEEKDAY_LABELS = ('segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado', 'domingo')
+
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIME_RE = re.compile(r"^(\d{1,2})(?:\s*[:hH]\s*(\d{2})?)?$")
+
+
+@lru_cache(maxsize=64)
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo do fuso informado; fuso inválido ou vazio cai no padrão."""
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def resolve_date(expression: Optional[str], today: date) -> Optional[date]:
+    """
+    Converte a expressão extraída em data concreta.
+    - "hoje" / "amanhã"
+    - dia da semana: próxima ocorrência depois de hoje ("segunda" dita numa segunda = semana que vem)
+    - "próxima semana": segunda-feira da semana seguinte
+    - "15" (de "dia 15"): dia 15 deste mês, ou do próximo se já passou
+    - "2026-01-15": data ISO (chamadas diretas do backend)
+    """
+    if not expression:
+        return None
+    if _ISO_DATE_RE.match(expression):
+        try:
+            return date.fromisoformat(expression)
+        except ValueError:
+            return None
+    expr = normalize_text(expression).replace('-', ' ')
+
+    if expr == 'hoje':
+        return today
+    if expr.startswith('amanh'):
+        return today + timedelta(days=1)
+    if 'semana' in expr:
+        return today + timedelta(days=7 - today.weekday())
+    for name, weekday in WEEKDAYS.items():
+        if name in expr:
+            return today + timedelta(days=(weekday - today.weekday() - 1) % 7 + 1)
+    if expr.isdigit():
+        day = int(expr)
+        if not 1 <= day <= 31:
+            return None
+        year, month = today.year, today.month
+        if day < today.day:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        # Meses sem esse dia (31/04): procurar o próximo mês que tenha
+        for _ in range(12):
+            try:
+                return date(year, month, day)
+            except ValueError:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return None
+
+
+def parse_time(expression: Optional[str]) -> Optional[time]:
+    """Converte "9:00", "09h30", "14H00" ou "9" em time; None se inválido."""
+    if not expression:
+        return None
+    match = _TIME_RE.match(expression.strip())
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def resolve_slot(
+    date_expression: Optional[str],
+    time_expression: Optional[str],
+    tz: ZoneInfo,
+    now: Optional[datetime] = None,
+    duration_minutes: int = DEFAULT_DURATION_MINUTES,
+) -> Dict[str, Any]:
+    """
+    Resolve data e hora extraídas para o fuso da empresa.
+
+    Retorna {'date': date|None, 'start': datetime|None, 'end': datetime|None}.
+    Só com a hora, assume hoje (ou amanhã, se o horário de hoje já passou).
+    """
+    now = now.astimezone(tz) if now else datetime.now(tz)
+    day = resolve_date(date_expression, now.date())
+    at = parse_time(time_expression)
+
+    if at is not None and day is None and not date_expression:
+        day = now.date()
+        if datetime.combine(day, at, tzinfo=tz) <= now:
+            day += timedelta(days=1)
+
+    start = end = None
+    if day is not None and at is not None:
+        start = datetime.combine(day, at, tzinfo=tz)
+        end = start + timedelta(minutes=duration_minutes)
+    return {'date': day, 'start': start, 'end': end}
+
+
+def appointment_interval(
+    normalized_date: Any,
+    time_expression: Optional[str],
+    tz: ZoneInfo,
+    duration_minutes: int = DEFAULT_DURATION_MINUTES,
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Intervalo ocupado por um agendamento gravado (appointment_date_normalized +
+    appointment_time). None se a data não foi normalizada ou a hora não é legível.
+    """
+    if normalized_date is None:
+        return None
+    if isinstance(normalized_date, datetime):
+        if normalized_date.tzinfo is not None:
+            normalized_date = normalized_date.astimezone(tz)
+        day = normalized_date.date()
+    elif isinstance(normalized_date, date):
+        day = normalized_date
+    else:
+        return None
+    at = parse_time(time_expression)
+    if at is None:
+        return None
+    start = datetime.combine(day, at, tzinfo=tz)
+    return start, start + timedelta(minutes=duration_minutes)
+
+
+def format_slot(moment: datetime) -> str:
+    """"terça 14/01 às 09:00" — formato usado nas respostas ao cliente."""
+    return f"{WEEKDAY_LABELS[moment.weekday()]} {moment:%d/%m} às {moment:%H:%M}"
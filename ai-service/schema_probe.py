@@ -0,0 +1,123 @@
+"""
+Capacidades do schema - quais tabelas e colunas existem no banco
+
+Bancos de empresas diferentes (ou em migração) podem não ter todas as tabelas
+e colunas que o engine usa (companies.metadata, ai_word_meanings...). Em vez
+de tentar a query e tratar a exceção a cada carga, o engine sonda o schema uma
+vez (information_schema.columns) e monta as queries só com o que existe.
+
+SchemaProbe guarda a última sondagem:
+- get(): sonda na primeira chamada; se o banco estiver fora, tenta de novo só
+  depois de retry_after segundos (as cargas falham sem repetir a sondagem)
+- refresh(): sonda de novo (sinal de mudança de schema, reconexão, admin)
+- on_change(capabilities) é chamado quando o resultado muda, e as capacidades
+  detectadas são logadas uma vez por mudança
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaCapabilities:
+    """Colunas existentes por tabela (só das tabelas sondadas)."""
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Dict[str, FrozenSet[str]]):
+        self.columns = columns
+
+    def has_table(self, table: str) -> bool:
+        return table in self.columns
+
+    def has_columns(self, table: str, *columns: str) -> bool:
+        existing = self.columns.get(table)
+        return existing is not None and all(c in existing for c in columns)
+
+    def describe(self) -> Dict[str, List[str]]:
+        return {table: sorted(cols) for table, cols in sorted(self.columns.items())}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SchemaCapabilities) and self.columns == other.columns
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.columns.items()))
+
+
+def probe_schema(conn, tables: Iterable[str]) -> SchemaCapabilities:
+    """Uma query em information_schema para todas as tabelas (schemas do search_path)."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = ANY(current_schemas(false)) AND table_name = ANY(%s)
+        """,
+        (list(tables),)
+    )
+    rows = cur.fetchall()
+    cur.close()
+    columns: Dict[str, set] = {}
+    for row in rows:
+        table, column = (row['table_name'], row['column_name']) if isinstance(row, dict) else row
+        columns.setdefault(table, set()).add(column)
+    return SchemaCapabilities({table: frozenset(cols) for table, cols in columns.items()})
+
+
+class SchemaProbe:
+    """Última sondagem do schema, compartilhada pelo processo (thread-safe)."""
+
+    def __init__(self, connect: Callable[[], Any], expected: Dict[str, Iterable[str]],
+                 retry_after: float = 30.0,
+                 on_change: Optional[Callable[[SchemaCapabilities], None]] = None):
+        # expected: tabela -> colunas que o engine usa (só para o log do que falta)
+        self.connect = connect
+        self.expected = {table: tuple(cols) for table, cols in expected.items()}
+        self.retry_after = retry_after
+        self.on_change = on_change
+        self.capabilities: Optional[SchemaCapabilities] = None
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[SchemaCapabilities]:
+        """Capacidades conhecidas; None se o banco ainda não pôde ser sondado."""
+        capabilities = self.capabilities
+        if capabilities is not None:
+            return capabilities
+        failed_at = self._failed_at
+        if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+            return None
+        return self.refresh()
+
+    def refresh(self) -> Optional[SchemaCapabilities]:
+        """Sonda agora. Em falha mantém o resultado anterior (ou None)."""
+        with self._lock:
+            try:
+                conn = self.connect()
+                try:
+                    capabilities = probe_schema(conn, self.expected)
+                finally:
+                    conn.close()
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                logger.warning(f"[SCHEMA] Probe failed: {e}")
+                return self.capabilities
+            self._failed_at = None
+            changed = capabilities != self.capabilities
+            self.capabilities = capabilities
+        if changed:
+            self._log(capabilities)
+            if self.on_change is not None:
+                self.on_change(capabilities)
+        return capabilities
+
+    def _log(self, capabilities: SchemaCapabilities):
+        missing = []
+        for table, cols in self.expected.items():
+            if not capabilities.has_table(table):
+                missing.append(table)
+            else:
+                missing.extend(f"{table}.{c}" for c in cols if not capabilities.has_columns(table, c))
+        present = [t for t in self.expected if capabilities.has_table(t)]
+        logger.info(f"[SCHEMA] Tables: {', '.join(present) or '-'}; missing: {', '.join(missing) or 'none'}")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""
+Modo produção do cognitive_engine: Gunicorn com workers pré-criados (gunicorn.conf.py).
+
+    python serve.py                        # COGNITIVE_WORKERS/COGNITIVE_THREADS do ambiente
+    python serve.py --workers 4 --threads 8
+
+Argumentos extras são repassados ao Gunicorn. `python cognitive_engine.py`
+continua disponível para desenvolvimento (servidor do Werkzeug).
+"""
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    # Antes de importar o Gunicorn: o diretório atual vira o padrão de --chdir
+    os.chdir(SERVICE_DIR)
+    # Vários workers: a fila de jobs em memória não é compartilhada entre eles
+    os.environ.setdefault('JOBS_BACKEND', 'postgres')
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = [sys.argv[0], '--config', os.path.join(SERVICE_DIR, 'gunicorn.conf.py'),
+                *sys.argv[1:], 'cognitive_engine:app']
+    sys.exit(run())
+
+
+if __name__ == '__main__':
+    main()
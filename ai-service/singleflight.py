@@ -0,0 +1,103 @@
+"""
+Coalescência de requisições - single-flight e retenção curta de resultados
+
+Retentativa de webhook ou cliente que manda a mesma mensagem duas vezes geram
+cópias idênticas de /cognitive-response com milissegundos de diferença.
+
+- SingleFlight.do(key, fn): a primeira chamada com a chave executa fn. As que
+  chegam enquanto ela roda esperam e recebem o mesmo resultado (ou a mesma
+  exceção). Terminada a execução, a chave é liberada; não é um cache.
+- RecentResults: resultados guardados por poucos segundos (TTL) e com limite de
+  entradas. O engine usa para responder da memória a retentativas tardias que
+  trazem o mesmo Idempotency-Key.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Uma execução por chave em andamento; chamadas concorrentes compartilham o resultado."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(resultado, compartilhado). compartilhado=True quando outra chamada executou fn."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class RecentResults:
+    """Mapa com TTL e limite de entradas (as mais antigas saem primeiro), thread-safe."""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            # Expirados e excedentes saem pela frente (ordem de inserção = ordem de expiração)
+            while self._entries:
+                oldest_key, (expires_at, _) = next(iter(self._entries.items()))
+                if expires_at > now and len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[oldest_key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
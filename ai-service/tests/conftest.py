@@ -0,0 +1,17 @@
+"""
+Configuração dos testes do ai-service
+
+Os módulos do serviço ficam soltos em ai-service/ (sem pacote), então a pasta
+entra no sys.path. O engine é importado sem Ollama e sem a thread de LISTEN;
+nenhum teste precisa de banco.
+
+Uso (de dentro de ai-service/):
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+os.environ.setdefault('OLLAMA_ENABLED', 'false')
+os.environ.setdefault('CACHE_NOTIFY_ENABLED', 'false')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,79 @@
+"""FairAdmission: limite por empresa, fila cheia, ordem justa ponderada e prioridade da faixa."""
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionRejected, FairAdmission
+
+
+def wait_queued(admission, total, deadline=2.0):
+    end = time.monotonic() + deadline
+    while sum(t['queued'] for t in admission.snapshot()['tenants'].values()) != total:
+        assert time.monotonic() < end, f"fila nunca chegou a {total}"
+        time.sleep(0.005)
+
+
+def run_queued(admission, requests):
+    """Enfileira (empresa, prioridade) com o único slot ocupado e devolve a ordem de admissão."""
+    order = []
+
+    def worker(tenant, priority):
+        with admission.slot(tenant, 5.0, priority):
+            order.append(tenant)
+
+    admission.acquire('holder', 1.0)
+    threads = []
+    for i, (tenant, priority) in enumerate(requests):
+        thread = threading.Thread(target=worker, args=(tenant, priority))
+        thread.start()
+        threads.append(thread)
+        wait_queued(admission, i + 1)
+    admission.release('holder')
+    for thread in threads:
+        thread.join(5)
+    return order
+
+
+def test_tenant_limit_leaves_slots_for_others():
+    admission = FairAdmission(capacity=3, tenant_limit=1, queue_limit=4)
+    admission.acquire('a', 1.0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        admission.acquire('a', 0.05)
+    assert rejected.value.reason == 'timeout'
+    assert admission.acquire('b', 0.05) < 0.05
+    assert admission.snapshot()['tenants']['a'] == {'active': 1, 'queued': 0, 'weight': 1.0}
+
+
+def test_queue_full_is_rejected_immediately():
+    admission = FairAdmission(capacity=1, tenant_limit=1, queue_limit=0)
+    admission.acquire('a', 1.0)
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected) as rejected:
+        admission.acquire('b', 5.0)
+    assert rejected.value.reason == 'queue_full'
+    assert time.monotonic() - started < 1.0
+    assert 'b' not in admission.snapshot()['tenants']
+
+
+def test_weighted_fair_order():
+    weights = {'a': 3.0, 'b': 1.0}
+    admission = FairAdmission(capacity=1, tenant_limit=1, queue_limit=8, weight_fn=lambda t: weights.get(t, 1.0))
+    order = run_queued(admission, [('a', 0)] * 4 + [('b', 0)] * 4)
+    # a avança o relógio em 1/3 por admissão, b em 1: a recebe 3 slots para cada 1 de b
+    assert order == ['a', 'b', 'a', 'a', 'a', 'b', 'b', 'b']
+
+
+def test_priority_wins_over_virtual_time():
+    admission = FairAdmission(capacity=1, tenant_limit=1, queue_limit=8)
+    order = run_queued(admission, [('bulk-tenant', 2), ('chat-tenant', 0)])
+    assert order == ['chat-tenant', 'bulk-tenant']
+
+
+def test_release_forgets_idle_tenants():
+    admission = FairAdmission(capacity=2, tenant_limit=2, queue_limit=2)
+    with admission.slot('a', 1.0):
+        assert admission.snapshot()['active'] == 1
+    assert admission.snapshot() == {'capacity': 2, 'active': 0, 'tenants': {}}
+    admission.release('a')  # release sem slot é ignorado
+    assert admission.snapshot()['active'] == 0
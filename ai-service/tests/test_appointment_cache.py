@@ -0,0 +1,65 @@
+"""Índice de agendamentos em cache: mudança que chega durante a carga não se perde."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import cognitive_engine
+from availability import AppointmentIndex
+from cognitive_engine import apply_appointment_change, get_appointment_index, tenant_cache
+
+COMPANY = str(uuid.uuid4())
+START = datetime(2026, 3, 2, 13, 0, tzinfo=timezone.utc)
+BOOKED = [(START, START + timedelta(hours=1), 'a1')]
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    tenant_cache.clear(COMPANY)
+    yield
+    tenant_cache.clear(COMPANY)
+
+
+def loader_with_change_during_load(monkeypatch, snapshot, change):
+    """_load_appointment_index que lê o banco (snapshot) e recebe a mudança antes de terminar."""
+    calls = []
+
+    def load(company_id, tz):
+        calls.append(company_id)
+        index = AppointmentIndex(snapshot)
+        if len(calls) == 1:
+            change()
+        return index
+
+    monkeypatch.setattr(cognitive_engine, '_load_appointment_index', load)
+    return calls
+
+
+def test_change_during_first_load_is_not_cached_stale(monkeypatch):
+    calls = loader_with_change_during_load(
+        monkeypatch, [], lambda: apply_appointment_change(COMPANY, 'a1', 'INSERT', 'confirmed',
+                                                          START.isoformat(), None))
+    index = get_appointment_index(COMPANY, timezone.utc)
+    assert len(index) == 0  # a requisição que carregou usa o que leu
+    assert tenant_cache.peek(COMPANY, 'appointments') is None
+    # A próxima consulta carrega de novo (o banco já tem o agendamento)
+    get_appointment_index(COMPANY, timezone.utc)
+    assert len(calls) == 2 and tenant_cache.peek(COMPANY, 'appointments') is not None
+
+
+def test_change_during_reload_patches_cached_index(monkeypatch):
+    cached = AppointmentIndex(BOOKED)
+    cached.loaded_at -= cognitive_engine.APPOINTMENT_INDEX_TTL + 1  # vencido: sem listener, recarrega
+    tenant_cache.set(COMPANY, 'appointments', cached)
+    loader_with_change_during_load(
+        monkeypatch, BOOKED, lambda: apply_appointment_change(COMPANY, 'a1', 'DELETE'))
+
+    reloaded = get_appointment_index(COMPANY, timezone.utc)
+    assert reloaded is not cached
+    # O snapshot (ainda com a1) foi descartado; o cache tem o índice corrigido pelo evento
+    assert tenant_cache.peek(COMPANY, 'appointments') is cached
+    assert len(cached) == 0
+
+
+def test_change_without_cached_index_returns_false():
+    assert apply_appointment_change(COMPANY, 'a1', 'DELETE') is False
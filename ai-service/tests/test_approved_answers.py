@@ -0,0 +1,40 @@
+"""Reaproveitamento de respostas aprovadas: só para mensagens autossuficientes."""
+import pytest
+
+from cognitive_engine import find_approved_answer, tenant_cache
+from near_duplicates import NearDuplicateIndex
+
+COMPANY = '3b0d6a52-1f7e-4c4e-8d0a-6f5b2f0c9a11'
+APPROVED = [
+    ('1', 'sim', 'Perfeito, seu pedido de orçamento foi enviado.'),
+    ('2', 'quero cancelar meu horário', 'Cancelei seu horário de terça às 10h.'),
+    ('3', 'qual o horário de vocês?', 'Atendemos de segunda a sexta, das 8h às 18h.'),
+]
+
+
+@pytest.fixture(autouse=True)
+def approved_index():
+    index = NearDuplicateIndex(0.8)
+    for entry_id, question, answer in APPROVED:
+        index.add(entry_id, question, answer)
+    tenant_cache.set(COMPANY, 'approved_answers', index)
+    yield
+    tenant_cache.clear(COMPANY)
+
+
+@pytest.mark.parametrize('message', ['sim', 'ok', 'pode ser', 'confirmo', 'quero cancelar meu horário'])
+def test_short_replies_are_not_reused(message):
+    assert find_approved_answer(COMPANY, message, 'general_inquiry') is None
+
+
+def test_self_contained_question_is_reused():
+    match = find_approved_answer(COMPANY, 'Qual o horario de voces', 'general_inquiry')
+    assert match is not None and match['id'] == '3'
+
+
+def test_not_reused_with_prior_context():
+    assert find_approved_answer(COMPANY, 'qual o horário de vocês?', 'general_inquiry', has_context=True) is None
+
+
+def test_scheduling_intents_are_not_reused():
+    assert find_approved_answer(COMPANY, 'qual o horário de vocês?', 'ask_time') is None
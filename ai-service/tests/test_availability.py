@@ -0,0 +1,96 @@
+"""Árvore de intervalos dos agendamentos, próximos horários livres e expediente."""
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from availability import DEFAULT_BUSINESS_HOURS, AppointmentIndex, BusinessHours, check_slot, free_slots
+
+TZ = ZoneInfo('America/Sao_Paulo')
+HOUR = timedelta(hours=1)
+
+
+def at(day, hour, minute=0):
+    """Janeiro de 2026 no fuso da empresa (dia 12 = segunda, 18 = domingo)."""
+    return datetime(2026, 1, day, hour, minute, tzinfo=TZ)
+
+
+def test_overlapping_is_half_open_and_ordered():
+    index = AppointmentIndex([
+        (at(12, 10), at(12, 11), 'b'),
+        (at(12, 9), at(12, 10), 'a'),
+        (at(12, 9, 30), at(12, 12), 'c'),
+    ])
+    # Encostar no fim ou no início não é colisão
+    assert [i[2] for i in index.overlapping(at(12, 10), at(12, 11))] == ['c', 'b']
+    assert [i[2] for i in index.overlapping(at(12, 8), at(12, 12))] == ['a', 'c', 'b']
+    assert index.overlapping(at(12, 12), at(12, 13)) == []
+    assert index.overlapping(at(12, 8), at(12, 9)) == []
+    assert index.is_free(at(12, 12), at(12, 13)) and not index.is_free(at(12, 11), at(12, 13))
+
+
+def test_add_moves_and_remove_deletes():
+    index = AppointmentIndex([(at(12, 9), at(12, 10), 'a')])
+    index.add('a', at(12, 14), at(12, 15))
+    assert len(index) == 1
+    assert index.is_free(at(12, 9), at(12, 10))
+    assert index.overlapping(at(12, 14), at(12, 15)) == [(at(12, 14), at(12, 15), 'a')]
+    assert index.remove('a') is True and index.remove('a') is False
+    assert len(index) == 0 and index.is_free(at(12, 0), at(13, 0))
+
+
+def test_overlapping_matches_linear_scan():
+    rng = random.Random(7)
+    index = AppointmentIndex()
+    intervals = {}
+    for step in range(400):
+        appointment_id = str(rng.randrange(60))
+        if rng.random() < 0.25:
+            index.remove(appointment_id)
+            intervals.pop(appointment_id, None)
+        else:
+            start = at(12, 0) + timedelta(minutes=15 * rng.randrange(300))
+            end = start + timedelta(minutes=15 * rng.randrange(1, 40))
+            index.add(appointment_id, start, end)
+            intervals[appointment_id] = (start, end)
+        q_start = at(12, 0) + timedelta(minutes=15 * rng.randrange(300))
+        q_end = q_start + timedelta(minutes=15 * rng.randrange(1, 12))
+        expected = sorted(((s, e, i) for i, (s, e) in intervals.items() if s < q_end and e > q_start),
+                          key=lambda interval: (interval[0], interval[2]))
+        assert index.overlapping(q_start, q_end) == expected, step
+
+
+def test_free_slots_skip_conflicts_and_closed_days():
+    index = AppointmentIndex([(at(12, 10, 15), at(12, 10, 45), 'a')])
+    # 10:00 colide; pula para o fim do conflito (10:45) alinhado ao passo de 30 min
+    assert free_slots(index, DEFAULT_BUSINESS_HOURS, at(12, 9), 3, HOUR) == [at(12, 9), at(12, 11), at(12, 12)]
+    # Sábado fecha às 13h e domingo é fechado: depois de sábado 12h vem segunda 9h
+    assert free_slots(index, DEFAULT_BUSINESS_HOURS, at(17, 11, 10), 3, HOUR) == [at(17, 11, 30), at(19, 9), at(19, 10)]
+    assert free_slots(index, DEFAULT_BUSINESS_HOURS, at(12, 9), 0, HOUR) == []
+
+
+def test_check_slot_reports_reason_and_suggestion():
+    index = AppointmentIndex([(at(12, 9), at(12, 10), 'a')])
+    assert check_slot(index, DEFAULT_BUSINESS_HOURS, at(12, 10), at(12, 11))['available'] is True
+    assert check_slot(index, DEFAULT_BUSINESS_HOURS, at(12, 9, 30), at(12, 10, 30)) == {
+        'available': False, 'reason': 'busy', 'suggested_start': at(12, 10)}
+    assert check_slot(index, DEFAULT_BUSINESS_HOURS, at(18, 10), at(18, 11)) == {
+        'available': False, 'reason': 'closed', 'suggested_start': at(19, 9)}
+    assert check_slot(None, DEFAULT_BUSINESS_HOURS, at(12, 10), at(12, 11))['available'] is None
+
+
+def test_business_hours_from_config_and_describe():
+    hours = BusinessHours.from_config({
+        'mon': '08:00-12:00', 'terça': ['8h-12h', '14h-18h'], 'Sexta': '9h30-24', 'dom': 'fechado',
+    })
+    assert hours.describe() == [
+        'Segunda: 8h às 12h',
+        'Terça: 8h às 12h, 14h às 18h',
+        'Quarta e Quinta: Fechado',
+        'Sexta: 9h30 às 23h59',
+        'Sábado e Domingo: Fechado',
+    ]
+    assert hours.contains(at(13, 14), at(13, 15)) and not hours.contains(at(13, 11), at(13, 13))
+    assert DEFAULT_BUSINESS_HOURS.describe() == ['Segunda a Sexta: 9h às 18h', 'Sábado: 9h às 13h', 'Domingo: Fechado']
+    # Config ausente ou sem janela válida cai no expediente padrão
+    assert BusinessHours.from_config(None) is DEFAULT_BUSINESS_HOURS
+    assert BusinessHours.from_config({'mon': '18-9', 'xyz': '9-18'}) is DEFAULT_BUSINESS_HOURS
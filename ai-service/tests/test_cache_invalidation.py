@@ -0,0 +1,149 @@
+"""Listener de NOTIFY (sem banco: conexão e select falsos) e handlers de invalidação do engine."""
+import json
+import uuid
+
+import pytest
+
+import cache_invalidation
+from cache_invalidation import CacheInvalidationListener
+from cognitive_engine import on_appointment_event, on_company_event, on_learned_concept_event, tenant_cache
+
+COMPANY = str(uuid.uuid4())
+OTHER = str(uuid.uuid4())
+
+
+class Notify:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class FakeConnection:
+    """Conexão psycopg2 em LISTEN; script: payloads a entregar, exceção = queda, 'stop' = encerrar."""
+
+    def __init__(self, listener, script):
+        self.listener = listener
+        self.script = list(script)
+        self.notifies = []
+        self.listening = []
+        self.closed = False
+
+    def set_isolation_level(self, level):
+        pass
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def execute(self, sql):
+                connection.listening.append(sql)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def poll(self):
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        if step == 'stop':
+            self.listener.stop()
+        else:
+            self.notifies.append(Notify(step))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def listener(monkeypatch):
+    calls = []
+    listener = CacheInvalidationListener(
+        'postgres://fake', on_connect=lambda: calls.append('connect'),
+        on_reconnect=lambda: calls.append('reconnect'), on_disconnect=lambda: calls.append('disconnect'),
+    )
+    listener.calls = calls
+    listener.connections = []
+    monkeypatch.setattr(cache_invalidation.select, 'select', lambda r, w, x, timeout: (r, [], []))
+    return listener
+
+
+def script_connections(monkeypatch, listener, *scripts):
+    scripts = list(scripts)
+
+    def connect(dsn):
+        connection = FakeConnection(listener, scripts.pop(0))
+        listener.connections.append(connection)
+        return connection
+
+    monkeypatch.setattr(cache_invalidation.psycopg2, 'connect', connect)
+
+
+def event(table, **fields):
+    return json.dumps(dict(fields, table=table))
+
+
+def test_dispatch_routes_by_table_and_survives_bad_events(listener):
+    received = []
+    listener.register('companies', received.append)
+    listener.register('appointments', lambda e: 1 / 0)
+
+    listener.dispatch(event('companies', company_id=COMPANY))
+    listener.dispatch('{not json')
+    listener.dispatch(event('ai_knowledge_base', company_id=COMPANY))  # sem handler
+    listener.dispatch(event('appointments', company_id=COMPANY))  # handler falha, listener segue
+
+    assert received == [{'table': 'companies', 'company_id': COMPANY}]
+    assert listener.events_received == 3
+
+
+def test_reconnect_after_connection_loss(monkeypatch, listener):
+    received = []
+    listener.register('companies', received.append)
+    script_connections(
+        monkeypatch, listener,
+        [event('companies', company_id='1'), OSError('server closed the connection')],
+        [event('companies', company_id='2'), 'stop'],
+    )
+    listener.run()
+
+    assert [e['company_id'] for e in received] == ['1', '2']
+    # Na queda: TTL curto; ao voltar: cache limpo (eventos podem ter sido perdidos)
+    assert listener.calls == ['connect', 'disconnect', 'reconnect', 'connect']
+    assert all(c.closed and c.listening == ['LISTEN ai_cache_invalidation;'] for c in listener.connections)
+    assert listener.connected is False
+
+
+@pytest.fixture
+def cached():
+    for company_id in (COMPANY, OTHER):
+        for key in ('word_meanings', 'schedule', 'appointments', 'concept_table:greeting', 'concept_table:price'):
+            tenant_cache.set(company_id, key, object())
+    yield
+    tenant_cache.clear(COMPANY)
+    tenant_cache.clear(OTHER)
+
+
+def test_company_event_reloads_tenant_settings(cached):
+    vocabulary = tenant_cache.peek(COMPANY, 'word_meanings')
+    on_company_event({'table': 'companies', 'company_id': COMPANY})
+    # Vocabulário vence mas continua visível para a recarga incremental
+    assert tenant_cache.peek(COMPANY, 'word_meanings') is vocabulary
+    assert tenant_cache.get(COMPANY, 'word_meanings') is None
+    assert tenant_cache.peek(COMPANY, 'schedule') is None
+    assert tenant_cache.peek(COMPANY, 'appointments') is None
+    assert tenant_cache.get(OTHER, 'word_meanings') is not None and tenant_cache.peek(OTHER, 'schedule') is not None
+
+
+def test_learned_concept_event_drops_all_concept_tables(cached):
+    on_learned_concept_event({'table': 'ai_learned_concepts', 'company_id': COMPANY})
+    assert tenant_cache.peek(COMPANY, 'concept_table:greeting') is None
+    assert tenant_cache.peek(COMPANY, 'concept_table:price') is None
+    assert tenant_cache.peek(COMPANY, 'schedule') is not None
+    assert tenant_cache.peek(OTHER, 'concept_table:greeting') is not None
+
+
+def test_appointment_event_without_row_fields_reloads_index(cached):
+    on_appointment_event({'table': 'appointments', 'company_id': COMPANY, 'op': 'UPDATE', 'id': 'a1'})
+    assert tenant_cache.peek(COMPANY, 'appointments') is None
+    assert tenant_cache.peek(OTHER, 'appointments') is not None
@@ -0,0 +1,68 @@
+"""ConceptTable.score_all/rank dão os mesmos scores de calculate_concept_relevance."""
+import pytest
+
+from cognitive_engine import calculate_concept_relevance, tokenize
+from concept_index import ConceptTable
+
+CONCEPTS = [
+    {
+        'id': 1, 'original_query': 'Como faço para remarcar meu horário?',
+        'explanation': 'Remarcação de agendamento pelo painel ou pelo WhatsApp',
+        'examples': ['quero remarcar', 'mudar o horário da visita'],
+        'keywords': ['remarcar', 'horário'], 'approved_count': 3,
+    },
+    {
+        'id': 2, 'original_query': 'Qual o preço da manutenção do rack?',
+        'explanation': 'Manutenção preventiva de rack tem valor fixo mensal',
+        'examples': ['quanto custa a manutenção', 'preço do contrato'],
+        'keywords': ['manutenção', 'rack', 'rack'], 'approved_count': 25,
+    },
+    {
+        'id': 3, 'original_query': 'Vocês atendem aos sábados?',
+        'explanation': 'Atendimento de segunda a sábado, das 8h às 18h',
+        'examples': [], 'keywords': [], 'approved_count': 0,
+    },
+    {
+        'id': 4, 'original_query': 'Onde fica a loja?', 'explanation': '',
+        'examples': ['endereço', 'localização da loja'], 'keywords': ['Loja'],
+    },
+]
+
+QUERIES = [
+    'Quero remarcar o horário da minha visita',
+    'quanto custa a manutenção do rack?',
+    'vocês atendem sábado de manhã?',
+    'onde fica a loja de vocês',
+    'preço',
+    'mensagem sem relação nenhuma',
+    'ora',  # substring de "horário": a fórmula original casa substrings
+    '',
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_score_all_matches_reference(query):
+    tokens = tokenize(query)
+    table = ConceptTable(CONCEPTS)
+    expected = [calculate_concept_relevance(tokens, concept) for concept in CONCEPTS]
+    assert table.score_all(tokens) == pytest.approx(expected)
+    # Segunda consulta usa as colunas memorizadas: mesmo resultado
+    assert table.score_all(tokens) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_rank_matches_reference(query):
+    tokens = tokenize(query)
+    expected = sorted(
+        ((concept['id'], calculate_concept_relevance(tokens, concept)) for concept in CONCEPTS),
+        key=lambda item: item[1], reverse=True,
+    )
+    expected = [(concept_id, score) for concept_id, score in expected if score > 2.0]
+    ranked = [(concept['id'], score) for concept, score in ConceptTable(CONCEPTS).rank(tokens, min_score=2.0)]
+    assert [concept_id for concept_id, _ in ranked] == [concept_id for concept_id, _ in expected]
+    assert [score for _, score in ranked] == pytest.approx([score for _, score in expected])
+
+
+def test_empty_table():
+    assert ConceptTable([]).score_all(['rack']) == []
+    assert ConceptTable([]).rank(['rack']) == []
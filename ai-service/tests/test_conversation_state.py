@@ -0,0 +1,76 @@
+"""Histórico e resumo em memória com dois workers recebendo turnos da mesma conversa."""
+from conversation_history import ConversationHistory
+from conversation_summary import ConversationSummary, RollingSummarizer
+
+COMPANY = 'c1'
+CLIENT = '5511999990000'
+
+
+class FakeSummaryTable:
+    """ai_conversation_summaries com a gravação condicional ao turn_count."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def persist(self, company_id, client_ref, snapshot, expected_turn_count):
+        row = self.rows.get((company_id, client_ref))
+        if row is not None and row['turn_count'] != expected_turn_count:
+            return False
+        self.rows[(company_id, client_ref)] = dict(snapshot)
+        return True
+
+    def load(self, company_id, client_ref):
+        row = self.rows.get((company_id, client_ref))
+        return ConversationSummary.from_dict(row) if row else ConversationSummary()
+
+
+def extract(text):
+    return {'client_name': text.split(':', 1)[1].strip()} if text.startswith('nome:') else {}
+
+
+def test_summary_is_reloaded_after_another_worker_wrote():
+    table = FakeSummaryTable()
+    worker_a = RollingSummarizer(extract, persist_fn=table.persist, load_fn=table.load)
+    worker_b = RollingSummarizer(extract, persist_fn=table.persist, load_fn=table.load)
+
+    worker_a.apply_turn(COMPANY, CLIENT, 'received', 'nome: Ana')
+    worker_b.apply_turn(COMPANY, CLIENT, 'sent', 'Olá Ana')
+    # worker_a ainda tem o resumo de 1 turno: a gravação conflita e o turno é reaplicado sobre o banco
+    worker_a.apply_turn(COMPANY, CLIENT, 'received', 'quero agendar')
+
+    stored = table.rows[(COMPANY, CLIENT)]
+    assert stored['turn_count'] == 3
+    assert stored['facts'] == {'client_name': 'Ana'}
+    assert stored['last_reply'] == 'Olá Ana'
+    assert stored['last_client_message'] == 'quero agendar'
+    assert worker_a.conflicts == 1
+    assert worker_a.get(COMPANY, CLIENT).turn_count == 3
+
+
+def test_turn_count_never_goes_backwards():
+    table = FakeSummaryTable()
+    workers = [RollingSummarizer(extract, persist_fn=table.persist, load_fn=table.load) for _ in range(2)]
+    for i in range(10):
+        workers[i % 2].apply_turn(COMPANY, CLIENT, 'received', f'mensagem {i}')
+    assert table.rows[(COMPANY, CLIENT)]['turn_count'] == 10
+
+
+def test_history_ring_not_trusted_when_database_has_more_messages():
+    worker_a, worker_b = ConversationHistory(), ConversationHistory()
+    seeded = [('received', 'oi'), ('sent', 'olá')]
+    worker_a.load(COMPANY, CLIENT, seeded, limit=10, message_count=2)
+    worker_b.load(COMPANY, CLIENT, seeded, limit=10, message_count=2)
+
+    # Write-through da terceira mensagem chega só ao worker_b
+    worker_b.append(COMPANY, CLIENT, 'received', 'quero remarcar')
+    assert worker_b.recent(COMPANY, CLIENT, 10, message_count=3) == seeded + [('received', 'quero remarcar')]
+    assert worker_a.recent(COMPANY, CLIENT, 10, message_count=3) is None
+    # Sem o total do banco, o comportamento de um processo só continua valendo
+    assert worker_a.recent(COMPANY, CLIENT, 10) == seeded
+
+
+def test_empty_message_still_counts():
+    history = ConversationHistory()
+    history.load(COMPANY, CLIENT, [('received', 'oi')], limit=10, message_count=1)
+    history.append(COMPANY, CLIENT, 'sent', '   ')
+    assert history.recent(COMPANY, CLIENT, 10, message_count=2) == [('received', 'oi')]
@@ -0,0 +1,139 @@
+"""MemoryJobStore e JobRunner: idempotência, claim, retentativas com backoff e callbacks."""
+import json
+import time
+
+import pytest
+
+from jobs import JobRunner, MemoryJobStore, backoff, job_view, sign_payload
+
+COMPANY = 'c1'
+
+
+def runner(store, handler, **kwargs):
+    kwargs.setdefault('retry_base', 0.01)
+    kwargs.setdefault('retry_cap', 0.01)
+    return JobRunner(store, handler, **kwargs)
+
+
+def test_idempotency_key_returns_existing_job_per_company():
+    store = MemoryJobStore()
+    job, created = store.submit(COMPANY, {'incoming_message': 'oi'}, idempotency_key='k1')
+    again, created_again = store.submit(COMPANY, {'incoming_message': 'outra'}, idempotency_key='k1')
+    other, created_other = store.submit('c2', {'incoming_message': 'oi'}, idempotency_key='k1')
+    assert created and not created_again and created_other
+    assert again['id'] == job['id'] and again['request'] == {'incoming_message': 'oi'}
+    assert other['id'] != job['id']
+    assert store.submit(COMPANY, {}, idempotency_key=None)[1]  # sem chave: sempre cria
+
+
+def test_claim_is_fifo_and_counts_attempts():
+    store = MemoryJobStore()
+    first, _ = store.submit(COMPANY, {'n': 1})
+    second, _ = store.submit(COMPANY, {'n': 2})
+    claimed = store.claim(timeout=0.1)
+    assert claimed['id'] == first['id'] and claimed['status'] == 'running' and claimed['attempts'] == 1
+    assert store.claim(timeout=0.1)['id'] == second['id']
+    started = time.monotonic()
+    assert store.claim(timeout=0.05) is None
+    assert time.monotonic() - started < 1.0
+
+
+def test_retryable_errors_go_back_to_queue_until_max_attempts():
+    store = MemoryJobStore()
+    job, _ = store.submit(COMPANY, {})
+    calls = []
+
+    def handler(claimed):
+        calls.append(claimed['attempts'])
+        return 503, {'error': 'Cognitive engine busy'}
+
+    jobs = runner(store, handler, max_attempts=3)
+    for _ in range(3):
+        jobs.run_one(store.claim(timeout=1.0))
+    assert calls == [1, 2, 3]
+    final = store.get(job['id'])
+    assert final['status'] == 'failed' and final['error'] == 'Cognitive engine busy'
+    assert store.claim(timeout=0.05) is None
+
+
+def test_exception_is_retried_then_succeeds():
+    store = MemoryJobStore()
+    job, _ = store.submit(COMPANY, {})
+    results = iter([RuntimeError('banco fora'), (200, {'suggested_response': 'Olá'})])
+
+    def handler(claimed):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    jobs = runner(store, handler)
+    jobs.run_one(store.claim(timeout=1.0))
+    assert store.get(job['id'])['status'] == 'queued'
+    jobs.run_one(store.claim(timeout=1.0))
+    done = store.get(job['id'])
+    assert done['status'] == 'done' and done['attempts'] == 2
+    assert done['result'] == {'suggested_response': 'Olá'}
+
+
+def test_client_error_fails_without_retry():
+    store = MemoryJobStore()
+    job, _ = store.submit(COMPANY, {})
+    runner(store, lambda claimed: (400, {'error': 'company_id inválido'})).run_one(store.claim(timeout=1.0))
+    assert store.get(job['id'])['status'] == 'failed'
+    assert store.claim(timeout=0.05) is None
+
+
+def test_callback_is_leased_and_retried(monkeypatch):
+    requests = pytest.importorskip('requests')
+    store = MemoryJobStore()
+    job, _ = store.submit(COMPANY, {}, callback_url='http://localhost/cb')
+    runner(store, lambda claimed: (200, {'ok': True})).run_one(store.claim(timeout=1.0))
+
+    due = store.due_callbacks(limit=10, lease=60)
+    assert [j['id'] for j in due] == [job['id']]
+    assert store.due_callbacks(limit=10, lease=60) == []  # reservado pelo lease
+
+    sent = []
+
+    class Response:
+        def __init__(self, status_code):
+            self.status_code = status_code
+
+    statuses = iter([500, 200])
+    monkeypatch.setattr(requests, 'post', lambda url, data, headers, timeout: sent.append((data, headers)) or
+                        Response(next(statuses)))
+    jobs = runner(store, None, callback_secret='segredo', callback_max_attempts=3)
+    jobs.deliver(due[0])
+    retry = store.get(job['id'])
+    assert retry['callback_status'] == 'pending' and retry['callback_error'] == 'HTTP 500'
+    jobs.deliver(retry)
+    assert store.get(job['id'])['callback_status'] == 'delivered'
+
+    body, headers = sent[-1]
+    assert headers['X-Job-Id'] == job['id']
+    assert headers['X-Cognitive-Signature'] == sign_payload('segredo', body)
+    assert json.loads(body)['result'] == {'ok': True}
+
+
+def test_callback_gives_up_after_max_attempts():
+    store = MemoryJobStore()
+    job, _ = store.submit(COMPANY, {}, callback_url='http://localhost/cb')
+    store.finish(job['id'], 'done', result={})
+    store.record_callback(job['id'], False, error='HTTP 500', next_at=None)
+    view = job_view(store.get(job['id']))
+    assert view['callback'] == {'status': 'failed', 'attempts': 1, 'error': 'HTTP 500'}
+
+
+def test_backoff_is_exponential_and_capped():
+    assert [backoff(2.0, attempt, 60.0) for attempt in (1, 2, 3, 6, 10)] == [2.0, 4.0, 8.0, 60.0, 60.0]
+
+
+def test_finished_jobs_are_evicted_first():
+    store = MemoryJobStore(max_jobs=2)
+    old, _ = store.submit(COMPANY, {}, idempotency_key='old')
+    store.finish(old['id'], 'done', result={})
+    pending, _ = store.submit(COMPANY, {})
+    store.submit(COMPANY, {})
+    assert store.get(old['id']) is None and store.get(pending['id']) is not None
+    assert store.submit(COMPANY, {}, idempotency_key='old')[1]  # chave liberada junto com o job
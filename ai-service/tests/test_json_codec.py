@@ -0,0 +1,96 @@
+"""JSON do endpoint quente: mesma saída com orjson ou json, corpo lido uma vez e seleção de campos."""
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import json_codec
+from json_codec import dumps, json_response, loads, request_json, requested_fields, select_fields
+
+PAYLOAD = {
+    'suggested_response': 'Olá! Temos horário às 9h, ação confirmada.',
+    'confidence': 0.87,
+    'detected_intent': 'schedule',
+    'intent_confidence': 0.9,
+    'knowledge_used': [],
+    'semantics': {'recognized': [{'word': 'não', 'definition': 'negação'}]},
+}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'json':
+        monkeypatch.setattr(json_codec, 'orjson', None)
+    elif json_codec.orjson is None:
+        pytest.skip('orjson não instalado')
+    return request.param
+
+
+def test_dumps_is_compact_utf8_and_round_trips(backend):
+    encoded = dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert encoded == json.dumps(PAYLOAD, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    assert 'ação'.encode('utf-8') in encoded
+    assert loads(encoded) == PAYLOAD
+
+
+def test_dumps_falls_back_to_str(backend):
+    company_id = uuid.uuid4()
+    moment = datetime(2026, 1, 12, 9, 0)
+    decoded = loads(dumps({'company_id': company_id, 'at': moment}))
+    assert decoded['company_id'] == str(company_id)
+    assert decoded['at'].startswith('2026-01-12')
+
+
+def test_json_response(backend):
+    response = json_response({'error': 'company_id é obrigatório'}, 400)
+    assert response.status_code == 400 and response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'error': 'company_id é obrigatório'}
+
+
+@pytest.mark.parametrize('data, args, expected', [
+    ({}, None, None),
+    ({'fields': ['confidence', 'detected_intent']}, None, ['confidence', 'detected_intent']),
+    ({'fields': 'confidence, detected_intent,'}, None, ['confidence', 'detected_intent']),
+    ({}, {'fields': 'confidence'}, ['confidence']),
+    ({'fields': ['confidence']}, {'fields': 'detected_intent'}, ['confidence']),  # corpo vence a query
+    ({'profile': 'compact'}, None, json_codec.RESPONSE_PROFILES['compact']),
+    ({}, {'profile': 'compact'}, json_codec.RESPONSE_PROFILES['compact']),
+    ({'profile': 'compact', 'fields': 'confidence'}, None, ['confidence']),  # fields vence profile
+    ({'profile': 'full'}, None, None),
+    ({'profile': 'desconhecido'}, None, None),
+    ({'profile': ['compact']}, None, None),
+])
+def test_requested_fields(data, args, expected):
+    assert requested_fields(data, args) == expected
+
+
+def test_select_fields():
+    assert select_fields(PAYLOAD, None) is PAYLOAD
+    assert select_fields(PAYLOAD, ['confidence', 'inexistente', 'detected_intent']) == {
+        'confidence': 0.87, 'detected_intent': 'schedule'}
+    compact = select_fields(PAYLOAD, json_codec.RESPONSE_PROFILES['compact'])
+    assert 'semantics' not in compact and compact['suggested_response'] == PAYLOAD['suggested_response']
+
+
+@pytest.mark.parametrize('body, expected', [
+    (b'{"company_id": "x"}', {'company_id': 'x'}),
+    (b'', {}),
+    (b'  \n', {}),
+    (b'[1, 2]', {}),
+])
+def test_request_json_reads_body_once(backend, body, expected):
+    app = Flask(__name__)
+    with app.test_request_context('/', method='POST', data=body, content_type='application/json'):
+        data = request_json()
+        assert data == expected
+        assert request_json() is data
+
+
+def test_request_json_rejects_invalid_json(backend):
+    app = Flask(__name__)
+    with app.test_request_context('/', method='POST', data=b'{bad', content_type='application/json'):
+        with pytest.raises(ValueError):
+            request_json()
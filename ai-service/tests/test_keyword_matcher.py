@@ -0,0 +1,64 @@
+"""KeywordMatcher.find dá o mesmo resultado das buscas re.search(r'\bpalavra\b') uma a uma."""
+import random
+import re
+
+import pytest
+
+from cognitive_engine import STRUCTURE_KEYWORDS, structure_sentence_analysis
+from keyword_matcher import KeywordMatcher
+
+
+def regex_find(categories, text):
+    """Implementação anterior: um re.search com limites de palavra por palavra-chave."""
+    return {
+        name: [kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', text)]
+        for name, keywords in categories.items()
+    }
+
+
+MESSAGES = [
+    "como você faz para agendar?",
+    "o que vc pode fazer por mim",
+    "por que não funciona? porquê??",
+    "por  que (dois espaços) e por-que (hífen)",
+    "quero remarcar, preciso ir amanhã; vocês atendem?",
+    "comoassim qualquer ondeestá",  # só prefixos: nada casa
+    "Está tudo bem, tá? fica para quando der",
+    "voce/vcs/vocês: quem paga? paguei ontem",
+    "",
+    "12 3 quando_quem qual_é",
+]
+
+
+@pytest.mark.parametrize('message', MESSAGES)
+def test_structure_keywords_match_regex(message):
+    text = message.lower()
+    assert STRUCTURE_KEYWORDS.find(text) == regex_find(STRUCTURE_KEYWORDS.categories, text)
+
+
+def test_random_messages_match_regex():
+    rng = random.Random(35)
+    words = [kw for keywords in STRUCTURE_KEYWORDS.categories.values() for kw in keywords]
+    words += ['comoo', 'xqual', 'porque', 'que', 'por', 'vcx', 'pode-se', 'está?', 'ir_', 'quer1']
+    separators = [' ', '  ', ', ', '-', '_', '?', '\n', '']
+    for _ in range(2000):
+        parts = [rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(0, 8))]
+        text = ''.join(parts)
+        assert STRUCTURE_KEYWORDS.find(text) == regex_find(STRUCTURE_KEYWORDS.categories, text), text
+
+
+def test_declaration_order_and_no_duplicates():
+    matcher = KeywordMatcher({'a': ['vai', 'ir', 'o que'], 'b': []})
+    assert matcher.find('o que ir vai ir o que') == {'a': ['vai', 'ir', 'o que'], 'b': []}
+
+
+def test_keyword_must_start_and_end_with_word_chars():
+    with pytest.raises(ValueError):
+        KeywordMatcher({'a': ['vai?']})
+
+
+def test_structure_sentence_analysis_uses_matcher():
+    analysis = structure_sentence_analysis("Como você pode me ajudar?")
+    assert analysis['interrogatives'] == ['como']
+    assert analysis['subjects'] == ['você']
+    assert analysis['verbs'] == ['pode', 'ajudar']
@@ -0,0 +1,114 @@
+"""PriorityLanes: reserva por faixa, teto, prioridade no compartilhado, fila cheia e timeout."""
+import threading
+import time
+
+import pytest
+
+from lanes import LaneConfig, LaneRejected, PriorityLanes, lanes_from_env, normalize_lane, threads_needed
+
+
+def make_lanes(capacity, **configs):
+    return PriorityLanes(capacity, {lane: configs.get(lane, LaneConfig()) for lane in ('interactive', 'auto', 'bulk')})
+
+
+def wait_queued(lanes, lane, count, deadline=2.0):
+    end = time.monotonic() + deadline
+    while lanes.report()['lanes'][lane]['queued'] != count:
+        assert time.monotonic() < end, f"{lane} nunca chegou a {count} na fila"
+        time.sleep(0.005)
+
+
+def test_normalize_lane():
+    assert normalize_lane(' Interactive ') == 'interactive'
+    assert normalize_lane('urgent') == 'auto'
+    assert normalize_lane(None) == 'auto'
+
+
+def test_reserved_slot_is_free_while_bulk_fills_shared():
+    lanes = make_lanes(3, interactive=LaneConfig(reserved=1), bulk=LaneConfig(timeout=0.05))
+    lanes.acquire('bulk')
+    lanes.acquire('bulk')  # compartilhado (2 slots) cheio
+    assert lanes.acquire('interactive') < 0.05  # reserva: sem espera
+    with pytest.raises(LaneRejected) as rejected:
+        lanes.acquire('bulk')
+    assert rejected.value.reason == 'timeout'
+    assert lanes.report()['lanes']['bulk']['queued'] == 0
+
+
+def test_limit_caps_a_lane_below_capacity():
+    lanes = make_lanes(4, bulk=LaneConfig(limit=1, timeout=0.05))
+    lanes.acquire('bulk')
+    with pytest.raises(LaneRejected):
+        lanes.acquire('bulk')
+    lanes.acquire('auto')  # o resto do compartilhado continua livre
+    lanes.release('bulk')
+    lanes.acquire('bulk')
+
+
+def test_queue_full_is_rejected_without_waiting():
+    lanes = make_lanes(1, bulk=LaneConfig(queue_limit=0, timeout=5.0))
+    lanes.acquire('auto')
+    started = time.monotonic()
+    with pytest.raises(LaneRejected) as rejected:
+        lanes.acquire('bulk')
+    assert rejected.value.reason == 'queue_full'
+    assert time.monotonic() - started < 1.0
+
+
+def test_shared_slot_goes_to_highest_priority_waiter():
+    lanes = make_lanes(1, interactive=LaneConfig(timeout=5.0), auto=LaneConfig(timeout=5.0))
+    granted = []
+
+    def worker(lane):
+        with lanes.slot(lane):
+            granted.append(lane)
+
+    lanes.acquire('bulk')
+    auto = threading.Thread(target=worker, args=('auto',))
+    auto.start()
+    wait_queued(lanes, 'auto', 1)
+    interactive = threading.Thread(target=worker, args=('interactive',))
+    interactive.start()
+    wait_queued(lanes, 'interactive', 1)
+
+    lanes.release('bulk')
+    auto.join(5)
+    interactive.join(5)
+    assert granted == ['interactive', 'auto']
+
+
+def test_new_request_does_not_jump_ahead_of_higher_priority_waiter():
+    lanes = make_lanes(1, interactive=LaneConfig(timeout=5.0), bulk=LaneConfig(timeout=0.05))
+    lanes.acquire('auto')
+    waiter = threading.Thread(target=lanes.acquire, args=('interactive',))
+    waiter.start()
+    wait_queued(lanes, 'interactive', 1)
+    lanes.release('auto')
+    waiter.join(5)
+    # O slot foi para a faixa interativa: o lote não entra
+    with pytest.raises(LaneRejected):
+        lanes.acquire('bulk')
+
+
+def test_slot_releases_on_error():
+    lanes = make_lanes(1, auto=LaneConfig(timeout=0.05))
+    with pytest.raises(RuntimeError):
+        with lanes.slot('auto'):
+            raise RuntimeError('falhou')
+    with lanes.slot('auto'):
+        pass
+    assert lanes.report()['lanes']['auto']['active'] == 0
+
+
+def test_capacity_never_below_reservations():
+    lanes = make_lanes(1, interactive=LaneConfig(reserved=2), auto=LaneConfig(reserved=1))
+    assert lanes.capacity == 3 and lanes.shared == 0
+
+
+def test_lanes_from_env_overrides_defaults():
+    capacity, configs = lanes_from_env({'LANE_CAPACITY': '8', 'LANE_BULK_LIMIT': '0', 'LANE_AUTO_TIMEOUT': '2.5'})
+    assert capacity == 8
+    assert configs['bulk'].limit is None  # 0 = sem teto
+    assert configs['auto'].timeout == 2.5
+    assert configs['interactive'].reserved == 2
+    assert threads_needed(capacity, configs) == 8 + sum(cfg.queue_limit for cfg in configs.values())
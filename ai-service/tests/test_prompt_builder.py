@@ -0,0 +1,62 @@
+"""Montagem do prompt: seções por prioridade dentro do orçamento de tokens."""
+from prompt_builder import PromptBuilder, clip_to_tokens, estimate_tokens
+
+HISTORY = '\n'.join(f"cliente: mensagem número {n}" for n in range(1, 21))
+KNOWLEDGE = 'Base de conhecimento: ' + ' '.join(f"artigo{n}" for n in range(40))
+
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 0
+    # "olá" + "," + "mundo" (5 letras = 2 sub-tokens)
+    assert estimate_tokens('olá, mundo') == 4
+
+
+def test_everything_fits_in_insertion_order():
+    builder = PromptBuilder(1000)
+    builder.add('knowledge', 'conhecimento', priority=2)
+    builder.add('empty', '')
+    builder.add('system', 'instruções', required=True)
+    prompt, report = builder.build()
+    assert prompt == 'conhecimento\n\ninstruções'
+    assert report['sections'] == ['knowledge', 'system']
+    assert report['truncated'] == [] and report['dropped'] == []
+    assert report['prompt_tokens'] == estimate_tokens(prompt)
+
+
+def test_budget_keeps_required_truncates_history_and_drops_low_priority():
+    system = 'Você é o assistente da empresa. Responda em português.'
+    budget = estimate_tokens(system) + 40
+    builder = PromptBuilder(budget)
+    builder.add('system', system, required=True)
+    builder.add('knowledge', KNOWLEDGE, priority=2)
+    builder.add('history', HISTORY, priority=1, truncate='tail', header='Histórico da conversa:')
+    builder.add('message', 'cliente: tem horário amanhã?', required=True)
+    prompt, report = builder.build()
+
+    assert report['prompt_tokens'] <= budget
+    assert report['sections'] == ['system', 'history', 'message']
+    assert report['truncated'] == ['history'] and report['dropped'] == ['knowledge']
+    # Histórico mantém o cabeçalho e as mensagens mais recentes, na ordem original
+    history = prompt.split('\n\n')[1].split('\n')
+    assert history[0] == 'Histórico da conversa:'
+    assert history[-1] == 'cliente: mensagem número 20'
+    assert 'cliente: mensagem número 1' not in history
+    assert prompt.startswith(system) and prompt.endswith('cliente: tem horário amanhã?')
+
+
+def test_required_section_larger_than_budget_is_cut_from_the_head():
+    prompt, report = PromptBuilder(10).add('system', KNOWLEDGE, required=True).build()
+    assert report['truncated'] == ['system']
+    assert estimate_tokens(prompt) <= 10 and KNOWLEDGE.startswith(prompt)
+
+
+def test_section_max_tokens_is_applied_before_the_budget():
+    prompt, report = PromptBuilder(1000).add('history', HISTORY, truncate='tail', max_tokens=20).build()
+    assert report['truncated'] == ['history']
+    assert estimate_tokens(prompt) <= 20 and HISTORY.endswith(prompt)
+
+
+def test_clip_to_tokens():
+    assert clip_to_tokens('curto', 5) == 'curto'
+    clipped = clip_to_tokens(HISTORY, 15)
+    assert estimate_tokens(clipped) <= 15 and HISTORY.startswith(clipped)
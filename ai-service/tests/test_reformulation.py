@@ -0,0 +1,74 @@
+"""
+reformulate_response_with_vocabulary (uma varredura com o matcher compilado)
+contra a implementação anterior (um re.sub por palavra do vocabulário).
+
+Diferenças documentadas (user-036): em cada posição vale a palavra mais longa,
+e o texto das definições inseridas não é varrido de novo.
+"""
+import re
+import uuid
+
+import pytest
+
+from cognitive_engine import reformulate_response_with_vocabulary
+from vocabulary import SOURCE_METADATA, Vocabulary, meaning
+
+
+def legacy_reformulate(response, words):
+    """Implementação anterior: words é {palavra: (definição, sinônimos)} na ordem do vocabulário."""
+    reformulated = response
+    for word_lower, (definition, synonyms) in words.items():
+        pattern = re.compile(re.escape(word_lower), re.IGNORECASE)
+        if pattern.search(reformulated) and definition:
+            synonyms_str = f" (também chamado de: {', '.join(synonyms)})" if synonyms else ""
+            reformulated = pattern.sub(lambda m: f"{m.group(0)} - {definition}{synonyms_str}", reformulated, count=1)
+    return reformulated
+
+
+def reformulate(response, words):
+    vocabulary = Vocabulary({
+        word: meaning(definition, synonyms, source=SOURCE_METADATA) for word, (definition, synonyms) in words.items()
+    })
+    return reformulate_response_with_vocabulary(response, str(uuid.uuid4()), vocabulary)
+
+
+WORDS = {
+    'rack': ('gabinete metálico', ['armário']),
+    'orçamento': ('estimativa de custo', ['cotação', 'proposta']),
+    'visita técnica': ('ida do técnico ao local', []),
+    'nobreak': ('fonte ininterrupta', []),
+    'sla': ('', []),  # sem definição: nunca enriquecida
+}
+
+RESPONSES = [
+    "Posso agendar uma visita técnica para o rack.",
+    "O RACK e o Rack: só a primeira ocorrência recebe a definição.",
+    "Envio o orçamento do nobreak hoje; o orçamento vale 10 dias.",
+    "Nenhuma palavra do vocabulário aqui. O SLA é de 4h.",
+    "Palavras dentro de outras também casam: racks, orçamentos.",
+    "",
+]
+
+
+@pytest.mark.parametrize('response', RESPONSES)
+def test_matches_legacy(response):
+    assert reformulate(response, WORDS) == legacy_reformulate(response, WORDS)
+
+
+def test_empty_vocabulary_returns_response():
+    assert reformulate("Posso ajudar?", {}) == "Posso ajudar?"
+
+
+def test_longest_word_wins_at_a_position():
+    words = {'agenda': ('lista de compromissos', []), 'agendamento': ('horário marcado', [])}
+    response = "Seu agendamento foi confirmado."
+    assert reformulate(response, words) == "Seu agendamento - horário marcado foi confirmado."
+    # A implementação anterior dependia da ordem do vocabulário e cortava a palavra
+    assert legacy_reformulate(response, words) == "Seu agenda - lista de compromissosmento foi confirmado."
+
+
+def test_inserted_definitions_are_not_rescanned():
+    words = {'rack': ('gabinete do servidor', []), 'servidor': ('computador central', [])}
+    response = "Verifique o rack."
+    assert reformulate(response, words) == "Verifique o rack - gabinete do servidor."
+    assert legacy_reformulate(response, words) == "Verifique o rack - gabinete do servidor - computador central."
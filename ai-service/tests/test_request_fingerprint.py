@@ -0,0 +1,34 @@
+"""Chave de coalescência/idempotência de /cognitive-response: o corpo interpretado, não os bytes."""
+from cognitive_engine import _request_fingerprint, app
+
+COMPANY = '6f1c1f3e-8a53-4b7e-9a57-2d0f3c1b9e10'
+BASE = {'company_id': COMPANY, 'client_ref': '5511999990000', 'incoming_message': 'quero agendar'}
+
+
+def fingerprint(data, lane='auto', query=''):
+    with app.test_request_context(f'/cognitive-response?{query}', method='POST', json=data):
+        return _request_fingerprint(data, lane)
+
+
+def test_key_order_whitespace_and_ignored_fields_do_not_matter():
+    same = {
+        'incoming_message': ' quero agendar ', 'client_ref': '5511999990000',
+        'company_id': COMPANY.upper(), 'intent': 'geral', 'idempotency_key': 'abc',
+    }
+    assert fingerprint(same) == fingerprint(BASE)
+
+
+def test_output_affecting_fields_separate_requests():
+    base = fingerprint(BASE)
+    assert fingerprint({**BASE, 'incoming_message': 'quero cancelar'}) != base
+    assert fingerprint({**BASE, 'client_ref': '5511888880000'}) != base
+    assert fingerprint({**BASE, 'company_id': '00000000-0000-0000-0000-000000000001'}) != base
+    assert fingerprint({**BASE, 'context_summary': 'Cliente: oi'}) != base
+    assert fingerprint({**BASE, 'profile': 'compact'}) != base
+    assert fingerprint(BASE, query='fields=confidence') != base
+    assert fingerprint(BASE, lane='bulk') != base
+
+
+def test_fields_in_body_or_query_string_are_equivalent():
+    assert fingerprint({**BASE, 'fields': 'confidence,detected_intent'}) == \
+        fingerprint(BASE, query='fields=confidence,detected_intent')
@@ -0,0 +1,39 @@
+"""Erros de validação das rotas: 400 em JSON, nunca um 500 em HTML."""
+import pytest
+
+from cognitive_engine import app, compose_cognitive_response
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize('body', [{'incoming_message': 'oi'}, [1], {}])
+def test_cognitive_response_without_company_id(client, body):
+    response = client.post('/cognitive-response', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'company_id é obrigatório'}
+
+
+def test_cognitive_response_with_invalid_company_id(client):
+    response = client.post('/cognitive-response', json={'company_id': 'x', 'incoming_message': 'oi'})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_cognitive_response_with_invalid_json(client):
+    response = client.post('/cognitive-response', data='{bad', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Failed to parse request JSON'}
+
+
+def test_availability_without_company_id(client):
+    response = client.post('/availability', json={'date': 'amanhã'})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'company_id é obrigatório'}
+
+
+def test_pipeline_returns_status_and_payload():
+    assert compose_cognitive_response({'incoming_message': 'oi'}, 'auto') == \
+        (400, {'error': 'company_id é obrigatório'})
@@ -0,0 +1,78 @@
+"""Resolução das expressões de data/hora extraídas para horários no fuso da empresa."""
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from scheduling import appointment_interval, format_slot, get_zone, parse_time, resolve_date, resolve_slot
+
+TZ = get_zone('America/Sao_Paulo')
+MONDAY = date(2026, 1, 12)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('hoje', date(2026, 1, 12)),
+    ('amanhã', date(2026, 1, 13)),
+    ('segunda', date(2026, 1, 19)),  # dita numa segunda = semana que vem
+    ('sexta-feira', date(2026, 1, 16)),
+    ('domingo', date(2026, 1, 18)),
+    ('próxima semana', date(2026, 1, 19)),
+    ('15', date(2026, 1, 15)),
+    ('5', date(2026, 2, 5)),  # dia que já passou vai para o próximo mês
+    ('2026-03-01', date(2026, 3, 1)),
+    ('2026-02-30', None),
+    ('40', None),
+    ('', None),
+    (None, None),
+])
+def test_resolve_date(expression, expected):
+    assert resolve_date(expression, MONDAY) == expected
+
+
+def test_resolve_date_skips_months_without_the_day():
+    assert resolve_date('31', date(2026, 4, 10)) == date(2026, 5, 31)
+    assert resolve_date('5', date(2026, 12, 20)) == date(2027, 1, 5)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('9:00', time(9)),
+    ('09h30', time(9, 30)),
+    ('14H00', time(14)),
+    ('9h', time(9)),
+    ('9', time(9)),
+    ('25:00', None),
+    ('9:75', None),
+    ('nove', None),
+    (None, None),
+])
+def test_parse_time(expression, expected):
+    assert parse_time(expression) == expected
+
+
+def test_resolve_slot_in_company_timezone():
+    now = datetime(2026, 1, 12, 18, 0, tzinfo=timezone.utc)  # 15:00 em São Paulo
+    slot = resolve_slot('amanhã', '9h00', TZ, now)
+    assert slot['start'] == datetime(2026, 1, 13, 9, 0, tzinfo=TZ)
+    assert slot['end'] == datetime(2026, 1, 13, 10, 0, tzinfo=TZ)
+    assert resolve_slot('amanhã', '9h00', TZ, now, duration_minutes=30)['end'] == datetime(2026, 1, 13, 9, 30, tzinfo=TZ)
+    # Só a hora: hoje, ou amanhã se o horário de hoje já passou
+    assert resolve_slot(None, '16:00', TZ, now)['start'] == datetime(2026, 1, 12, 16, 0, tzinfo=TZ)
+    assert resolve_slot(None, '14:00', TZ, now)['start'] == datetime(2026, 1, 13, 14, 0, tzinfo=TZ)
+    # Data não resolvida não vira "hoje"; só a data não tem início
+    assert resolve_slot('qualquer dia', '9:00', TZ, now) == {'date': None, 'start': None, 'end': None}
+    assert resolve_slot('sexta', None, TZ, now) == {'date': date(2026, 1, 16), 'start': None, 'end': None}
+
+
+def test_appointment_interval():
+    start, end = appointment_interval(date(2026, 1, 13), '14:30', TZ)
+    assert (start, end) == (datetime(2026, 1, 13, 14, 30, tzinfo=TZ), datetime(2026, 1, 13, 15, 30, tzinfo=TZ))
+    # timestamptz 02:00 UTC do dia 13 ainda é dia 12 em São Paulo
+    start, _ = appointment_interval(datetime(2026, 1, 13, 2, 0, tzinfo=timezone.utc), '9:00', TZ)
+    assert start == datetime(2026, 1, 12, 9, 0, tzinfo=TZ)
+    assert appointment_interval(None, '9:00', TZ) is None
+    assert appointment_interval('2026-01-13', '9:00', TZ) is None
+    assert appointment_interval(date(2026, 1, 13), 'de manhã', TZ) is None
+
+
+def test_format_slot_and_zone_fallback():
+    assert format_slot(datetime(2026, 1, 13, 9, 0, tzinfo=TZ)) == 'terça 13/01 às 09:00'
+    assert get_zone('Invalid/Zone') is get_zone(None) is TZ
@@ -0,0 +1,70 @@
+"""SingleFlight, RecentResults e o Idempotency-Key de /cognitive-response."""
+import threading
+import time
+import uuid
+
+import pytest
+
+from cognitive_engine import app
+from singleflight import RecentResults, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+    results = []
+
+    def slow():
+        executions.append(1)
+        release.wait(2)
+        return 'resposta'
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    end = time.monotonic() + 2
+    while flight.in_flight() != 1 or len(executions) != 1:
+        assert time.monotonic() < end
+        time.sleep(0.005)
+    time.sleep(0.05)  # seguidores chegam enquanto o líder roda
+    release.set()
+    for thread in threads:
+        thread.join(2)
+    assert executions == [1]
+    assert sorted(results) == [('resposta', False)] + [('resposta', True)] * 4
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared_and_key_released():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('k', lambda: (_ for _ in ()).throw(ValueError('falhou')))
+    assert flight.in_flight() == 0
+    assert flight.do('k', lambda: 2) == (2, False)  # não é cache: executa de novo
+
+
+def test_recent_results_expire_and_evict_oldest():
+    results = RecentResults(ttl=0.05, max_entries=2)
+    results.set('a', 1)
+    results.set('b', 2)
+    results.set('c', 3)
+    assert results.get('a') is None and results.get('b') == 2 and len(results) == 2
+    time.sleep(0.06)
+    assert results.get('c') is None
+
+
+def test_idempotency_key_replays_same_request_and_rejects_another():
+    client = app.test_client()
+    body = {'company_id': str(uuid.uuid4()), 'incoming_message': 'qual o endereço da loja?', 'profile': 'compact'}
+    headers = {'Idempotency-Key': str(uuid.uuid4())}
+    first = client.post('/cognitive-response', json=body, headers=headers)
+    # Mesma requisição com as chaves em outra ordem: respondida da memória
+    replay = client.post('/cognitive-response', json=dict(reversed(list(body.items()))), headers=headers)
+    assert first.status_code == replay.status_code == 200
+    assert 'Idempotent-Replayed' not in first.headers
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert replay.get_data() == first.get_data()
+
+    other = client.post('/cognitive-response', json=dict(body, incoming_message='outra pergunta'), headers=headers)
+    assert other.status_code == 422
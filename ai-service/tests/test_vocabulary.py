@@ -0,0 +1,202 @@
+"""
+Vocabulário incremental: a recarga pelo watermark/hash e as linhas do NOTIFY dão o
+mesmo conteúdo da carga completa, e um Vocabulary publicado nunca muda.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import cognitive_engine
+from cognitive_engine import interpret_semantics, on_word_meaning_event, tenant_cache
+from vocabulary import Vocabulary, base_lexicon, load_vocabulary, set_base_lexicon
+
+COMPANY = str(uuid.uuid4())
+
+
+class FakeWordDB:
+    """companies.metadata.vocabulary e ai_word_meanings, pelas consultas de load_vocabulary."""
+
+    def __init__(self):
+        self.metadata = []
+        self.rows = {}
+        self.clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def _tick(self):
+        # Passos de 1 s: menores que a folga do watermark, como commits próximos
+        self.clock += timedelta(seconds=1)
+        return self.clock
+
+    def upsert(self, row_id, word, definition, status='approved'):
+        self.rows[row_id] = {'id': row_id, 'word': word, 'definition': definition, 'status': status,
+                             'updated_at': self._tick()}
+        return dict(self.rows[row_id])
+
+    def delete(self, row_id):
+        return self.rows.pop(row_id)
+
+    def query(self, name, params):
+        if name == 'vocabulary_metadata':
+            vocabulary_hash = hashlib.md5(json.dumps(self.metadata).encode()).hexdigest()
+            return [{'vocabulary_hash': vocabulary_hash,
+                     'vocabulary': self.metadata if vocabulary_hash != params[1] else None}]
+        approved = [row for row in self.rows.values() if row['status'] == 'approved']
+        if name == 'word_meanings_approved':
+            return [dict(row) for row in approved]
+        if name == 'word_meanings_approved_count':
+            return [{'approved_total': len(approved)}]
+        if name == 'word_meanings_changed':
+            since = params[1] - timedelta(seconds=params[2])
+            return sorted((dict(row) for row in self.rows.values() if row['updated_at'] >= since),
+                          key=lambda row: row['updated_at'])
+        raise AssertionError(name)
+
+
+def content(vocabulary):
+    return dict(vocabulary.tenant_items()), dict(vocabulary.table_ids)
+
+
+def full_load(db):
+    return load_vocabulary(COMPANY, db.query)
+
+
+@pytest.fixture
+def db():
+    db = FakeWordDB()
+    db.metadata = [{'word': 'nobreak', 'definition': 'fonte ininterrupta', 'synonyms': ['UPS']}]
+    db.upsert('1', 'rack', 'gabinete metálico')
+    db.upsert('2', 'sla', 'prazo de atendimento')
+    return db
+
+
+CHANGES = [
+    ('insert', lambda db: db.upsert('3', 'orçamento', 'estimativa de custo')),
+    ('update', lambda db: db.upsert('1', 'rack', 'gabinete do servidor')),
+    ('rename', lambda db: db.upsert('2', 'acordo de nível', 'prazo de atendimento')),
+    ('unapprove', lambda db: db.upsert('3', 'orçamento', 'estimativa de custo', status='pending')),
+    ('delete', lambda db: db.delete('1')),
+    ('metadata', lambda db: db.metadata.append({'word': 'patch panel', 'definition': 'painel de conexões'})),
+    ('same word, second row', lambda db: db.upsert('4', 'rack', 'armário')),
+]
+
+
+def test_incremental_reload_matches_full_load(db):
+    vocabulary = full_load(db)
+    for name, change in CHANGES:
+        change(db)
+        reloaded = load_vocabulary(COMPANY, db.query, vocabulary)
+        assert content(reloaded) == content(full_load(db)), name
+        assert reloaded is not vocabulary and reloaded.version != vocabulary.version, name
+        vocabulary = reloaded
+
+
+def test_reload_without_changes_returns_same_object(db):
+    vocabulary = full_load(db)
+    assert load_vocabulary(COMPANY, db.query, vocabulary) is vocabulary
+    assert load_vocabulary(COMPANY, db.query, vocabulary) is vocabulary
+
+
+def test_with_table_row_matches_full_load_and_leaves_original_untouched(db):
+    vocabulary = full_load(db)
+    events = [
+        lambda: db.upsert('3', 'orçamento', 'estimativa de custo'),
+        lambda: db.upsert('1', 'rack', 'gabinete do servidor'),
+        lambda: db.upsert('2', 'acordo de nível', 'prazo de atendimento'),
+        lambda: db.upsert('3', 'orçamento', 'estimativa de custo', status='pending'),
+        lambda: dict(db.delete('1'), status=None),  # DELETE chega sem status aprovado
+    ]
+    for change in events:
+        row = change()
+        before, version = content(vocabulary), vocabulary.version
+        updated = vocabulary.with_table_row(row)
+        assert content(vocabulary) == before and vocabulary.version == version
+        assert updated is not vocabulary and updated.version != version
+        assert content(updated) == content(full_load(db))
+        vocabulary = updated
+
+
+def test_with_table_row_without_changes_returns_same_object(db):
+    vocabulary = full_load(db)
+    assert vocabulary.with_table_row(dict(db.rows['1'])) is vocabulary
+    assert vocabulary.with_table_row({'id': '9', 'word': 'x', 'definition': 'y', 'status': None}) is vocabulary
+
+
+def test_notify_replaces_cached_vocabulary(db):
+    vocabulary = full_load(db)
+    tenant_cache.set(COMPANY, 'word_meanings', vocabulary)
+    try:
+        before = content(vocabulary)
+        iterator = iter(vocabulary)
+        next(iterator)
+        on_word_meaning_event({'company_id': COMPANY, 'op': 'INSERT', 'id': '3', 'word': 'orçamento',
+                               'definition': 'estimativa de custo', 'status': 'approved'})
+        list(iterator)  # leitor em andamento termina sem "dictionary changed size during iteration"
+        assert content(vocabulary) == before
+        cached = tenant_cache.peek(COMPANY, 'word_meanings')
+        assert cached is not vocabulary
+        assert cached.get('orçamento').definition == 'estimativa de custo'
+    finally:
+        tenant_cache.clear(COMPANY)
+
+
+def test_engine_import_does_not_load_requests():
+    code = "import sys, cognitive_engine; print('requests' in sys.modules, 'dictionary_populator' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(cognitive_engine.__file__)),
+                            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+    assert result.stdout.splitlines()[-1] == 'False False', result.stderr
+
+
+def test_base_equal_metadata_word_is_not_stored_per_tenant():
+    base = base_lexicon()['trazer']
+    db = FakeWordDB()
+    db.metadata = [
+        {'word': 'trazer', 'definition': base.definition, 'examples': list(base.examples)},
+        {'word': 'levar', 'definition': 'transportar até o cliente'},
+    ]
+    vocabulary = load_vocabulary(COMPANY, db.query)
+    assert dict(vocabulary.tenant_items()).keys() == {'levar'}
+    assert vocabulary.get('trazer') is base
+    assert vocabulary.get('levar').definition == 'transportar até o cliente'
+
+
+@pytest.fixture
+def no_pending_writes(monkeypatch):
+    pending = []
+    monkeypatch.setattr(cognitive_engine, 'upsert_word_meaning', lambda company_id, word, *args, **kwargs: pending.append(word))
+    yield pending
+    tenant_cache.clear(COMPANY)
+
+
+def test_base_word_is_known_but_not_a_tenant_recognition(no_pending_writes):
+    tenant_cache.set(COMPANY, 'word_meanings', Vocabulary({}))
+    semantics = interpret_semantics(['trazer', 'dúvida', 'zzzz'], COMPANY)
+    assert semantics['recognized'] == [] and semantics['topics'] == {}
+    assert [w['word'] for w in semantics['new_words']] == ['zzzz']
+    assert no_pending_writes == ['zzzz']
+
+    db = FakeWordDB()
+    db.upsert('1', 'trazer', 'levar até aqui')
+    tenant_cache.set(COMPANY, 'word_meanings', load_vocabulary(COMPANY, db.query))
+    semantics = interpret_semantics(['trazer'], COMPANY)
+    assert semantics['topics'] == {'custom': 1}
+    assert semantics['recognized'][0]['definition'] == 'levar até aqui'
+
+
+def test_base_swap_reaches_cached_tenants(no_pending_writes):
+    from dictionary_populator import PT_BR_COMMON_WORDS
+
+    tenant_cache.set(COMPANY, 'word_meanings', Vocabulary({}))
+    assert [w['word'] for w in interpret_semantics(['rack'], COMPANY)['new_words']] == ['rack']
+    try:
+        set_base_lexicon(dict(PT_BR_COMMON_WORDS, rack={'definition': 'gabinete metálico'}))
+        # Sem invalidar o cache: o vocabulário em cache já enxerga a base nova
+        assert interpret_semantics(['rack'], COMPANY)['new_words'] == []
+        assert tenant_cache.peek(COMPANY, 'word_meanings').get('rack').definition == 'gabinete metálico'
+    finally:
+        set_base_lexicon(PT_BR_COMMON_WORDS)
@@ -0,0 +1,61 @@
+"""
+Normalização de Texto - remoção de acentos por tabela e normalização de tokens com memo
+
+Uma única tabela str.translate, calculada na importação a partir da decomposição
+Unicode (NFD), cobre todas as letras latinas acentuadas (á, è, ü, ñ, ç, ...) e
+também remove marcas combinantes soltas (texto que chega em NFD). Texto ASCII
+puro não passa pela tabela.
+
+normalize_token é chamado no laço mais interno do léxico; por isso tem memo
+limitado (lru_cache) — o vocabulário de mensagens é pequeno e repetitivo.
+"""
+import unicodedata
+from functools import lru_cache
+
+TOKEN_CACHE_SIZE = 16384
+
+
+def _build_accent_table() -> dict:
+    table = {}
+    # Latin-1 Supplement + Latin Extended-A/B: letras com diacríticos → letra base
+    for code in range(0x00C0, 0x0250):
+        char = chr(code)
+        decomposed = unicodedata.normalize('NFD', char)
+        base = decomposed[0]
+        if len(decomposed) > 1 and base.isascii() and base.isalpha():
+            table[code] = base
+    # Marcas combinantes (U+0300–U+036F) de texto já decomposto
+    for code in range(0x0300, 0x0370):
+        table[code] = None
+    return table
+
+
+ACCENT_TABLE = _build_accent_table()
+
+
+def strip_accents(text: str) -> str:
+    """Remove diacríticos preservando caixa ("Ação" → "Acao")."""
+    if text.isascii():
+        return text
+    return text.translate(ACCENT_TABLE)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza texto completo: minúsculas e sem acentos, SEM singularizar.
+    Útil para pattern matching em detecção de intent.
+    """
+    return strip_accents(text.lower())
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_token(token: str) -> str:
+    """
+    Normaliza token para aproximação rudimentar (remove acentos e plural).
+    Mantém palavras curtas intactas (não aplica singularização a tokens com <4 chars).
+    """
+    t = strip_accents(token.lower())
+    # Singularização simplificada (remove 's' final se parecer plural)
+    if len(t) >= 4 and t.endswith("s"):
+        t = t[:-1]
+    return t
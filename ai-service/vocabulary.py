@@ -0,0 +1,350 @@
+"""
+Vocabulário da empresa com versão - recarga incremental
+
+O vocabulário tem duas origens: companies.metadata.vocabulary (JSON) e as linhas
+aprovadas de ai_word_meanings. Recarregar tudo quando o cache vence baixa e
+decodifica o JSON inteiro e todas as linhas, mesmo que só uma palavra (ou
+nenhuma) tenha mudado.
+
+Representação compacta (milhares de empresas com vocabulários parecidos):
+- Meaning é um registro com __slots__ (definição, sinônimos, exemplos, origem),
+  sem id e sem company_id. Registros de mesmo conteúdo são um objeto só no
+  processo (WeakValueDictionary), compartilhado entre empresas.
+- Palavras, sinônimos, exemplos e definições passam por sys.intern.
+- Vocabulary é um Mapping palavra -> Meaning em camadas: tabela, metadata e a
+  base comum do processo (PT_BR_COMMON_WORDS), nessa ordem, sem dict mesclado.
+
+Base comum: carregada uma vez por processo e imutável (set_base_lexicon troca o
+objeto inteiro, e todas as empresas passam a ver a nova base na consulta
+seguinte). Palavra aprovada pela empresa com o mesmo conteúdo da base não é
+guardada na empresa: a camada própria só tem adições e sobreposições, e a
+memória por empresa cresce só com elas. Quem precisa da base consulta por
+get(); tenant_items()/tenant_len() veem só a camada própria.
+
+Além das palavras, Vocabulary guarda o estado da última carga:
+- metadata_hash: md5 do JSON do vocabulário no banco. A consulta devolve o JSON
+  só quando o hash mudou (as entradas do JSON não têm marca confiável de
+  alteração nem de remoção, então o JSON vem inteiro ou não vem)
+- table_watermark: maior updated_at lido de ai_word_meanings. A recarga traz só
+  as linhas alteradas desde então (com WATERMARK_OVERLAP segundos de folga para
+  transações que gravaram um updated_at antigo), e a contagem de aprovadas
+  detecta remoções, que o watermark não enxerga: contagem diferente, carga completa
+- version: muda a cada conteúdo novo da empresa e é única no processo. Caches
+  derivados das palavras próprias (o matcher compilado) comparam a versão
+
+Recarga sem mudança devolve o mesmo objeto. Com mudança, devolve um objeto novo:
+quem está lendo o anterior não vê alteração pela metade. O mesmo vale para as
+linhas que chegam pelo NOTIFY (with_table_row): um Vocabulary publicado nunca muda.
+"""
+import itertools
+import sys
+import threading
+import weakref
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+WATERMARK_OVERLAP = 5.0
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+SOURCE_METADATA = 'vocabulary_metadata'
+SOURCE_TABLE = 'ai_word_meanings_table'
+SOURCE_BASE = 'base_dictionary'
+
+# query(nome, parâmetros) -> linhas (run_hot_query do engine)
+QueryFn = Callable[[str, Tuple], List[Dict[str, Any]]]
+
+_versions = itertools.count(1)
+
+
+class Meaning:
+    """
+    Significado de uma palavra. Sem id e sem empresa: registros iguais são um
+    objeto só no processo, compartilhado pelas empresas que aprovaram a mesma
+    definição (use meaning(), nunca o construtor).
+    """
+    __slots__ = ('definition', 'synonyms', 'examples', 'source', '__weakref__')
+
+    def __init__(self, definition: Optional[str], synonyms: Tuple[str, ...], examples: Tuple[str, ...], source: str):
+        self.definition = definition
+        self.synonyms = synonyms
+        self.examples = examples
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"Meaning({self.definition!r}, source={self.source!r})"
+
+
+# Registros vivos por conteúdo; o registro some quando nenhum vocabulário o usa mais
+_meanings: 'weakref.WeakValueDictionary[Tuple, Meaning]' = weakref.WeakValueDictionary()
+_meanings_lock = threading.Lock()
+
+
+def _strings(values: Any) -> Tuple[str, ...]:
+    if not values:
+        return ()
+    return tuple(sys.intern(str(v)) for v in values)
+
+
+def meaning(definition: Optional[str], synonyms: Any = (), examples: Any = (), source: str = SOURCE_TABLE) -> Meaning:
+    """Registro compartilhado com esse conteúdo (criado se ainda não existe)."""
+    definition = sys.intern(definition) if isinstance(definition, str) else definition
+    key = (definition, _strings(synonyms), _strings(examples), source)
+    with _meanings_lock:
+        record = _meanings.get(key)
+        if record is None:
+            record = Meaning(*key)
+            _meanings[key] = record
+    return record
+
+
+def shared_meanings() -> int:
+    """Registros distintos vivos no processo."""
+    return len(_meanings)
+
+
+def metadata_meaning(word_entry: Dict[str, Any]) -> Meaning:
+    return meaning(word_entry.get('definition', ''), word_entry.get('synonyms'), word_entry.get('examples'),
+                   SOURCE_METADATA)
+
+
+def table_meaning(row: Dict[str, Any]) -> Meaning:
+    return meaning(row.get('definition'), source=SOURCE_TABLE)
+
+
+def intern_word(word: Any) -> str:
+    return sys.intern((word or '').lower().strip())
+
+
+# ===== base comum (uma por processo) =====
+_base: Mapping = MappingProxyType({})
+_base_loaded = False
+_base_lock = threading.Lock()
+
+
+def _base_words(entries: Mapping[str, Dict[str, Any]]) -> Mapping:
+    words: Dict[str, Meaning] = {}
+    for word, entry in entries.items():
+        word = intern_word(word)
+        if word and entry.get('definition'):
+            words[word] = meaning(entry['definition'], entry.get('synonyms'), entry.get('examples'), SOURCE_BASE)
+    return MappingProxyType(words)
+
+
+def set_base_lexicon(entries: Mapping[str, Dict[str, Any]]) -> Mapping:
+    """
+    Troca a base comum do processo (palavra -> {'definition', 'synonyms', 'examples'}).
+    A troca é atômica e vale na consulta seguinte de todas as empresas, sem
+    invalidar o cache delas.
+    """
+    global _base, _base_loaded
+    base = _base_words(entries)
+    with _base_lock:
+        _base = base
+        _base_loaded = True
+    return base
+
+
+def base_lexicon() -> Mapping:
+    """Base comum atual (carregada de PT_BR_COMMON_WORDS na primeira chamada)."""
+    global _base, _base_loaded
+    if not _base_loaded:
+        # Import tardio: dictionary_populator importa requests, e o import do engine não deve pagar por isso
+        from dictionary_populator import PT_BR_COMMON_WORDS
+
+        base = _base_words(PT_BR_COMMON_WORDS)
+        with _base_lock:
+            if not _base_loaded:
+                _base = base
+                _base_loaded = True
+    return _base
+
+
+class Vocabulary(Mapping):
+    """
+    Palavras da empresa sobre a base comum (palavra -> Meaning): tabela, depois
+    metadata, depois base, sem dict mesclado. tenant_items()/tenant_len() veem só
+    as palavras próprias. Guarda a versão e o estado da carga.
+    """
+    __slots__ = ('version', 'metadata_hash', 'metadata_words', 'table_words', 'table_ids', 'table_watermark',
+                 '_size')
+
+    def __init__(self, metadata_words: Dict[str, Meaning], table_words: Optional[Dict[str, Meaning]] = None,
+                 table_ids: Optional[Dict[str, str]] = None, metadata_hash: Optional[str] = None,
+                 table_watermark: Optional[datetime] = None):
+        self.version = next(_versions)
+        self.metadata_hash = metadata_hash
+        self.metadata_words = metadata_words
+        self.table_words = table_words if table_words is not None else {}
+        self.table_ids = table_ids if table_ids is not None else {}
+        self.table_watermark = table_watermark
+        self._resize()
+        base_lexicon()
+
+    def _resize(self):
+        metadata = self.metadata_words
+        self._size = len(metadata) + sum(1 for word in self.table_words if word not in metadata)
+
+    # ===== Mapping (empresa -> base) =====
+    def __getitem__(self, word: str) -> Meaning:
+        record = self.get(word)
+        if record is None:
+            raise KeyError(word)
+        return record
+
+    def get(self, word: str, default: Any = None) -> Any:
+        record = self.table_words.get(word)
+        if record is None:
+            record = self.metadata_words.get(word)
+            if record is None:
+                return _base.get(word, default)
+        return record
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.table_words or word in self.metadata_words or word in _base
+
+    def __iter__(self) -> Iterator[str]:
+        for word, _ in self.tenant_items():
+            yield word
+        base = _base
+        for word in base:
+            if word not in self.table_words and word not in self.metadata_words:
+                yield word
+
+    def __len__(self) -> int:
+        base = _base
+        return len(base) + sum(1 for word, _ in self.tenant_items() if word not in base)
+
+    def __bool__(self) -> bool:
+        return self._size > 0 or bool(_base)
+
+    # ===== só a empresa (adições e sobreposições) =====
+    def tenant_items(self) -> Iterator[Tuple[str, Meaning]]:
+        table = self.table_words
+        yield from table.items()
+        for word, record in self.metadata_words.items():
+            if word not in table:
+                yield word, record
+
+    def tenant_len(self) -> int:
+        return self._size
+
+    # ===== mudanças =====
+    def with_table_row(self, row: Dict[str, Any]) -> 'Vocabulary':
+        """
+        Cópia com a linha de ai_word_meanings aplicada (NOTIFY), ou o próprio objeto
+        se nada mudou. O objeto atual não muda: quem está iterando nele não vê a troca.
+        """
+        copy = Vocabulary(self.metadata_words, dict(self.table_words), dict(self.table_ids),
+                          self.metadata_hash, self.table_watermark)
+        return copy if copy.apply_table_row(row) else self
+
+    def apply_table_row(self, row: Dict[str, Any]) -> bool:
+        """
+        Aplica uma linha de ai_word_meanings (aprovada entra, demais saem) na camada
+        da tabela, in-place: só em objetos ainda não publicados (carga, with_table_row).
+        Retorna True se algo mudou (a versão sobe).
+        """
+        word = intern_word(row.get('word'))
+        row_id = str(row['id']) if row.get('id') is not None else None
+        approved = row.get('status') == 'approved'
+        changed = False
+        old_word = self.table_ids.pop(row_id, None) if row_id else None
+        if old_word and (old_word != word or not approved):
+            changed |= self.table_words.pop(old_word, None) is not None
+        if approved:
+            if row_id:
+                self.table_ids[row_id] = word
+            record = table_meaning(row)
+            if word and self.table_words.get(word) is not record:
+                self.table_words[word] = record
+                changed = True
+        if changed:
+            self._resize()
+            self.version = next(_versions)
+        return changed
+
+
+def same_content(a: Meaning, b: Optional[Meaning]) -> bool:
+    return b is not None and (a.definition, a.synonyms, a.examples) == (b.definition, b.synonyms, b.examples)
+
+
+def _metadata_words(vocabulary: Any) -> Dict[str, Meaning]:
+    """Entradas do metadata, menos as iguais à base (a base já responde por elas)."""
+    base = base_lexicon()
+    words: Dict[str, Meaning] = {}
+    for word_entry in vocabulary or []:
+        word = intern_word(word_entry.get('word'))
+        if word:
+            record = metadata_meaning(word_entry)
+            if same_content(record, base.get(word)):
+                words.pop(word, None)
+            else:
+                words[word] = record
+    return words
+
+
+def load_vocabulary(company_id: str, query: QueryFn, previous: Optional[Vocabulary] = None,
+                    overlap_seconds: float = WATERMARK_OVERLAP) -> Vocabulary:
+    """
+    Vocabulário atual da empresa. Com previous, busca só o que mudou desde ele;
+    devolve previous quando nada mudou.
+
+    Consultas usadas: vocabulary_metadata(company_id, hash anterior),
+    word_meanings_changed(company_id, watermark, folga em segundos),
+    word_meanings_approved(company_id) e word_meanings_approved_count(company_id).
+    """
+    rows = query('vocabulary_metadata', (company_id, previous.metadata_hash if previous is not None else None))
+    metadata_row = rows[0] if rows else {}
+    metadata_hash = metadata_row.get('vocabulary_hash')
+    if previous is not None and metadata_hash == previous.metadata_hash:
+        metadata_words = previous.metadata_words
+        metadata_changed = False
+    else:
+        metadata_words = _metadata_words(metadata_row.get('vocabulary'))
+        metadata_changed = True
+
+    if previous is None or previous.table_watermark is None:
+        return _full_table_load(company_id, query, metadata_words, metadata_hash)
+
+    changed_rows = query('word_meanings_changed', (company_id, previous.table_watermark, overlap_seconds))
+    count_rows = query('word_meanings_approved_count', (company_id,))
+    approved_total = count_rows[0]['approved_total'] if count_rows else 0
+
+    table_words = dict(previous.table_words)
+    table_ids = dict(previous.table_ids)
+    scratch = Vocabulary(metadata_words, table_words, table_ids, metadata_hash, previous.table_watermark)
+    table_changed = False
+    for row in changed_rows:
+        table_changed |= scratch.apply_table_row(row)
+        if row.get('updated_at') is not None and row['updated_at'] > scratch.table_watermark:
+            scratch.table_watermark = row['updated_at']
+    if len(scratch.table_ids) != approved_total:
+        # Linha removida (ou perdida pelo watermark): a tabela vem inteira
+        return _full_table_load(company_id, query, metadata_words, metadata_hash)
+    if not metadata_changed and not table_changed:
+        previous.table_watermark = scratch.table_watermark
+        return previous
+    return scratch
+
+
+def _full_table_load(company_id: str, query: QueryFn, metadata_words: Dict[str, Meaning],
+                     metadata_hash: Optional[str]) -> Vocabulary:
+    table_words: Dict[str, Meaning] = {}
+    table_ids: Dict[str, str] = {}
+    watermark = None
+    for row in query('word_meanings_approved', (company_id,)):
+        word = intern_word(row.get('word'))
+        if word:
+            table_words[word] = table_meaning(row)
+        if row.get('id') is not None:
+            table_ids[str(row['id'])] = word
+        updated_at = row.get('updated_at')
+        if updated_at is not None and (watermark is None or updated_at > watermark):
+            watermark = updated_at
+    vocabulary = Vocabulary(metadata_words, table_words, table_ids, metadata_hash, watermark)
+    if watermark is None:
+        # Tabela vazia (ou inexistente): qualquer linha nova entra pelo delta
+        vocabulary.table_watermark = EPOCH
+    return vocabulary
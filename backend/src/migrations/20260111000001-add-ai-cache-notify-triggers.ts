@@ -0,0 +1,78 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Triggers de NOTIFY para invalidação de cache do motor cognitivo (ai-service).
+ * Cada alteração em ai_word_meanings, ai_learned_concepts, ai_knowledge_base ou
+ * companies.metadata publica um JSON no canal `ai_cache_invalidation`; o listener
+ * do cognitive_engine aplica a invalidação (ou patch) apenas na empresa afetada.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      CREATE OR REPLACE FUNCTION ai_cache_notify() RETURNS trigger AS $$
+      DECLARE
+        rec RECORD;
+        payload JSONB;
+      BEGIN
+        IF TG_OP = 'DELETE' THEN
+          rec := OLD;
+        ELSE
+          rec := NEW;
+        END IF;
+
+        IF TG_TABLE_NAME = 'companies' THEN
+          payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.id);
+        ELSIF TG_TABLE_NAME = 'ai_word_meanings' THEN
+          payload := jsonb_build_object(
+            'table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.company_id,
+            'id', rec.id, 'word', rec.word, 'status', rec.status
+          );
+          -- Definição vai junto para patch in-place (NOTIFY aceita até 8000 bytes)
+          IF TG_OP <> 'DELETE' AND rec.status = 'approved' AND octet_length(COALESCE(rec.definition, '')) < 6000 THEN
+            payload := payload || jsonb_build_object('definition', COALESCE(rec.definition, ''));
+          END IF;
+          IF TG_OP = 'UPDATE' AND OLD.word IS DISTINCT FROM NEW.word THEN
+            payload := payload || jsonb_build_object('old_word', OLD.word);
+          END IF;
+        ELSE
+          payload := jsonb_build_object(
+            'table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.company_id, 'id', rec.id
+          );
+        END IF;
+
+        PERFORM pg_notify('ai_cache_invalidation', payload::text);
+        RETURN NULL;
+      END;
+      $$ LANGUAGE plpgsql;
+    `);
+
+    for (const table of ['ai_word_meanings', 'ai_learned_concepts', 'ai_knowledge_base']) {
+      await queryInterface.sequelize.query(`
+        DROP TRIGGER IF EXISTS ${table}_cache_notify ON ${table};
+        CREATE TRIGGER ${table}_cache_notify
+          AFTER INSERT OR UPDATE OR DELETE ON ${table}
+          FOR EACH ROW EXECUTE FUNCTION ai_cache_notify();
+      `);
+    }
+
+    // companies: apenas quando o metadata (vocabulário) muda de fato
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS companies_metadata_cache_notify ON companies;
+      CREATE TRIGGER companies_metadata_cache_notify
+        AFTER UPDATE OF metadata ON companies
+        FOR EACH ROW
+        WHEN (OLD.metadata IS DISTINCT FROM NEW.metadata)
+        EXECUTE FUNCTION ai_cache_notify();
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS companies_metadata_cache_notify ON companies;
+      DROP TRIGGER IF EXISTS ai_knowledge_base_cache_notify ON ai_knowledge_base;
+      DROP TRIGGER IF EXISTS ai_learned_concepts_cache_notify ON ai_learned_concepts;
+      DROP TRIGGER IF EXISTS ai_word_meanings_cache_notify ON ai_word_meanings;
+      DROP FUNCTION IF EXISTS ai_cache_notify();
+    `);
+  },
+};
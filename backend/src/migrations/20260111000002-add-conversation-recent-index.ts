@@ -0,0 +1,26 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Índice para buscar as mensagens mais recentes de uma conversa:
+ * WHERE company_id = ? AND client_ref = ? ORDER BY created_at DESC LIMIT n
+ * (usado pelo cognitive_engine quando a conversa não está no buffer em memória).
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.addIndex(
+      'ai_conversation_messages',
+      ['company_id', 'client_ref', { name: 'created_at', order: 'DESC' }],
+      {
+        name: 'ai_conversation_messages_company_client_recent',
+        concurrently: true,
+      }
+    );
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.removeIndex(
+      'ai_conversation_messages',
+      'ai_conversation_messages_company_client_recent'
+    );
+  },
+};
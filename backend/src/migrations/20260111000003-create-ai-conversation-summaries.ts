@@ -0,0 +1,60 @@
+import { QueryInterface, DataTypes } from 'sequelize';
+
+/**
+ * Resumo contínuo por conversa (company_id + client_ref), mantido pelo
+ * cognitive_engine e injetado no prompt do LLM no lugar do histórico cru.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.createTable('ai_conversation_summaries', {
+      id: {
+        type: DataTypes.UUID,
+        defaultValue: DataTypes.UUIDV4,
+        primaryKey: true,
+      },
+      company_id: {
+        type: DataTypes.UUID,
+        allowNull: false,
+        references: {
+          model: 'companies',
+          key: 'id',
+        },
+        onDelete: 'CASCADE',
+      },
+      client_ref: {
+        type: DataTypes.STRING,
+        allowNull: false,
+      },
+      summary: {
+        type: DataTypes.JSONB,
+        allowNull: false,
+        defaultValue: {},
+        comment: 'Fatos extraídos, última mensagem do cliente e última resposta',
+      },
+      turn_count: {
+        type: DataTypes.INTEGER,
+        allowNull: false,
+        defaultValue: 0,
+      },
+      created_at: {
+        allowNull: false,
+        type: DataTypes.DATE,
+        defaultValue: DataTypes.NOW,
+      },
+      updated_at: {
+        allowNull: false,
+        type: DataTypes.DATE,
+        defaultValue: DataTypes.NOW,
+      },
+    });
+
+    await queryInterface.addIndex('ai_conversation_summaries', ['company_id', 'client_ref'], {
+      unique: true,
+      name: 'ai_conversation_summaries_company_client_unique',
+    });
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.dropTable('ai_conversation_summaries');
+  },
+};
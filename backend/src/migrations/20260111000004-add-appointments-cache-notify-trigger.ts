@@ -0,0 +1,23 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Publica alterações em appointments no canal `ai_cache_invalidation` (função
+ * ai_cache_notify da migration 20260111000001). O cognitive_engine usa o evento
+ * para recarregar o índice de disponibilidade da empresa afetada.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS appointments_cache_notify ON appointments;
+      CREATE TRIGGER appointments_cache_notify
+        AFTER INSERT OR UPDATE OR DELETE ON appointments
+        FOR EACH ROW EXECUTE FUNCTION ai_cache_notify();
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS appointments_cache_notify ON appointments;
+    `);
+  },
+};
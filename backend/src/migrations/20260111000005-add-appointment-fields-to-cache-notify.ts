@@ -0,0 +1,61 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Inclui status, data normalizada e hora no payload NOTIFY de appointments, para o
+ * cognitive_engine atualizar a agenda em memória incrementalmente (sem recarregar
+ * todos os agendamentos da empresa a cada alteração).
+ */
+const notifyFunction = (withAppointmentFields: boolean) => `
+  CREATE OR REPLACE FUNCTION ai_cache_notify() RETURNS trigger AS $$
+  DECLARE
+    rec RECORD;
+    payload JSONB;
+  BEGIN
+    IF TG_OP = 'DELETE' THEN
+      rec := OLD;
+    ELSE
+      rec := NEW;
+    END IF;
+
+    IF TG_TABLE_NAME = 'companies' THEN
+      payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.id);
+    ELSIF TG_TABLE_NAME = 'ai_word_meanings' THEN
+      payload := jsonb_build_object(
+        'table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.company_id,
+        'id', rec.id, 'word', rec.word, 'status', rec.status
+      );
+      -- Definição vai junto para patch in-place (NOTIFY aceita até 8000 bytes)
+      IF TG_OP <> 'DELETE' AND rec.status = 'approved' AND octet_length(COALESCE(rec.definition, '')) < 6000 THEN
+        payload := payload || jsonb_build_object('definition', COALESCE(rec.definition, ''));
+      END IF;
+      IF TG_OP = 'UPDATE' AND OLD.word IS DISTINCT FROM NEW.word THEN
+        payload := payload || jsonb_build_object('old_word', OLD.word);
+      END IF;
+    ${withAppointmentFields ? `ELSIF TG_TABLE_NAME = 'appointments' THEN
+      payload := jsonb_build_object(
+        'table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.company_id, 'id', rec.id,
+        'status', rec.status,
+        'appointment_date_normalized', rec.appointment_date_normalized,
+        'appointment_time', rec.appointment_time
+      );` : ''}
+    ELSE
+      payload := jsonb_build_object(
+        'table', TG_TABLE_NAME, 'op', TG_OP, 'company_id', rec.company_id, 'id', rec.id
+      );
+    END IF;
+
+    PERFORM pg_notify('ai_cache_invalidation', payload::text);
+    RETURN NULL;
+  END;
+  $$ LANGUAGE plpgsql;
+`;
+
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(notifyFunction(true));
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(notifyFunction(false));
+  },
+};
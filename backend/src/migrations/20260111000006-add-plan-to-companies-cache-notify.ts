@@ -0,0 +1,25 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Dispara o NOTIFY de companies também quando plan_id muda: o cognitive_engine
+ * usa o plano para o peso da empresa na fila justa do LLM (admission.py) e o
+ * guarda em cache por empresa.
+ */
+const companiesTrigger = (withPlan: boolean) => `
+  DROP TRIGGER IF EXISTS companies_metadata_cache_notify ON companies;
+  CREATE TRIGGER companies_metadata_cache_notify
+    AFTER UPDATE OF ${withPlan ? 'metadata, plan_id' : 'metadata'} ON companies
+    FOR EACH ROW
+    WHEN (OLD.metadata IS DISTINCT FROM NEW.metadata${withPlan ? ' OR OLD.plan_id IS DISTINCT FROM NEW.plan_id' : ''})
+    EXECUTE FUNCTION ai_cache_notify();
+`;
+
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(companiesTrigger(true));
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(companiesTrigger(false));
+  },
+};
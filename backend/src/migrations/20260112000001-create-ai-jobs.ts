@@ -0,0 +1,114 @@
+import { QueryInterface, DataTypes } from 'sequelize';
+
+/**
+ * Fila durável de jobs do cognitive_engine (JOBS_BACKEND=postgres, ai-service/jobs.py).
+ * POST /jobs grava a linha e as threads de execução de qualquer worker fazem o
+ * claim com FOR UPDATE SKIP LOCKED. Resultado e entrega do callback ficam aqui.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.createTable('ai_jobs', {
+      id: {
+        type: DataTypes.UUID,
+        defaultValue: DataTypes.UUIDV4,
+        primaryKey: true,
+      },
+      company_id: {
+        type: DataTypes.UUID,
+        allowNull: false,
+        references: {
+          model: 'companies',
+          key: 'id',
+        },
+        onDelete: 'CASCADE',
+      },
+      idempotency_key: {
+        type: DataTypes.STRING(200),
+        allowNull: true,
+      },
+      status: {
+        type: DataTypes.STRING(16),
+        allowNull: false,
+        defaultValue: 'queued',
+        comment: 'queued | running | done | failed',
+      },
+      request: {
+        type: DataTypes.JSONB,
+        allowNull: false,
+        defaultValue: {},
+        comment: 'Corpo de /cognitive-response (sem company_id, callback_url e idempotency_key)',
+      },
+      result: {
+        type: DataTypes.JSONB,
+        allowNull: true,
+      },
+      error: {
+        type: DataTypes.TEXT,
+        allowNull: true,
+      },
+      attempts: {
+        type: DataTypes.INTEGER,
+        allowNull: false,
+        defaultValue: 0,
+      },
+      run_after: {
+        allowNull: false,
+        type: DataTypes.DATE,
+        defaultValue: DataTypes.NOW,
+      },
+      locked_until: {
+        allowNull: true,
+        type: DataTypes.DATE,
+        comment: 'Lease do worker; expirado, o job volta a ser elegível',
+      },
+      callback_url: {
+        type: DataTypes.TEXT,
+        allowNull: true,
+      },
+      callback_status: {
+        type: DataTypes.STRING(16),
+        allowNull: true,
+        comment: 'pending | delivered | failed',
+      },
+      callback_attempts: {
+        type: DataTypes.INTEGER,
+        allowNull: false,
+        defaultValue: 0,
+      },
+      callback_next_at: {
+        allowNull: true,
+        type: DataTypes.DATE,
+      },
+      callback_error: {
+        type: DataTypes.TEXT,
+        allowNull: true,
+      },
+      created_at: {
+        allowNull: false,
+        type: DataTypes.DATE,
+        defaultValue: DataTypes.NOW,
+      },
+      updated_at: {
+        allowNull: false,
+        type: DataTypes.DATE,
+        defaultValue: DataTypes.NOW,
+      },
+      finished_at: {
+        allowNull: true,
+        type: DataTypes.DATE,
+      },
+    });
+
+    // Predicados iguais aos usados em jobs.py (ON CONFLICT e claims)
+    await queryInterface.sequelize.query(`
+      CREATE UNIQUE INDEX ai_jobs_company_idempotency_unique
+        ON ai_jobs (company_id, idempotency_key) WHERE idempotency_key IS NOT NULL;
+      CREATE INDEX ai_jobs_ready_idx ON ai_jobs (run_after) WHERE status IN ('queued', 'running');
+      CREATE INDEX ai_jobs_callback_due_idx ON ai_jobs (callback_next_at) WHERE callback_status = 'pending';
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.dropTable('ai_jobs');
+  },
+};
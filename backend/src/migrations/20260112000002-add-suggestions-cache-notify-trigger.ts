@@ -0,0 +1,24 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Publica aprovações, edições e rejeições de ai_conversation_suggestions no canal
+ * `ai_cache_invalidation` (função ai_cache_notify). O cognitive_engine atualiza o
+ * índice de respostas aprovadas da empresa de forma incremental.
+ * Sugestões novas nascem pending e não entram no índice, então INSERT não dispara.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS ai_conversation_suggestions_cache_notify ON ai_conversation_suggestions;
+      CREATE TRIGGER ai_conversation_suggestions_cache_notify
+        AFTER UPDATE OF status, approved_response, incoming_message OR DELETE ON ai_conversation_suggestions
+        FOR EACH ROW EXECUTE FUNCTION ai_cache_notify();
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP TRIGGER IF EXISTS ai_conversation_suggestions_cache_notify ON ai_conversation_suggestions;
+    `);
+  },
+};
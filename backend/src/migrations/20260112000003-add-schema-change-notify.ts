@@ -0,0 +1,44 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Publica {"table": "schema"} no canal `ai_cache_invalidation` depois de
+ * CREATE/ALTER/DROP TABLE. O cognitive_engine sonda o schema de novo e remonta
+ * as consultas preparadas (ai-service/schema_probe.py).
+ * Event trigger exige superusuário: sem permissão, a migration só avisa e o
+ * refresh fica por conta de POST /admin/schema/refresh ou do restart dos workers.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      CREATE OR REPLACE FUNCTION ai_schema_change_notify() RETURNS event_trigger AS $$
+      BEGIN
+        PERFORM pg_notify('ai_cache_invalidation', jsonb_build_object('table', 'schema', 'op', TG_TAG)::text);
+      END;
+      $$ LANGUAGE plpgsql;
+
+      DO $$
+      BEGIN
+        DROP EVENT TRIGGER IF EXISTS ai_schema_change_notify;
+        CREATE EVENT TRIGGER ai_schema_change_notify ON ddl_command_end
+          WHEN TAG IN ('CREATE TABLE', 'ALTER TABLE', 'DROP TABLE')
+          EXECUTE FUNCTION ai_schema_change_notify();
+      EXCEPTION WHEN insufficient_privilege THEN
+        RAISE NOTICE 'ai_schema_change_notify not created (requires superuser)';
+      END
+      $$;
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DO $$
+      BEGIN
+        DROP EVENT TRIGGER IF EXISTS ai_schema_change_notify;
+      EXCEPTION WHEN insufficient_privilege THEN
+        NULL;
+      END
+      $$;
+      DROP FUNCTION IF EXISTS ai_schema_change_notify();
+    `);
+  },
+};
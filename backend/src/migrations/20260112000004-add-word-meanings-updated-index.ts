@@ -0,0 +1,24 @@
+import { QueryInterface } from 'sequelize';
+
+/**
+ * Recarga incremental do vocabulário no cognitive_engine (ai-service/vocabulary.py):
+ * busca as linhas de ai_word_meanings da empresa alteradas depois do watermark
+ * (updated_at) e conta as aprovadas para detectar remoções.
+ */
+module.exports = {
+  up: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      CREATE INDEX IF NOT EXISTS ai_word_meanings_company_updated_idx
+        ON ai_word_meanings (company_id, updated_at);
+      CREATE INDEX IF NOT EXISTS ai_word_meanings_company_approved_idx
+        ON ai_word_meanings (company_id) WHERE status = 'approved';
+    `);
+  },
+
+  down: async (queryInterface: QueryInterface) => {
+    await queryInterface.sequelize.query(`
+      DROP INDEX IF EXISTS ai_word_meanings_company_updated_idx;
+      DROP INDEX IF EXISTS ai_word_meanings_company_approved_idx;
+    `);
+  },
+};
@@ -9,6 +9,7 @@ import {
   updateSuggestionDecision,
   getAutoRespondStatus,
   setAutoRespondEnabled,
+  COGNITIVE_PRIORITIES,
 } from '../services/ai/aiConversationService';
 import {
   teachConcept,
@@ -129,7 +130,7 @@ router.post('/suggestions', getCompanyId, async (req: Request, res: Response) =>
   try {
     const userId = (req as any).userId;
     const companyId = (req as any).companyId;
-    const { connection_id, client_ref, jid, incoming_message } = req.body;
+    const { connection_id, client_ref, jid, incoming_message, priority } = req.body;
     
     console.log('[AI SUGGESTIONS] Received:', { connection_id, jid, client_ref, message: incoming_message?.substring(0, 50) });
     
@@ -158,6 +159,7 @@ router.post('/suggestions', getCompanyId, async (req: Request, res: Response) =>
       clientRef: client_ref,
       clientJid: jid, // JID original (LID/JID)
       incomingMessage: incoming_message,
+      priority: COGNITIVE_PRIORITIES.includes(priority) ? priority : 'auto',
     });
 
     res.status(201).json({ data: suggestion });
@@ -1,5 +1,6 @@
 import express, { Router, Request, Response } from 'express';
 import models, { sequelize } from '../models';
+import { fetchAvailability, syncAppointmentAvailability } from '../services/ai/availabilityService';
 
 const router: Router = express.Router();
 
@@ -40,6 +41,33 @@ router.get('/', async (req: Request, res: Response) => {
   }
 });
 
+/**
+ * GET /api/appointments/availability
+ * Free slots from the cognitive engine's in-memory schedule
+ * Query: company_id (required), date, time, duration_minutes, count
+ */
+router.get('/availability', async (req: Request, res: Response) => {
+  try {
+    const company_id = req.query.company_id as string;
+    if (!company_id) {
+      return res.status(400).json({ message: 'Missing required field: company_id' });
+    }
+
+    const availability = await fetchAvailability({
+      companyId: company_id,
+      date: req.query.date as string | undefined,
+      time: req.query.time as string | undefined,
+      durationMinutes: req.query.duration_minutes ? parseInt(req.query.duration_minutes as string) : undefined,
+      count: req.query.count ? parseInt(req.query.count as string) : undefined,
+    });
+    res.json(availability);
+  } catch (error: any) {
+    console.error('Appointment availability error:', error);
+    const status = error?.status && error.status < 500 ? error.status : 502;
+    res.status(status).json({ message: error?.message || 'Availability lookup failed' });
+  }
+});
+
 /**
  * POST /api/appointments
  * Create a new appointment
@@ -50,6 +78,7 @@ router.post('/', async (req: Request, res: Response) => {
       company_id,
       client_name,
       appointment_date,
+      appointment_date_normalized,
       appointment_time,
       service_description,
       extraction_confidence,
@@ -68,6 +97,7 @@ router.post('/', async (req: Request, res: Response) => {
       company_id,
       client_name,
       appointment_date,
+      appointment_date_normalized,
       appointment_time,
       service_description,
       extraction_confidence,
@@ -76,6 +106,7 @@ router.post('/', async (req: Request, res: Response) => {
       status: status || 'pending',
     });
 
+    syncAppointmentAvailability(created);
     res.status(201).json(created);
   } catch (error) {
     console.error('Create appointment error:', error);
@@ -100,6 +131,7 @@ router.post('/confirm', async (req: Request, res: Response) => {
     }
 
     await appt.update({ status: 'confirmed' });
+    syncAppointmentAvailability(appt);
     res.json(appt);
   } catch (error) {
     console.error('Confirm appointment error:', error);
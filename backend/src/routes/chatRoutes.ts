@@ -2,6 +2,7 @@ import express, { Router, Request, Response } from 'express';
 import models from '../models';
 import fetch from 'node-fetch';
 import { v4 as uuidv4 } from 'uuid';
+import { recordConversationTurn } from '../services/ai/aiConversationService';
 
 const router: Router = express.Router();
 
@@ -99,6 +100,7 @@ router.post('/send', getCompanyId, async (req: Request, res: Response) => {
       message_text,
       metadata: { channel: 'web' },
     });
+    recordConversationTurn(companyId, client_ref, 'received', message_text);
 
     // Build context from last messages
     const lastMessages = await (models as any).AiConversationMessage.findAll({
@@ -122,6 +124,9 @@ router.post('/send', getCompanyId, async (req: Request, res: Response) => {
         incoming_message: message_text,
         client_ref,
         context_summary: contextSummary,
+        profile: 'compact',
+        // Usuário esperando na tela: faixa com slots reservados no cognitive_engine
+        priority: 'interactive',
       }),
     });
 
@@ -142,6 +147,7 @@ router.post('/send', getCompanyId, async (req: Request, res: Response) => {
       message_text: suggested || '...',
       metadata: { channel: 'web', ai_meta: { intent: data.detected_intent, confidence: data.intent_confidence } },
     });
+    recordConversationTurn(companyId, client_ref, 'sent', suggested || '...');
 
     res.status(201).json({ data: { user_message: userMsg, ai_message: aiMsg, ai_payload: data } });
   } catch (error) {
@@ -89,6 +89,7 @@ router.post('/webhook', getCompanyId, async (req: any, res: Response) => {
       clientRef: client_ref,
       clientJid: jid, // JID original (LID/JID)
       incomingMessage: message_text,
+      priority: 'auto',
     });
 
     res.status(201).json({ data: suggestion });
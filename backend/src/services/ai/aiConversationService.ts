@@ -4,6 +4,11 @@ import fetch from 'node-fetch';
 
 const AUTO_RESPOND_CONFIDENCE_THRESHOLD = 0.70;
 
+// Faixa de prioridade no cognitive_engine: chat web > auto-resposta > lote (e-mail, replays)
+export type CognitivePriority = 'interactive' | 'auto' | 'bulk';
+
+export const COGNITIVE_PRIORITIES: CognitivePriority[] = ['interactive', 'auto', 'bulk'];
+
 export interface CreateSuggestionInput {
   userId: string;
   companyId: string;
@@ -12,6 +17,35 @@ export interface CreateSuggestionInput {
   clientRef?: string;
   clientJid?: string; // JID original (pode ser LID ou JID normal)
   incomingMessage: string;
+  priority?: CognitivePriority; // padrão: auto
+}
+
+const COGNITIVE_ENGINE_BASE_URL = process.env.COGNITIVE_ENGINE_BASE_URL || 'http://localhost:5001';
+
+/**
+ * Write-through do histórico de conversa no motor cognitivo.
+ * Chamado após gravar uma AiConversationMessage; falhas não bloqueiam o fluxo
+ * (o motor cai no banco se o buffer em memória não estiver atualizado).
+ */
+export function recordConversationTurn(
+  companyId: string,
+  clientRef: string | undefined,
+  direction: 'received' | 'sent',
+  messageText: string
+) {
+  if (!clientRef || !messageText) return;
+  fetch(`${COGNITIVE_ENGINE_BASE_URL}/conversation/messages`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      company_id: companyId,
+      client_ref: clientRef,
+      direction,
+      message_text: messageText,
+    }),
+  }).catch((err: any) => {
+    console.warn('[AI] Failed to record conversation turn in cognitive engine:', err?.message || err);
+  });
 }
 
 export interface ConversationContext {
@@ -155,6 +189,7 @@ function mergeSuggestionMetadata(existing: any, patch: any) {
 
 export async function createConversationSuggestion(input: CreateSuggestionInput) {
   const { userId, companyId, connectionId, connectionIdString, clientRef, clientJid, incomingMessage } = input;
+  const priority = input.priority || 'auto';
 
   // Garantir isolamento por company_id - apenas verificar se o usuário pertence à empresa
   const user = await (models as any).User.findByPk(userId);
@@ -183,6 +218,10 @@ export async function createConversationSuggestion(input: CreateSuggestionInput)
       context_summary: context.summary,
       intent,
       company_id: companyId,
+      client_ref: clientRef,
+      // Só os campos lidos abaixo (suggested_response, confidence, knowledge_used)
+      profile: 'compact',
+      priority,
     };
 
     const cognitiveRes = await fetch('http://localhost:5001/cognitive-response', {
@@ -207,6 +246,7 @@ export async function createConversationSuggestion(input: CreateSuggestionInput)
         message_text: incomingMessage,
         metadata: { intent, knowledge_used: data.knowledge_used || [] },
       });
+      recordConversationTurn(companyId, clientRef, 'received', incomingMessage);
     } else {
       // Fallback se cognitive engine falhar
       suggestedResponse = buildSuggestedResponse(intent, incomingMessage, context.summary);
@@ -248,6 +288,7 @@ export async function createConversationSuggestion(input: CreateSuggestionInput)
       message_text: suggestedResponse,
       metadata: { auto_sent: true, suggestion_id: (suggestion as any).id },
     });
+    recordConversationTurn(companyId, clientRef, 'sent', suggestedResponse);
 
     // Marcar sugestão como auto-enviada
     (suggestion as any).status = 'auto_sent';
@@ -316,6 +357,12 @@ export async function approveSuggestion(
     message_text: (suggestion as any).approved_response,
     metadata: { from_suggestion: suggestionId },
   });
+  recordConversationTurn(
+    companyId,
+    (suggestion as any).client_ref,
+    'sent',
+    (suggestion as any).approved_response
+  );
 
   // Aumentar score de confiança
   const user = await (models as any).User.findByPk(userId);
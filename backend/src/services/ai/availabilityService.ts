@@ -0,0 +1,56 @@
+import fetch from 'node-fetch';
+
+const COGNITIVE_ENGINE_BASE_URL = process.env.COGNITIVE_ENGINE_BASE_URL || 'http://localhost:5001';
+
+export interface AvailabilityQuery {
+  companyId: string;
+  date?: string; // "2026-01-15" ou expressão ("amanhã", "segunda")
+  time?: string; // "9:00"
+  durationMinutes?: number;
+  count?: number;
+}
+
+/**
+ * Consulta a agenda da empresa no motor cognitivo (horários livres e, se `time`
+ * for informado, se aquele horário está livre).
+ */
+export async function fetchAvailability(query: AvailabilityQuery) {
+  const res = await fetch(`${COGNITIVE_ENGINE_BASE_URL}/availability`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      company_id: query.companyId,
+      date: query.date,
+      time: query.time,
+      duration_minutes: query.durationMinutes,
+      count: query.count,
+    }),
+  });
+  const data = (await res.json()) as any;
+  if (!res.ok) {
+    throw Object.assign(new Error(data?.error || `Cognitive engine error ${res.status}`), { status: res.status });
+  }
+  return data;
+}
+
+/**
+ * Avisa o motor cognitivo de um agendamento criado/alterado para atualizar a agenda
+ * em memória. Falhas não bloqueiam o fluxo (o NOTIFY do banco e o TTL cobrem).
+ */
+export function syncAppointmentAvailability(appointment: any, op: 'UPSERT' | 'DELETE' = 'UPSERT') {
+  if (!appointment?.id || !appointment?.company_id) return;
+  fetch(`${COGNITIVE_ENGINE_BASE_URL}/availability/appointments`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      company_id: appointment.company_id,
+      appointment_id: appointment.id,
+      op,
+      status: appointment.status,
+      appointment_date_normalized: appointment.appointment_date_normalized,
+      appointment_time: appointment.appointment_time,
+    }),
+  }).catch((err: any) => {
+    console.warn('[AI] Failed to sync appointment availability:', err?.message || err);
+  });
+}
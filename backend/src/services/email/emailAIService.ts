@@ -47,6 +47,8 @@ async function sendEmailToAIBackend(
       connection_id: userConnectionId,
       client_ref: fromEmail,
       incoming_message: `Assunto: ${emailSubject}\n\n${emailBody}`,
+      // Sugestões de e-mail não têm ninguém esperando: nunca passam na frente do chat
+      priority: 'bulk',
     };
 
     const response = await fetch('http://localhost:3000/api/ai/suggestions', {
@@ -52,14 +52,22 @@ module.exports = {
     {
       name: 'cognitive-engine',
       cwd: './ai-service',
-      script: 'cognitive_engine.py',
+      // Gunicorn com workers pré-criados (ver AI_PRODUCTION_SERVING.md)
+      script: 'serve.py',
       interpreter: 'python',
       env_file: './backend/.env',
       env: {
         NODE_ENV: 'development',
-        PORT: 5001
+        PORT: 5001,
+        COGNITIVE_PORT: 5001,
+        // COGNITIVE_THREADS fica no padrão (capacidade + filas das faixas): com menos
+        // threads o chat espera na fila FIFO do Gunicorn, antes das faixas
+        COGNITIVE_WORKERS: 2,
+        // Fila de jobs compartilhada: com a fila em memória, GET /jobs/<id> pode cair no outro worker
+        JOBS_BACKEND: 'postgres'
       },
       autorestart: true,
+      kill_timeout: 35000,
       watch: false,
       max_memory_restart: '2G',
       error_file: './logs/cognitive-error.log',